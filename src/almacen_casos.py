@@ -0,0 +1,200 @@
+# Importaciones de librerías y módulos
+import os      # Rutas, tamaños y fechas de modificación de archivos.
+import mmap    # Proyección del almacén en memoria para leerlo sin copiarlo.
+import struct  # Empaquetado binario de la cabecera y el índice.
+from array import array  # Arreglos de enteros para escribir los bloques de cada caso.
+from graph_utils import GrafoCSR, iterar_casos, results_dir  # Grafo compacto, lector de texto y carpeta de resultados.
+from resultados import NORMAL  # Verbosidad por defecto del lector.
+
+# --- Almacén binario de casos ---
+# Un archivo de casos de texto se compila una vez a un almacén binario con el
+# grafo CSR de cada caso ya construido. Al cargarlo, el archivo se proyecta con
+# `mmap` y cada caso se abre por su número en O(1) con vistas de memoria sobre
+# el archivo, sin volver a leer ni a construir nada.
+#
+# Formato (enteros little-endian):
+#   cabecera: MAGIA (8 bytes) | versión (u32) | relleno (u32) | tamaño de la fuente (i64)
+#             | mtime_ns de la fuente (i64) | número de casos (i64) | desplazamiento del índice (i64)
+#   bloques:  por caso, offsets (n+1 × i64) | vecinos (i32) | origen (m × i32) | destino (m × i32)
+#   índice:   por caso, n | m | cantidad de vecinos | desplazamiento del bloque (4 × i64)
+#
+# El índice tiene una entrada por número de caso del texto (ver `iterar_casos`),
+# también para los casos mal formados, que quedan con desplazamiento -1: así los
+# números de caso son los mismos con y sin almacén.
+
+MAGIA = b"CGRAFOS\0"
+VERSION = 2  # 2: entradas vacías para los casos mal formados.
+_CABECERA = struct.Struct("<8sII4q")
+_ENTRADA = struct.Struct("<4q")
+
+
+def ruta_almacen_por_defecto(ruta_texto):
+    # El almacén compilado se guarda en `results/almacen/` con el nombre de la fuente.
+    return os.path.join(results_dir, "almacen", os.path.basename(ruta_texto) + ".bin")
+
+
+def _huella_fuente(ruta_texto):
+    # Tamaño y fecha de modificación de la fuente: si cambian, el almacén está obsoleto.
+    info = os.stat(ruta_texto)
+    return info.st_size, info.st_mtime_ns
+
+
+def compilar_almacen(ruta_texto, ruta_almacen=None, verbosidad=NORMAL):
+    """
+    Compila un archivo de casos de texto a un almacén binario.
+
+    Los casos se leen con `iterar_casos` (los mal formados quedan como entradas
+    vacías del índice, con su número) y se escriben uno a uno, por lo que la memoria usada es la de un
+    caso. El archivo se escribe en una ruta temporal y se renombra al final, así
+    que un almacén a medio escribir nunca queda visible.
+
+    Args:
+        ruta_texto (str): Archivo de casos de texto (o gzip).
+        ruta_almacen (str, optional): Ruta del almacén. Por defecto, `ruta_almacen_por_defecto`.
+        verbosidad (int, optional): Verbosidad de `iterar_casos` al leer el texto.
+
+    Returns:
+        str: La ruta del almacén generado.
+    """
+    if ruta_almacen is None:
+        ruta_almacen = ruta_almacen_por_defecto(ruta_texto)
+    os.makedirs(os.path.dirname(os.path.abspath(ruta_almacen)), exist_ok=True)
+    tam_fuente, mtime_fuente = _huella_fuente(ruta_texto)
+    # El temporal lleva el pid: dos procesos que compilen el mismo almacén no
+    # escriben sobre el mismo archivo.
+    temporal = f"{ruta_almacen}.{os.getpid()}.tmp"
+
+    indice = []
+    try:
+        with open(temporal, "wb") as f:
+            # Cabecera provisional; se reescribe al final con el número de casos y el índice.
+            f.write(_CABECERA.pack(MAGIA, VERSION, 0, tam_fuente, mtime_fuente, 0, 0))
+            for numero, G in iterar_casos(ruta_texto, compacto=True, verbosidad=verbosidad):
+                # Casos mal formados saltados por el lector antes de este.
+                while len(indice) < numero - 1:
+                    indice.append((0, 0, 0, -1))
+                desplazamiento = f.tell()
+                for arreglo in (G.offsets, G.vecinos_csr, G.origen, G.destino):
+                    # Se normaliza el tipo para que el formato no dependa de la plataforma.
+                    tipo = 'q' if arreglo is G.offsets else 'i'
+                    array(tipo, arreglo).tofile(f)
+                # Relleno hasta múltiplo de 8 para que los offsets del siguiente bloque queden alineados.
+                f.write(b"\0" * (-f.tell() % 8))
+                indice.append((G.n, G.number_of_edges(), len(G.vecinos_csr), desplazamiento))
+
+            desplazamiento_indice = f.tell()
+            for entrada in indice:
+                f.write(_ENTRADA.pack(*entrada))
+            f.seek(0)
+            f.write(_CABECERA.pack(MAGIA, VERSION, 0, tam_fuente, mtime_fuente, len(indice), desplazamiento_indice))
+        os.replace(temporal, ruta_almacen)
+    finally:
+        # Si la compilación falló antes de renombrarlo, el temporal no se deja atrás.
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return ruta_almacen
+
+
+class AlmacenCasos:
+    """
+    Almacén binario de casos proyectado en memoria.
+
+    Los casos se numeran desde 1, igual que en los resultados de `main` (contando
+    los mal formados, que no se pueden abrir: ver `idx in almacen`). `caso(idx)`
+    devuelve un `GrafoCSR` cuyos arreglos son vistas de memoria sobre el archivo
+    (sin copias); esas vistas solo son válidas mientras el almacén siga abierto.
+    """
+
+    def __init__(self, ruta_almacen):
+        self.ruta = ruta_almacen
+        self._archivo = open(ruta_almacen, "rb")
+        self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, _, self.tam_fuente, self.mtime_fuente, self.num_casos, desplazamiento_indice = \
+            _CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta_almacen} no es un almacén de casos válido.")
+        self._vista = memoryview(self._mm)
+        self._indice = self._vista[desplazamiento_indice:desplazamiento_indice + self.num_casos * _ENTRADA.size].cast('q')
+
+    def __len__(self):
+        # Número del último caso, incluidos los mal formados.
+        return self.num_casos
+
+    def __contains__(self, idx):
+        # True si el caso `idx` existe y se leyó correctamente.
+        return 1 <= idx <= self.num_casos and self._indice[4 * (idx - 1) + 3] >= 0
+
+    def caso(self, idx):
+        """
+        Abre el caso número `idx` (desde 1) en O(1), sin copiar sus arreglos.
+
+        Returns:
+            GrafoCSR: El grafo del caso.
+        """
+        if not 1 <= idx <= self.num_casos:
+            raise IndexError(f"El almacén tiene {self.num_casos} casos; no existe el caso {idx}.")
+        base = 4 * (idx - 1)
+        n, m, num_vecinos, inicio = self._indice[base:base + 4]
+        if inicio < 0:
+            raise IndexError(f"El caso {idx} está mal formado en el archivo de texto.")
+        fin_offsets = inicio + 8 * (n + 1)
+        fin_vecinos = fin_offsets + 4 * num_vecinos
+        fin_origen = fin_vecinos + 4 * m
+        return GrafoCSR(
+            n,
+            self._vista[inicio:fin_offsets].cast('q'),
+            self._vista[fin_offsets:fin_vecinos].cast('i'),
+            self._vista[fin_vecinos:fin_origen].cast('i'),
+            self._vista[fin_origen:fin_origen + 4 * m].cast('i'),
+        )
+
+    def __iter__(self):
+        # Recorre los casos bien formados en orden como pares (idx, grafo).
+        for idx in range(1, self.num_casos + 1):
+            if idx in self:
+                yield idx, self.caso(idx)
+
+    def cerrar(self):
+        # Libera la proyección. Falla si aún hay grafos del almacén en uso.
+        if getattr(self, "_indice", None) is not None:
+            self._indice.release()
+            self._vista.release()
+            self._indice = self._vista = None
+        self._mm.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def abrir_almacen(ruta_texto, ruta_almacen=None, verbosidad=NORMAL):
+    """
+    Abre el almacén compilado de un archivo de casos, compilándolo antes si no
+    existe o si la fuente cambió desde la última compilación (tamaño o fecha de
+    modificación distintos a los guardados en la cabecera).
+
+    Args:
+        ruta_texto (str): Archivo de casos de texto.
+        ruta_almacen (str, optional): Ruta del almacén. Por defecto, `ruta_almacen_por_defecto`.
+        verbosidad (int, optional): Verbosidad de `iterar_casos` si hay que compilarlo.
+
+    Returns:
+        AlmacenCasos: El almacén abierto.
+    """
+    if ruta_almacen is None:
+        ruta_almacen = ruta_almacen_por_defecto(ruta_texto)
+    if os.path.exists(ruta_almacen):
+        try:
+            almacen = AlmacenCasos(ruta_almacen)
+        except (ValueError, struct.error):
+            almacen = None
+        if almacen is not None:
+            if (almacen.tam_fuente, almacen.mtime_fuente) == _huella_fuente(ruta_texto):
+                return almacen
+            almacen.cerrar()
+    compilar_almacen(ruta_texto, ruta_almacen, verbosidad)
+    return AlmacenCasos(ruta_almacen)
@@ -0,0 +1,514 @@
+# Importaciones de librerías y módulos
+import argparse  # Módulo estándar para leer las opciones de la línea de comandos.
+import json      # Formato de los resultados de la suite, para compararlos entre versiones.
+import math      # Funciones matemáticas usadas por el generador de grafos aleatorios.
+import os        # Módulo para construir rutas de archivos.
+import platform  # Datos de la máquina para los metadatos de la suite.
+import random    # Generador de números aleatorios con semilla para reproducibilidad.
+import subprocess  # Consulta del commit actual de git para los metadatos.
+import sys       # Versión de Python para los metadatos.
+import tempfile  # Archivos temporales para medir el lector.
+import time      # Módulo estándar para medir tiempos de pared y de CPU.
+import tracemalloc  # Pico de memoria de cada etapa.
+from array import array  # Arreglos compactos de enteros para las aristas generadas.
+from graph_utils import GrafoCSR, iterar_casos, leer_casos, results_dir  # Grafo compacto, lectores de casos y carpeta de resultados.
+from coloring import ESTRATEGIAS, VECINDARIOS, contar_conflictos  # Estrategias y vecindarios a comparar.
+import estadisticas  # Conteo de los movimientos evaluados por cada búsqueda.
+from cotas import coloracion_dsatur  # Número de colores factible para las búsquedas de la suite.
+from traza import TrazaTotal  # Traza para medir la animación.
+from recoloreo import recolorear  # Recoloreo incremental tras cambios en el grafo.
+from main import MAX_ITER_POR_ESTRATEGIA  # Mismo presupuesto de iteraciones que `main.py`.
+from resultados import SILENCIO  # Lectura de casos sin mensajes durante las mediciones.
+
+# --- Generadores de grafos sintéticos ---
+
+def generar_gnp(n, p, semilla):
+    """
+    Genera un grafo aleatorio de Erdős–Rényi G(n, p) en formato compacto.
+
+    Usa el método de saltos geométricos de Batagelj y Brandes, que cuesta
+    O(n + m) en lugar de O(n²), por lo que sirve para grafos grandes y dispersos.
+
+    Args:
+        n (int): Número de nodos.
+        p (float): Probabilidad de cada arista.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        GrafoCSR: El grafo generado.
+    """
+    rng = random.Random(semilla)
+    origen, destino = array('i'), array('i')
+    for u, v in _pares_gnp(n, p, rng):
+        origen.append(u)
+        destino.append(v)
+    return GrafoCSR.desde_aristas(n, origen, destino)
+
+
+def _pares_gnp(n, p, rng):
+    # Genera los pares (u, v), u < v, presentes en G(n, p) con saltos geométricos.
+    if p <= 0 or n < 2:
+        return
+    if p >= 1:
+        for v in range(1, n):
+            for u in range(v):
+                yield u, v
+        return
+
+    log_q = math.log(1.0 - p)
+    v, w = 1, -1
+    while v < n:
+        # Salto aleatorio hasta la siguiente arista presente.
+        w += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        while w >= v and v < n:
+            w -= v
+            v += 1
+        if v < n:
+            yield w, v
+
+
+def generar_geometrico(n, radio, semilla):
+    """
+    Genera un grafo geométrico aleatorio: n puntos uniformes en el cuadrado
+    unidad, unidos cuando su distancia es menor que `radio`.
+
+    Los puntos se reparten en celdas de lado `radio` y cada uno solo se compara
+    con los de su celda y las vecinas, así que el costo es O(n + m).
+
+    Args:
+        n (int): Número de nodos.
+        radio (float): Distancia máxima para que dos nodos sean vecinos.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        GrafoCSR: El grafo generado.
+    """
+    rng = random.Random(semilla)
+    puntos = [(rng.random(), rng.random()) for _ in range(n)]
+    lado = max(1, int(1.0 / radio))  # Celdas por lado (de tamaño >= radio).
+    celdas = {}
+    for i, (x, y) in enumerate(puntos):
+        celdas.setdefault((min(int(x * lado), lado - 1), min(int(y * lado), lado - 1)), []).append(i)
+
+    radio2 = radio * radio
+    origen, destino = array('i'), array('i')
+    for (cx, cy), miembros in celdas.items():
+        # Solo la propia celda y la mitad de las vecinas, para no repetir pares.
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            otros = celdas.get((cx + dx, cy + dy))
+            if otros is None:
+                continue
+            for a, u in enumerate(miembros):
+                xu, yu = puntos[u]
+                for v in (miembros[a + 1:] if dx == dy == 0 else otros):
+                    xv, yv = puntos[v]
+                    if (xu - xv) ** 2 + (yu - yv) ** 2 < radio2:
+                        origen.append(u)
+                        destino.append(v)
+    return GrafoCSR.desde_aristas(n, origen, destino)
+
+
+def generar_plantado(n, k, p, semilla):
+    """
+    Genera un grafo con una k-coloración plantada, al estilo de las instancias
+    "flat" y "le" de DIMACS: los nodos se reparten al azar en k clases y cada
+    par de nodos de clases distintas se une con probabilidad p. El número
+    cromático es como mucho k.
+
+    Args:
+        n (int): Número de nodos.
+        k (int): Número de clases (colores plantados).
+        p (float): Probabilidad de cada arista entre clases distintas.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        GrafoCSR: El grafo generado.
+    """
+    rng = random.Random(semilla)
+    clase = [i % k for i in range(n)]
+    rng.shuffle(clase)
+    origen, destino = array('i'), array('i')
+    for u, v in _pares_gnp(n, p, rng):
+        if clase[u] != clase[v]:
+            origen.append(u)
+            destino.append(v)
+    return GrafoCSR.desde_aristas(n, origen, destino)
+
+
+def leer_dimacs(ruta):
+    """
+    Lee un grafo en el formato `.col` de los desafíos DIMACS de coloración
+    (líneas `p edge n m` y `e u v`, con nodos numerados desde 1).
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Returns:
+        GrafoCSR: El grafo, con nodos numerados desde 0.
+    """
+    n = 0
+    origen, destino = array('i'), array('i')
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            partes = linea.split()
+            if not partes:
+                continue
+            if partes[0] == "p":
+                n = int(partes[2])
+            elif partes[0] == "e":
+                origen.append(int(partes[1]) - 1)
+                destino.append(int(partes[2]) - 1)
+    return GrafoCSR.desde_aristas(n, origen, destino)
+
+
+def escribir_caso(f, G, titulo):
+    # Escribe un grafo en el formato de `data/casos_coloracion_grafos.txt`.
+    f.write(f"# {titulo}\n{G.number_of_nodes()} {G.number_of_edges()}\n")
+    for u, v in G.edges():
+        f.write(f"{u} {v}\n")
+    f.write("\n")
+
+# --- Medición de estrategias ---
+
+def medir_descenso_k(G, estrategia, max_iter, semilla, tiempo_limite=None):
+    """
+    Ejecuta el descenso de k de `main.main` con una estrategia y mide su costo.
+
+    Parte de k = grado máximo + 1 y baja de uno en uno mientras la estrategia
+    consiga una coloración sin conflictos.
+
+    Args:
+        G: El grafo a colorear.
+        estrategia (str): Clave de `coloring.ESTRATEGIAS`.
+        max_iter (int): Límite de iteraciones por intento de k.
+        semilla (int): Semilla aleatoria, para que ambas estrategias partan igual.
+        tiempo_limite (float, optional): Presupuesto total de tiempo en segundos.
+
+    Returns:
+        dict: k mínimo alcanzado, tiempo de CPU total, tiempo medio hasta
+              cero conflictos por intento exitoso e iteraciones totales.
+    """
+    resolver = ESTRATEGIAS[estrategia]
+    random.seed(semilla)
+    k = max((g for _, g in G.degree()), default=0) + 1
+    k_min = None
+    tiempos_exito = []
+    iteraciones_totales = 0
+    cpu_inicio = time.process_time()
+
+    while k > 0:
+        restante = None
+        if tiempo_limite is not None:
+            restante = tiempo_limite - (time.process_time() - cpu_inicio)
+            if restante <= 0:
+                break
+        inicio = time.process_time()
+        if estrategia == "tabu":
+            colores, _, iteraciones = resolver(G, k, max_iter, registrar_pasos=False, tiempo_limite=restante)
+        else:
+            colores, _, iteraciones = resolver(G, k, max_iter, registrar_pasos=False)
+        transcurrido = time.process_time() - inicio
+        iteraciones_totales += iteraciones
+        if contar_conflictos(G, colores) != 0:
+            break
+        tiempos_exito.append(transcurrido)
+        k_min = k
+        k -= 1
+
+    cpu_total = time.process_time() - cpu_inicio
+    return {
+        "k_min": k_min,
+        "cpu_s": cpu_total,
+        "tiempo_hasta_cero_s": sum(tiempos_exito) / len(tiempos_exito) if tiempos_exito else None,
+        "iteraciones": iteraciones_totales,
+    }
+
+
+def comparar_estrategias(instancias, max_iter, semilla, tiempo_limite=None):
+    # Ejecuta todas las estrategias sobre cada instancia e imprime una tabla comparativa.
+    print(f"{'instancia':<24}{'estrategia':<12}{'k_min':>6}{'cpu (s)':>10}{'t→0 (s)':>10}{'iter':>9}")
+    resultados = []
+    for nombre, G in instancias:
+        for estrategia in ESTRATEGIAS:
+            r = medir_descenso_k(G, estrategia, max_iter[estrategia], semilla, tiempo_limite)
+            r.update(instancia=nombre, estrategia=estrategia)
+            resultados.append(r)
+            t0 = f"{r['tiempo_hasta_cero_s']:.4f}" if r["tiempo_hasta_cero_s"] is not None else "-"
+            print(f"{nombre:<24}{estrategia:<12}{str(r['k_min']):>6}{r['cpu_s']:>10.3f}{t0:>10}{r['iteraciones']:>9}")
+    return resultados
+
+
+# --- Suite de rendimiento ---
+# Mide cada componente (lector, conteo de conflictos, búsqueda y animación)
+# sobre instancias sintéticas de varios tamaños y guarda los resultados en JSON
+# para comparar versiones entre sí.
+
+# Número aproximado de aristas de cada escala; todas las familias tienen grado medio ~20.
+ESCALAS = {"pequena": 10 ** 4, "mediana": 10 ** 5, "grande": 10 ** 6}
+FAMILIAS = ("gnp", "geometrico", "plantado")
+GRADO_MEDIO = 20
+K_PLANTADO = 10
+# La animación solo se mide en grafos de hasta este número de aristas: dibujar
+# grafos mayores no es un caso de uso realista (y cuesta más de un segundo por frame).
+MAX_ARISTAS_ANIMACION = 12000
+# El recoloreo incremental trabaja sobre NetworkX (que admite cambios); la
+# conversión de los grafos más grandes ocuparía demasiada memoria.
+MAX_ARISTAS_RECOLOREO = 2 * 10 ** 5
+
+
+def generar_instancia(familia, escala, semilla):
+    # Genera la instancia de una familia con unas `ESCALAS[escala]` aristas.
+    n = ESCALAS[escala] * 2 // GRADO_MEDIO
+    if familia == "gnp":
+        return generar_gnp(n, GRADO_MEDIO / (n - 1), semilla)
+    if familia == "geometrico":
+        return generar_geometrico(n, math.sqrt(GRADO_MEDIO / (math.pi * n)), semilla)
+    if familia == "plantado":
+        return generar_plantado(n, K_PLANTADO, GRADO_MEDIO / ((n - 1) * (1 - 1 / K_PLANTADO)), semilla)
+    raise ValueError(f"Familia desconocida: {familia!r}.")
+
+
+def _pico_memoria(funcion):
+    # Ejecuta `funcion` con `tracemalloc` activo y devuelve el pico de memoria en bytes.
+    # Se hace en una ejecución aparte, porque el rastreo hace más lento el código medido.
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def medir_lector(G):
+    # Tiempo de `leer_casos` (formato compacto) sobre el grafo escrito como archivo de casos.
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        escribir_caso(f, G, "Caso de benchmark")
+        ruta = f.name
+    try:
+        def leer():
+            return leer_casos(ruta, compacto=True, verbosidad=SILENCIO)
+        inicio = time.perf_counter()
+        leer()
+        segundos = time.perf_counter() - inicio
+        tam = os.path.getsize(ruta)
+        return {"segundos": segundos, "mb_por_s": tam / 2 ** 20 / segundos,
+                "aristas_por_s": G.number_of_edges() / segundos, "pico_memoria_bytes": _pico_memoria(leer)}
+    finally:
+        os.remove(ruta)
+
+
+def medir_conteo(G, k, semilla, repeticiones=5):
+    # Tiempo medio de `contar_conflictos` sobre una coloración aleatoria.
+    rng = random.Random(semilla)
+    colores = {n: rng.randrange(k) for n in G.nodes()}
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        contar_conflictos(G, colores)
+    segundos = (time.perf_counter() - inicio) / repeticiones
+    return {"segundos": segundos, "aristas_por_s": G.number_of_edges() / segundos,
+            "pico_memoria_bytes": _pico_memoria(lambda: contar_conflictos(G, colores))}
+
+
+def medir_busqueda(G, k, estrategia, semilla, presupuesto, **opciones):
+    # Iteraciones por segundo, movimientos evaluados por segundo y tiempo hasta
+    # cero conflictos de una búsqueda con k colores y un plazo de `presupuesto` s.
+    # Los movimientos evaluados los cuenta la propia búsqueda en las estadísticas.
+    resolver = ESTRATEGIAS[estrategia]
+    random.seed(semilla)
+    est = estadisticas.activar()
+    inicio = time.perf_counter()
+    colores, _, iteraciones = resolver(G, k, sys.maxsize, registrar_pasos=False,
+                                       fecha_limite=time.monotonic() + presupuesto, **opciones)
+    segundos = time.perf_counter() - inicio
+    estadisticas.desactivar()
+    conflictos = contar_conflictos(G, colores)
+    resultado = {
+        "segundos": segundos, "k": k, "iteraciones": iteraciones,
+        "iteraciones_por_s": iteraciones / segundos, "conflictos_finales": conflictos,
+        "tiempo_hasta_cero_s": segundos if conflictos == 0 else None,
+        "movimientos_por_s": est.contadores["movimientos_evaluados"] / segundos,
+    }
+    random.seed(semilla)
+    resultado["pico_memoria_bytes"] = _pico_memoria(
+        lambda: resolver(G, k, 1, registrar_pasos=False, **opciones))
+    return resultado
+
+
+def medir_recoloreo(G, semilla, lote=10, actualizaciones=20):
+    # Latencia de `recolorear` con `actualizaciones` lotes de `lote` aristas nuevas
+    # al azar, partiendo de la coloración DSATUR.
+    H = G.a_networkx()
+    colores = coloracion_dsatur(H)
+    k = len(set(colores.values()))
+    rng = random.Random(semilla)
+    n = H.number_of_nodes()
+    latencias = []
+    for _ in range(actualizaciones):
+        aristas = [(rng.randrange(n), rng.randrange(n)) for _ in range(lote)]
+        colores, k, resumen = recolorear(H, colores, k, agregar_aristas=[(u, v) for u, v in aristas if u != v])
+        latencias.append(resumen["tiempo_s"])
+    segundos = sum(latencias)
+    pico = _pico_memoria(lambda: recolorear(H, colores, k, agregar_aristas=[(0, n - 1)]))
+    return {"segundos": segundos, "lote": lote, "k_final": k, "latencia_max_s": max(latencias),
+            "actualizaciones_por_s": actualizaciones / segundos, "pico_memoria_bytes": pico}
+
+
+def medir_animacion(G, k, semilla, max_frames=20):
+    # Frames por segundo de `crear_animacion` sobre la traza de una búsqueda local.
+    from visualization import crear_animacion, seleccionar_frames  # Importación diferida: matplotlib es pesado.
+    random.seed(semilla)
+    colores, traza, _ = ESTRATEGIAS["descenso"](G, k, 1000)
+    pasos = TrazaTotal()
+    pasos.agregar_traza(traza, k)
+    frames = len(seleccionar_frames(pasos, max_frames))
+    rutas = []
+    inicio = time.perf_counter()
+    rutas.append(crear_animacion(G, pasos, "benchmark", max_frames=max_frames))
+    segundos = time.perf_counter() - inicio
+    # Los frames se escriben a medida que se dibujan, así que el pico no depende
+    # del número de frames; se mide con pocos para no alargar la suite.
+    pico = _pico_memoria(lambda: rutas.append(crear_animacion(G, pasos, "benchmark", max_frames=3)))
+    for ruta in set(rutas):
+        os.remove(ruta)
+    return {"segundos": segundos, "frames": frames, "frames_por_s": frames / segundos, "pico_memoria_bytes": pico}
+
+
+def _metadatos(semilla):
+    # Versión del código y de la máquina, para saber qué se está comparando.
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": sys.version.split()[0],
+            "plataforma": platform.platform(), "procesador": platform.processor() or platform.machine(),
+            "semilla": semilla}
+
+
+def ejecutar_suite(instancias, semilla, presupuesto_busqueda=10.0, animar=True):
+    """
+    Mide el lector, el conteo de conflictos, las búsquedas y la animación sobre
+    cada instancia e imprime una línea por medición.
+
+    Args:
+        instancias (list): Tripletas `(familia, escala, G)`.
+        semilla (int): Semilla de las coloraciones aleatorias y las búsquedas.
+        presupuesto_busqueda (float, optional): Segundos como máximo por búsqueda.
+        animar (bool, optional): Si es False no se mide la animación.
+
+    Returns:
+        dict: `{"metadatos": {...}, "resultados": [...]}`, con un registro por
+              instancia y etapa.
+    """
+    resultados = []
+    for familia, escala, G in instancias:
+        n, m = G.number_of_nodes(), G.number_of_edges()
+        # Con los colores de DSATUR existe una solución sin conflictos.
+        k = len(set(coloracion_dsatur(G).values())) if n else 1
+        etapas = [("lector", lambda: medir_lector(G)), ("contar_conflictos", lambda: medir_conteo(G, k, semilla))]
+        for estrategia in ESTRATEGIAS:
+            etapas.append((f"busqueda_{estrategia}",
+                           lambda e=estrategia: medir_busqueda(G, k, e, semilla, presupuesto_busqueda)))
+        # Vecindarios del descenso restringidos a los nodos en conflicto.
+        for vecindario in VECINDARIOS[1:]:
+            etapas.append((f"descenso_{vecindario}",
+                           lambda v=vecindario: medir_busqueda(G, k, "descenso", semilla, presupuesto_busqueda,
+                                                               vecindario=v)))
+        if m <= MAX_ARISTAS_RECOLOREO:
+            etapas.append(("recoloreo", lambda: medir_recoloreo(G, semilla)))
+        if animar and m <= MAX_ARISTAS_ANIMACION:
+            etapas.append(("animacion", lambda: medir_animacion(G, k, semilla)))
+
+        for etapa, medir in etapas:
+            r = medir()
+            r.update(familia=familia, escala=escala, n=n, m=m, etapa=etapa)
+            resultados.append(r)
+            metrica, valor = _metrica_principal(r)
+            print(f"{familia:<12}{escala:<9}{n:>9}{m:>10}  {etapa:<20}{r['segundos']:>10.4f} s"
+                  f"  {metrica} = {valor:,.{0 if valor >= 100 else 2}f}  pico {r['pico_memoria_bytes'] / 2 ** 20:.1f} MB")
+    return {"metadatos": _metadatos(semilla), "resultados": resultados}
+
+
+def _metrica_principal(registro):
+    # Métrica de rendimiento (mayor es mejor) que resume cada etapa.
+    for metrica in ("frames_por_s", "iteraciones_por_s", "aristas_por_s", "actualizaciones_por_s"):
+        if registro.get(metrica) is not None:
+            return metrica, registro[metrica]
+    return "segundos", registro["segundos"]
+
+
+def comparar_con(anterior, actual, tolerancia=0.10):
+    # Compara dos resultados de la suite e imprime la variación de la métrica principal.
+    previos = {(r["familia"], r["escala"], r["etapa"]): r for r in anterior["resultados"]}
+    print(f"\nComparación con {anterior['metadatos'].get('commit')} ({anterior['metadatos'].get('fecha')}):")
+    regresiones = 0
+    for r in actual["resultados"]:
+        previo = previos.get((r["familia"], r["escala"], r["etapa"]))
+        if previo is None:
+            continue
+        metrica, valor = _metrica_principal(r)
+        _, valor_previo = _metrica_principal(previo)
+        cambio = valor / valor_previo - 1 if valor_previo else 0.0
+        marca = ""
+        if cambio < -tolerancia:
+            marca = "  ⚠️ regresión"
+            regresiones += 1
+        print(f"  {r['familia']:<12}{r['escala']:<9}{r['etapa']:<20}{metrica:<20}{cambio:+8.1%}{marca}")
+    print(f"  {regresiones} regresiones de más del {tolerancia:.0%}.")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara las estrategias de coloración.")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--tiempo-limite", type=float, default=60.0,
+                        help="Presupuesto de CPU por instancia y estrategia, en segundos.")
+    parser.add_argument("--sin-generados", action="store_true",
+                        help="Usa solo los casos del archivo de datos.")
+    parser.add_argument("--suite", action="store_true",
+                        help="Ejecuta la suite de rendimiento en lugar de la comparación de estrategias.")
+    parser.add_argument("--escalas", default="pequena,mediana",
+                        help=f"Escalas de la suite separadas por comas ({', '.join(ESCALAS)}).")
+    parser.add_argument("--familias", default=",".join(FAMILIAS),
+                        help=f"Familias de grafos de la suite ({', '.join(FAMILIAS)}).")
+    parser.add_argument("--dimacs", nargs="*", default=[],
+                        help="Archivos .col de DIMACS que se agregan a la suite.")
+    parser.add_argument("--presupuesto-busqueda", type=float, default=10.0,
+                        help="Segundos como máximo por búsqueda en la suite.")
+    parser.add_argument("--sin-animacion", action="store_true",
+                        help="No mide la animación en la suite.")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo JSON de resultados de la suite (por defecto, en results/benchmarks/).")
+    parser.add_argument("--comparar", default=None,
+                        help="Resultados JSON de una ejecución anterior con los que comparar.")
+    args = parser.parse_args()
+
+    if args.suite:
+        instancias = [(familia, escala, generar_instancia(familia, escala, args.semilla))
+                      for escala in args.escalas.split(",") for familia in args.familias.split(",")]
+        instancias += [("dimacs", os.path.basename(ruta), leer_dimacs(ruta)) for ruta in args.dimacs]
+        resultado = ejecutar_suite(instancias, args.semilla, args.presupuesto_busqueda, not args.sin_animacion)
+
+        salida = args.salida
+        if salida is None:
+            carpeta = os.path.join(results_dir, "benchmarks")
+            os.makedirs(carpeta, exist_ok=True)
+            salida = os.path.join(carpeta, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=1)
+        print(f"\nResultados guardados en {os.path.normpath(salida)}")
+
+        if args.comparar:
+            with open(args.comparar, encoding="utf-8") as f:
+                comparar_con(json.load(f), resultado)
+        sys.exit(0)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    ruta = os.path.join(script_dir, "..", "data", "casos_coloracion_grafos.txt")
+
+    instancias = [(f"caso_{i}", G) for i, G in iterar_casos(ruta, compacto=True)]
+    if not args.sin_generados:
+        for n, p in ((200, 0.05), (500, 0.02), (1000, 0.01)):
+            instancias.append((f"gnp_{n}_{p}", generar_gnp(n, p, args.semilla)))
+
+    comparar_estrategias(instancias, MAX_ITER_POR_ESTRATEGIA, args.semilla, args.tiempo_limite)
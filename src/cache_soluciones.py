@@ -0,0 +1,167 @@
+# Importaciones de librerías y módulos
+import os    # Rutas, fechas de modificación y reemplazo atómico de las entradas.
+import json  # Formato de las entradas de la caché.
+import time  # Marcas de tiempo para la política LRU.
+from graph_utils import GrafoCSR, huella_grafo, results_dir, escritura_atomica, podar_cache  # Grafo compacto, huella canónica, carpeta de resultados y cachés en disco.
+from estadisticas import cronometrar  # Tiempo de la caché en las estadísticas.
+
+# --- Caché de soluciones ---
+# Al volver a ejecutar `main.py` sobre el mismo archivo, la mayoría de los
+# grafos no cambió. Cada solución se guarda en disco con la huella del grafo
+# (número de nodos y lista ordenada de aristas) como clave, así que un grafo
+# idéntico se reconoce aunque cambie su número de caso o el orden de sus
+# aristas. La caché tiene un tamaño máximo y, al superarlo, se borran primero
+# las entradas usadas hace más tiempo (LRU, según la fecha de modificación,
+# que se renueva al leer), igual que la caché de posiciones.
+carpeta_cache_soluciones = os.path.join(results_dir, "cache_soluciones")
+TAM_MAX_CACHE_SOLUCIONES = 64 * 1024 * 1024  # Bytes.
+VERSION = 1  # Se incrementa si cambia el formato de las entradas.
+
+
+def es_coloracion_valida(G, colores, k):
+    """
+    Comprueba rápidamente que `colores` sea una coloración propia de `G` con `k` colores.
+
+    Se detiene en la primera arista en conflicto, así que una entrada dañada o
+    de otro grafo se descarta sin recorrer todo el grafo.
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+        colores (list): Color de cada nodo, en el orden de `sorted(G.nodes())`.
+        k (int): Número de colores.
+
+    Returns:
+        bool: True si la coloración cubre todos los nodos, usa colores en [0, k-1]
+        y no tiene aristas en conflicto.
+    """
+    if len(colores) != G.number_of_nodes():
+        return False
+    if colores and (min(colores) < 0 or max(colores) >= k):
+        return False
+    if isinstance(G, GrafoCSR):
+        # Los nodos del grafo compacto ya son 0..n-1.
+        return not any(colores[u] == colores[v] for u, v in zip(G.origen, G.destino))
+    posicion = {n: i for i, n in enumerate(sorted(G.nodes()))}
+    return not any(colores[posicion[u]] == colores[posicion[v]] for u, v in G.edges())
+
+
+class EntradaCache:
+    """
+    Lo que se sabe de un grafo por ejecuciones anteriores.
+
+    Atributos:
+      - mejor_k: Menor `k` con una coloración sin conflictos conocida.
+      - cota_inferior: Cota inferior (clique voraz) del grafo.
+      - optimo: True si `mejor_k` coincide con la cota inferior (no se puede mejorar).
+      - tiempo_s: Segundos de búsqueda acumulados en todas las ejecuciones.
+      - coloraciones: Diccionario k -> lista con el color de cada nodo (en el orden
+        de `sorted(G.nodes())`), una por cada `k` resuelto sin conflictos.
+    """
+
+    def __init__(self, mejor_k, cota_inferior, tiempo_s, coloraciones):
+        self.mejor_k = mejor_k
+        self.cota_inferior = cota_inferior
+        self.optimo = mejor_k == cota_inferior
+        self.tiempo_s = tiempo_s
+        self.coloraciones = coloraciones
+
+    def coloracion(self, G, k=None):
+        # Coloración guardada para `k` (por defecto, la del mejor) como diccionario nodo -> color.
+        colores = self.coloraciones[self.mejor_k if k is None else k]
+        return dict(zip(sorted(G.nodes()), colores))
+
+
+class CacheSoluciones:
+    """
+    Caché en disco de las mejores coloraciones de cada grafo.
+
+    Cada grafo ocupa un archivo JSON `<huella>.json` con la cota inferior, el
+    menor `k` resuelto, el tiempo acumulado y la coloración sin conflictos de
+    cada `k` resuelto. Las entradas se escriben en un temporal que luego se
+    renombra, así que varios procesos pueden compartir la caché (por ejemplo,
+    los trabajadores del modo lote). El objeto solo guarda la carpeta y el
+    tamaño máximo, y se puede enviar a otros procesos.
+
+    Args:
+        carpeta (str, optional): Carpeta de la caché.
+        tam_max (int, optional): Tamaño máximo de la caché en bytes.
+    """
+
+    def __init__(self, carpeta=carpeta_cache_soluciones, tam_max=TAM_MAX_CACHE_SOLUCIONES):
+        self.carpeta = carpeta
+        self.tam_max = tam_max
+
+    def _ruta(self, huella):
+        return os.path.join(self.carpeta, f"{huella}.json")
+
+    @cronometrar("cache")
+    def buscar(self, G, huella=None):
+        """
+        Devuelve la entrada del grafo, o None si no hay ninguna válida.
+
+        Cada coloración guardada se valida con `es_coloracion_valida` antes de
+        confiar en ella; las que no pasan se descartan (y la entrada se borra si
+        no queda ninguna).
+
+        Args:
+            G: El grafo (objeto de NetworkX o `GrafoCSR`).
+            huella (str, optional): Huella de `G`, si ya se calculó.
+
+        Returns:
+            EntradaCache | None: Lo que se sabe del grafo.
+        """
+        ruta = self._ruta(huella or huella_grafo(G))
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return None  # No está en la caché (o la entrada está dañada).
+        if datos.get("version") != VERSION or datos.get("n") != G.number_of_nodes():
+            return None
+
+        coloraciones = {}
+        for k, colores in datos.get("coloraciones", {}).items():
+            if es_coloracion_valida(G, colores, int(k)):
+                coloraciones[int(k)] = colores
+        if not coloraciones:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            return None
+        # Se renueva la fecha de la entrada para la política LRU.
+        os.utime(ruta, (time.time(), time.time()))
+        return EntradaCache(min(coloraciones), datos["cota_inferior"], datos.get("tiempo_s", 0.0), coloraciones)
+
+    @cronometrar("cache")
+    def guardar(self, G, soluciones, cota_inferior, tiempo_s, huella=None, anterior=None):
+        """
+        Guarda (o amplía) la entrada del grafo con las soluciones de esta ejecución.
+
+        Args:
+            G: El grafo (objeto de NetworkX o `GrafoCSR`).
+            soluciones (dict): k -> coloración sin conflictos (diccionario nodo -> color).
+            cota_inferior (int): Cota inferior del grafo.
+            tiempo_s (float): Segundos de búsqueda de esta ejecución; se suman a los anteriores.
+            huella (str, optional): Huella de `G`, si ya se calculó.
+            anterior (EntradaCache, optional): Entrada leída al empezar; sus coloraciones
+                se conservan para los `k` que esta ejecución no resolvió.
+        """
+        os.makedirs(self.carpeta, exist_ok=True)
+        ruta = self._ruta(huella or huella_grafo(G))
+        nodos = sorted(G.nodes())
+        coloraciones = dict(anterior.coloraciones) if anterior is not None else {}
+        for k, colores in soluciones.items():
+            coloraciones[k] = [colores[n] for n in nodos]
+        datos = dict(
+            version=VERSION,
+            n=G.number_of_nodes(),
+            m=G.number_of_edges(),
+            mejor_k=min(coloraciones),
+            cota_inferior=cota_inferior,
+            tiempo_s=round(tiempo_s + (anterior.tiempo_s if anterior is not None else 0.0), 6),
+            coloraciones={str(k): coloraciones[k] for k in sorted(coloraciones)},
+        )
+        with escritura_atomica(ruta, "w") as f:
+            json.dump(datos, f, separators=(",", ":"))
+        podar_cache(self.carpeta, self.tam_max, ".json")
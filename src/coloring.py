@@ -1,101 +1,697 @@
 import random
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from traza import Traza
+import estadisticas
+from estadisticas import cronometrar
 
+@cronometrar("conteo_conflictos")
 def contar_conflictos(G, colores):
     # Cuenta la cantidad de aristas cuyos extremos tienen el mismo color.
     # Recorre cada arista (u,v) y suma 1 si colores[u] == colores[v].
+    est = estadisticas.actual()
+    if est is not None:
+        est.sumar("recuentos_completos")
     return sum(1 for u, v in G.edges() if colores[u] == colores[v])
 
 
-def busqueda_local(G, k, max_iter, registrar_pasos=True):
+class ConjuntoIndexado:
+    """
+    Conjunto con alta, baja y elección al azar en O(1).
+
+    Los elementos se guardan en una lista y su posición en un diccionario; al
+    quitar uno, el último ocupa su lugar. Se recorre en el orden de la lista.
+    """
+
+    def __init__(self, elementos=()):
+        self.elementos = []
+        self.posicion = {}
+        for elemento in elementos:
+            self.agregar(elemento)
+
+    def agregar(self, elemento):
+        if elemento not in self.posicion:
+            self.posicion[elemento] = len(self.elementos)
+            self.elementos.append(elemento)
+
+    def quitar(self, elemento):
+        i = self.posicion.pop(elemento, None)
+        if i is None:
+            return
+        ultimo = self.elementos.pop()
+        if i < len(self.elementos):
+            self.elementos[i] = ultimo
+            self.posicion[ultimo] = i
+
+    def __len__(self):
+        return len(self.elementos)
+
+    def __iter__(self):
+        return iter(self.elementos)
+
+    def __contains__(self, elemento):
+        return elemento in self.posicion
+
+
+class TablaConflictos:
+    """
+    Motor incremental de conflictos para la búsqueda local.
+
+    Mantiene, para cada nodo y cada color, cuántos vecinos del nodo tienen ese
+    color (`tabla[nodo][color]`). Con esta tabla el número de conflictos que
+    resultaría de cambiar un nodo de color se obtiene en O(1), sin recorrer
+    todas las aristas, y aplicar el cambio solo cuesta O(grado) para actualizar
+    las filas de los vecinos.
+
+    Atributos:
+      - colores: Diccionario nodo -> color actual (se modifica en el lugar).
+      - tabla: Diccionario nodo -> lista de k contadores de vecinos por color.
+      - conflictos: Número total de conflictos de la coloración actual.
+      - en_conflicto: `ConjuntoIndexado` con los nodos que tienen algún vecino de
+        su mismo color (solo si se pidió `seguir_conflictos`; si no, None).
+    """
+
+    def __init__(self, G, colores, k, seguir_conflictos=False):
+        """
+        Construye la tabla a partir de una coloración completa en O(n·k + m).
+
+        Args:
+            G: El grafo (objeto de NetworkX o `GrafoCSR`).
+            colores (dict): Coloración inicial; la tabla la usa directamente.
+            k (int): Número de colores disponibles.
+            seguir_conflictos (bool, optional): Si es True, se mantiene además el
+                conjunto de nodos en conflicto, actualizado en cada `mover`.
+        """
+        self.G = G
+        self.k = k
+        self.colores = colores
+        self.tabla = {n: [0] * k for n in G.nodes()}
+        for u, v in G.edges():
+            if u == v:
+                # Un lazo siempre es conflicto y no cambia al recolorear el nodo,
+                # así que no participa en los deltas.
+                continue
+            self.tabla[u][colores[v]] += 1
+            self.tabla[v][colores[u]] += 1
+        self.conflictos = contar_conflictos(G, colores)
+        self.en_conflicto = None
+        if seguir_conflictos:
+            self.en_conflicto = ConjuntoIndexado(n for n in G.nodes() if self.tabla[n][colores[n]] > 0)
+
+    def delta(self, nodo, nuevo_color):
+        # Variación del total de conflictos si `nodo` pasara a `nuevo_color`:
+        # se pierden los conflictos con vecinos del color actual y se ganan
+        # los de vecinos que ya tienen el color nuevo.
+        fila = self.tabla[nodo]
+        return fila[nuevo_color] - fila[self.colores[nodo]]
+
+    def mover(self, nodo, nuevo_color):
+        # Aplica el cambio de color y actualiza las filas de los vecinos en O(grado).
+        color_original = self.colores[nodo]
+        if nuevo_color == color_original:
+            return
+        self.conflictos += self.delta(nodo, nuevo_color)
+        en_conflicto = self.en_conflicto
+        for vecino in self.G[nodo]:
+            if vecino == nodo:
+                continue
+            fila = self.tabla[vecino]
+            fila[color_original] -= 1
+            fila[nuevo_color] += 1
+            if en_conflicto is not None:
+                # Solo cambia el estado de los vecinos del color que se deja o del que se toma.
+                color_vecino = self.colores[vecino]
+                if color_vecino == color_original and fila[color_original] == 0:
+                    en_conflicto.quitar(vecino)
+                elif color_vecino == nuevo_color and fila[nuevo_color] == 1:
+                    en_conflicto.agregar(vecino)
+        self.colores[nodo] = nuevo_color
+        if en_conflicto is not None:
+            if self.tabla[nodo][nuevo_color] > 0:
+                en_conflicto.agregar(nodo)
+            else:
+                en_conflicto.quitar(nodo)
+
+
+# Vecindarios de `busqueda_local`. Con "completo" se evalúan todos los nodos en
+# cada iteración; los demás solo miran los nodos en conflicto (los únicos cuyo
+# cambio de color puede bajar el total), así que el costo de una iteración
+# depende del número de conflictos y no del tamaño del grafo:
+#   - "conflictos": mayor mejora entre los nodos en conflicto (mismo movimiento
+#     que "completo", salvo empates).
+#   - "primera": primera mejora, recorriendo los nodos en conflicto desde una
+#     posición al azar; para cada nodo se toma su mejor color.
+#   - "muestreo": mayor mejora entre `tam_muestra` nodos en conflicto al azar;
+#     si ninguno mejora, se revisan todos antes de dar la búsqueda por terminada.
+VECINDARIOS = ("completo", "conflictos", "primera", "muestreo")
+
+
+def _mayor_mejora(motor, nodos, k):
+    # Movimiento (nodo, color) que más reduce los conflictos entre `nodos`, o None.
+    colores, tabla = motor.colores, motor.tabla
+    mejor_delta = 0
+    mejor_movimiento = None
+    for nodo in nodos:
+        fila = tabla[nodo]
+        actual = fila[colores[nodo]]
+        for nuevo_color in range(k):
+            if fila[nuevo_color] - actual < mejor_delta:
+                mejor_delta = fila[nuevo_color] - actual
+                mejor_movimiento = (nodo, nuevo_color)
+    return mejor_movimiento
+
+
+def _primera_mejora(motor, k):
+    # Primer nodo en conflicto (desde una posición al azar) con un color que lo
+    # mejore; devuelve el movimiento (o None) y el número de nodos evaluados.
+    colores, tabla = motor.colores, motor.tabla
+    elementos = motor.en_conflicto.elementos
+    total = len(elementos)
+    if total == 0:
+        return None, 0
+    inicio = random.randrange(total)
+    for i in range(total):
+        nodo = elementos[(inicio + i) % total]
+        fila = tabla[nodo]
+        nuevo_color = min(range(k), key=fila.__getitem__)
+        if fila[nuevo_color] < fila[colores[nodo]]:
+            return (nodo, nuevo_color), i + 1
+    return None, total
+
+
+@cronometrar("busqueda")
+def busqueda_local(G, k, max_iter, registrar_pasos=True, colores_iniciales=None, detener=None,
+                   fecha_limite=None, progreso=None, vecindario="completo", tam_muestra=32):
     """
     Implementa el algoritmo de Búsqueda Local con estrategia de mayor mejora.
 
     El algoritmo busca una solución óptima para el problema de coloración de grafos
     reduciendo iterativamente el número de conflictos (aristas con nodos del mismo color).
+    Cada movimiento candidato se evalúa en O(1) con `TablaConflictos`, por lo que una
+    iteración cuesta O(n·k) en lugar de O(n·k·m).
 
     Parámetros:
-      - G: El grafo de entrada, representado como un objeto de NetworkX.
+      - G: El grafo de entrada, representado como un objeto de NetworkX o como un
+           `GrafoCSR` compacto (ambos exponen `nodes()`, `edges()` y `G[nodo]`).
       - k: El número máximo de colores disponibles para la coloración (los colores se
            representan como enteros de 0 a k-1).
       - max_iter: Límite de iteraciones externas. El algoritmo se detendrá si alcanza
                   este número de iteraciones o si no puede encontrar una mejora.
       - registrar_pasos: Un booleano opcional. Si es True, el algoritmo guarda
-                         cada mejora de la solución en la lista `pasos`, lo cual
-                         es útil para la visualización del proceso.
+                         cada mejora de la solución en la traza `pasos`, lo cual
+                         es útil para la visualización del proceso. Si es False
+                         no se copia ni se registra nada.
+      - colores_iniciales: Coloración opcional de la que partir (por ejemplo, la
+                           que produce `reducir_coloracion`). Si es None se parte
+                           de una coloración aleatoria.
+      - detener: Función opcional sin argumentos que se consulta al inicio de cada
+                 iteración; si devuelve True la búsqueda termina (cancelación).
+      - fecha_limite: Instante opcional de `time.monotonic()` a partir del cual la
+                      búsqueda termina y devuelve la coloración actual.
+      - progreso: Función opcional `progreso(iteracion, conflictos)` que se llama
+                  cada vez que mejora la coloración.
+      - vecindario: Uno de `VECINDARIOS`. Por defecto "completo" (todos los nodos en
+                    cada iteración); los demás solo evalúan los nodos en conflicto,
+                    que se mantienen de forma incremental.
+      - tam_muestra: Nodos en conflicto evaluados por iteración con "muestreo".
 
     Devuelve:
       - colores: Un diccionario que mapea cada nodo a su color final.
-      - pasos: Una lista de tuplas `(colores, conflictos)` que representan los estados
-               mejorados de la coloración a lo largo del proceso. Esta lista se usa
-               para crear la animación.
+      - pasos: Una `Traza` (coloración inicial más el registro de movimientos) que,
+               al recorrerla, entrega tuplas `(colores, conflictos)` con los estados
+               mejorados de la coloración a lo largo del proceso. Se usa para crear
+               la animación. Es una lista vacía si `registrar_pasos` es False.
       - num_iteraciones: El número de iteraciones completadas antes de que el algoritmo
                          se detuviera.
     """
 
-    # Agregado: Inicialización de la lista de pasos para la visualización
-    pasos = []  # Almacena los "snapshots" (coloración y número de conflictos) en cada mejora.
-    
+    if vecindario not in VECINDARIOS:
+        raise ValueError(f"Vecindario desconocido: {vecindario!r} (opciones: {', '.join(VECINDARIOS)}).")
+
     # Asignación inicial aleatoria de colores a cada nodo. Cada nodo recibe un
-    # color aleatorio en el rango [0, k-1].
-    colores = {n: random.randint(0, k - 1) for n in G.nodes()}
+    # color aleatorio en el rango [0, k-1]. Si se recibe una coloración inicial
+    # (arranque en caliente), se usa una copia de ella.
+    est = estadisticas.actual()
+    if colores_iniciales is None:
+        colores = {n: random.randint(0, k - 1) for n in G.nodes()}
+    else:
+        colores = dict(colores_iniciales)
+        if est is not None:
+            est.sumar("copias_coloracion")
     
-    # Se calculan los conflictos iniciales de la coloración aleatoria.
-    conflictos = contar_conflictos(G, colores)
+    # Se calculan los conflictos iniciales de la coloración aleatoria y se
+    # construye la tabla incremental que permite evaluar cada movimiento en O(1).
+    # Fuera del vecindario completo, la tabla mantiene además los nodos en conflicto.
+    motor = TablaConflictos(G, colores, k, seguir_conflictos=vecindario != "completo")
+    conflictos = motor.conflictos
     
     # Se registra el estado inicial del grafo (coloración y conflictos)
-    # como el primer paso para la animación.
-    pasos.append((colores.copy(), conflictos))
+    # como el primer paso para la animación. Las mejoras posteriores se guardan
+    # como movimientos (nodo, color anterior, color nuevo), no como copias.
+    traza = Traza(colores, conflictos) if registrar_pasos else None
     num_iteraciones = 0  # Contador de iteraciones externas.
+    mejoras = 0          # Movimientos aplicados (para las estadísticas).
+    evaluados = 0        # Nodos evaluados fuera del vecindario completo (para las estadísticas).
 
     # Bucle principal de la búsqueda local. Continúa mientras no se alcance el
     # límite de iteraciones o no se encuentre una solución mejor.
     for _ in range(max_iter):
-        mejor_colores = colores.copy()     # Copia de la coloración actual, que será la mejor candidata en esta iteración.
+        # Cancelación externa (por ejemplo, otro reinicio ya encontró solución).
+        if detener is not None and detener():
+            break
+        # Plazo agotado: como la búsqueda solo acepta mejoras, la coloración
+        # actual es la mejor vista hasta ahora.
+        if fecha_limite is not None and time.monotonic() >= fecha_limite:
+            break
+        mejor_movimiento = None            # Par (nodo, color) de la mejor mejora encontrada en esta iteración.
         mejor_conflictos = conflictos      # El número de conflictos actual.
         num_iteraciones += 1              # Se incrementa el contador de iteraciones externas.
 
-        # Se recorren todos los nodos para encontrar la mejor mejora global.
-        # Una "mejora" es un cambio de color en un solo nodo que reduce el total de conflictos.
-        for nodo in G.nodes():
-            color_original = colores[nodo]  # Se guarda el color original del nodo.
+        # Vecindarios restringidos a los nodos en conflicto.
+        if vecindario == "conflictos":
+            evaluados += len(motor.en_conflicto)
+            mejor_movimiento = _mayor_mejora(motor, motor.en_conflicto, k)
+        elif vecindario == "primera":
+            mejor_movimiento, vistos = _primera_mejora(motor, k)
+            evaluados += vistos
+        elif vecindario == "muestreo":
+            if len(motor.en_conflicto) > tam_muestra:
+                evaluados += tam_muestra
+                mejor_movimiento = _mayor_mejora(motor, random.sample(motor.en_conflicto.elementos, tam_muestra), k)
+            if mejor_movimiento is None:
+                # La muestra no mejoró: se revisan todos para no parar antes de un óptimo local.
+                evaluados += len(motor.en_conflicto)
+                mejor_movimiento = _mayor_mejora(motor, motor.en_conflicto, k)
+        else:
+            # Se recorren todos los nodos para encontrar la mejor mejora global.
+            # Una "mejora" es un cambio de color en un solo nodo que reduce el total de conflictos.
+            for nodo in G.nodes():
+                fila = motor.tabla[nodo]
+                # Conflictos actuales del nodo con sus vecinos; se restan al cambiar de color.
+                base = conflictos - fila[colores[nodo]]
 
-            # Se prueban todos los colores posibles para el nodo actual.
-            for nuevo_color in range(k):
-                # Si el nuevo color es diferente al color actual del nodo...
-                if nuevo_color != color_original:
-                    # Se asigna temporalmente el nuevo color al nodo para evaluarlo.
-                    colores[nodo] = nuevo_color
-                    # Se calcula el número de conflictos con este cambio.
-                    nuevos_conflictos = contar_conflictos(G, colores)
-
-                    # Si el nuevo estado tiene menos conflictos que la mejor opción
-                    # encontrada hasta ahora en esta iteración...
-                    if nuevos_conflictos < mejor_conflictos:
-                        # Se actualiza la mejor solución encontrada en la iteración.
-                        mejor_conflictos = nuevos_conflictos
-                        mejor_colores = colores.copy()  # Se guarda una copia completa de la solución mejorada.
-
-            # Se restaura el color original del nodo para no afectar las
-            # evaluaciones de los otros nodos en la iteración actual.
-            colores[nodo] = color_original
+                # Se prueban todos los colores posibles para el nodo actual.
+                for nuevo_color in range(k):
+                    # Si el nuevo color es diferente al color actual del nodo...
+                    if nuevo_color != colores[nodo]:
+                        # Conflictos que tendría la coloración con este cambio, leídos de la tabla.
+                        nuevos_conflictos = base + fila[nuevo_color]
+
+                        # Si el nuevo estado tiene menos conflictos que la mejor opción
+                        # encontrada hasta ahora en esta iteración...
+                        if nuevos_conflictos < mejor_conflictos:
+                            # Se actualiza la mejor solución encontrada en la iteración.
+                            mejor_conflictos = nuevos_conflictos
+                            mejor_movimiento = (nodo, nuevo_color)
 
         # Al final de la iteración, se aplica el mejor cambio de color encontrado.
-        if mejor_conflictos < conflictos:
-            # Si se encontró una mejora, se actualiza la solución principal.
-            colores = mejor_colores
-            conflictos = mejor_conflictos
+        if mejor_movimiento is not None:
+            # Si se encontró una mejora, se actualiza la solución principal
+            # y la tabla de conflictos de los vecinos del nodo movido.
+            nodo, nuevo_color = mejor_movimiento
+            color_anterior = colores[nodo]
+            motor.mover(nodo, nuevo_color)
+            conflictos = motor.conflictos
+            mejoras += 1
             
-            # Se registra este nuevo estado de la solución en la lista de pasos.
-            # Esta condición ya no es necesaria, ya que `registrar_pasos` ahora
-            # es `True` por defecto para la animación del proyecto.
-            # Agregado: Se guarda el snapshot de la mejora.
-            pasos.append((colores.copy(), conflictos))
+            # Se registra este nuevo estado de la solución en la traza.
+            if traza is not None:
+                traza.registrar(nodo, color_anterior, nuevo_color, conflictos)
+            if progreso is not None:
+                progreso(num_iteraciones, conflictos)
             
         else:
             # No se encontró ninguna mejora en toda la iteración.
             # El algoritmo ha llegado a un óptimo local y se detiene.
             break
 
-    # Se devuelve la coloración final, la lista de pasos para la animación y el
+    if est is not None:
+        # Cada nodo evaluado prueba sus k - 1 colores alternativos; con el
+        # vecindario completo se evalúan todos los nodos en cada iteración.
+        if vecindario == "completo":
+            evaluados = num_iteraciones * len(colores)
+        est.sumar("movimientos_evaluados", evaluados * (k - 1))
+        est.sumar("mejoras", mejoras)
+        if traza is not None:
+            est.registrar_traza(traza)
+
+    # Se devuelve la coloración final, la traza para la animación y el
     # número de iteraciones realizadas.
-    return colores, pasos, num_iteraciones
\ No newline at end of file
+    return colores, traza if traza is not None else [], num_iteraciones
+
+
+@cronometrar("busqueda")
+def busqueda_tabu(G, k, max_iter, registrar_pasos=True, tiempo_limite=None, tenencia_base=10, alfa=0.6,
+                  colores_iniciales=None, detener=None, fecha_limite=None, progreso=None):
+    """
+    Implementa una Búsqueda Tabú al estilo TabuCol.
+
+    A diferencia de `busqueda_local`, no se detiene en el primer óptimo local: en
+    cada iteración aplica el mejor movimiento permitido aunque empeore la solución.
+    Para no volver atrás, cuando un nodo abandona un color el par (nodo, color)
+    queda prohibido ("tabú") durante `tenencia_base` aleatorio + `alfa` por el
+    número de nodos en conflicto iteraciones. Un movimiento tabú se acepta igual
+    si produce una coloración mejor que la mejor vista (criterio de aspiración).
+
+    Solo se evalúan los nodos que están en conflicto, ya que son los únicos cuyo
+    cambio de color puede reducir el total.
+
+    Parámetros:
+      - G: El grafo de entrada (objeto de NetworkX o `GrafoCSR`).
+      - k: El número de colores disponibles (enteros de 0 a k-1).
+      - max_iter: Presupuesto de iteraciones.
+      - registrar_pasos: Si es True, se registra cada nueva mejor coloración en la traza `pasos`.
+      - tiempo_limite: Presupuesto opcional de tiempo en segundos.
+      - tenencia_base: Cota superior de la parte aleatoria de la tenencia tabú (al menos 1).
+      - alfa: Peso del número de nodos en conflicto en la tenencia tabú.
+      - colores_iniciales: Coloración opcional de la que partir en lugar de una aleatoria.
+      - detener: Función opcional de cancelación, consultada en cada iteración.
+      - fecha_limite: Instante opcional de `time.monotonic()` en el que termina la búsqueda.
+      - progreso: Función opcional `progreso(iteracion, conflictos)` que se llama con
+                  cada nueva mejor coloración.
+
+    Devuelve:
+      - colores: La mejor coloración encontrada (la de menos conflictos).
+      - pasos: `Traza` con cada nueva mejor coloración (lista vacía si no se registra).
+      - num_iteraciones: El número de iteraciones realizadas.
+    """
+    if tenencia_base < 1:
+        raise ValueError(f"La tenencia base debe ser al menos 1 (se recibió {tenencia_base}).")
+
+    # Misma inicialización que la búsqueda local.
+    if colores_iniciales is None:
+        colores = {n: random.randint(0, k - 1) for n in G.nodes()}
+    else:
+        colores = dict(colores_iniciales)
+    # El conjunto de nodos en conflicto evita recorrer todo el grafo en cada iteración.
+    motor = TablaConflictos(G, colores, k, seguir_conflictos=True)
+
+    # Mejor coloración vista hasta ahora; es la que se devuelve al final. Se
+    # actualiza solo en los nodos que cambiaron desde la mejor anterior
+    # (`modificados`), sin copiar la coloración completa.
+    mejor_colores = colores.copy()
+    mejor_conflictos = motor.conflictos
+    modificados = set()
+    traza = Traza(colores, mejor_conflictos) if registrar_pasos else None
+
+    # `tabu_hasta[nodo][color]` es la iteración hasta la que ese movimiento está prohibido.
+    tabu_hasta = {n: [0] * k for n in G.nodes()}
+    num_iteraciones = 0
+    evaluados = 0  # Nodos en conflicto recorridos; cada uno evalúa k - 1 colores.
+    mejoras = 0
+    # `tiempo_limite` (relativo) y `fecha_limite` (absoluta) se combinan en un solo plazo.
+    if tiempo_limite is not None:
+        limite_relativo = time.monotonic() + tiempo_limite
+        fecha_limite = limite_relativo if fecha_limite is None else min(fecha_limite, limite_relativo)
+
+    for iteracion in range(max_iter):
+        # Se termina al encontrar una coloración válida o al agotar el tiempo.
+        if mejor_conflictos == 0:
+            break
+        if fecha_limite is not None and time.monotonic() >= fecha_limite:
+            break
+        if detener is not None and detener():
+            break
+        num_iteraciones += 1
+
+        mejor_delta = None   # Menor variación de conflictos encontrada en esta iteración.
+        candidatos = []      # Movimientos (nodo, color) que alcanzan `mejor_delta`.
+        # Nodos en conflicto, usados también para calcular la tenencia. Los demás
+        # no tienen vecinos de su mismo color y no pueden reducir conflictos.
+        en_conflicto = len(motor.en_conflicto)
+
+        for nodo in motor.en_conflicto:
+            fila = motor.tabla[nodo]
+            actual = colores[nodo]
+            prohibido = tabu_hasta[nodo]
+            for nuevo_color in range(k):
+                if nuevo_color == actual:
+                    continue
+                delta = fila[nuevo_color] - fila[actual]
+                # Se descartan los movimientos tabú salvo que cumplan la aspiración.
+                if prohibido[nuevo_color] > iteracion and motor.conflictos + delta >= mejor_conflictos:
+                    continue
+                if mejor_delta is None or delta < mejor_delta:
+                    mejor_delta = delta
+                    candidatos = [(nodo, nuevo_color)]
+                elif delta == mejor_delta:
+                    candidatos.append((nodo, nuevo_color))
+
+        evaluados += en_conflicto
+        # Si todos los movimientos son tabú, se deja pasar la iteración para que expiren.
+        if not candidatos:
+            continue
+
+        # Los empates se rompen al azar para diversificar la búsqueda.
+        nodo, nuevo_color = random.choice(candidatos)
+        color_anterior = colores[nodo]
+        motor.mover(nodo, nuevo_color)
+        modificados.add(nodo)
+        tabu_hasta[nodo][color_anterior] = (
+            iteracion + 1 + random.randint(0, tenencia_base - 1) + int(alfa * en_conflicto)
+        )
+
+        # Se actualiza la mejor coloración si este movimiento la supera.
+        if motor.conflictos < mejor_conflictos:
+            mejor_conflictos = motor.conflictos
+            mejoras += 1
+            cambios = [(n, mejor_colores[n], colores[n]) for n in modificados if colores[n] != mejor_colores[n]]
+            for n, _, nuevo in cambios:
+                mejor_colores[n] = nuevo
+            modificados.clear()
+            if traza is not None:
+                traza.registrar_cambios(cambios, mejor_conflictos)
+            if progreso is not None:
+                progreso(num_iteraciones, mejor_conflictos)
+
+    est = estadisticas.actual()
+    if est is not None:
+        est.sumar("movimientos_evaluados", evaluados * (k - 1))
+        est.sumar("mejoras", mejoras)
+        # Copias: la coloración de trabajo y la mejor coloración.
+        est.sumar("copias_coloracion", 2 if colores_iniciales is not None else 1)
+        if traza is not None:
+            est.registrar_traza(traza)
+
+    return mejor_colores, traza if traza is not None else [], num_iteraciones
+
+
+def reducir_coloracion(G, colores, k):
+    """
+    Convierte una coloración válida con más de `k` colores en una de `k` colores.
+
+    Se eliminan las clases de color más pequeñas hasta quedar en `k`, se
+    renumeran las restantes a 0..k-1 y solo los nodos de las clases eliminadas
+    se recolorean, cada uno con el color menos usado entre sus vecinos. El
+    resultado sirve de arranque en caliente para la búsqueda en `k`: conserva
+    casi toda la solución anterior y sus conflictos quedan alrededor de los
+    nodos recoloreados.
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+        colores (dict): Coloración de partida (normalmente sin conflictos).
+        k (int): Número de colores de la nueva coloración.
+
+    Returns:
+        dict: La nueva coloración con colores en el rango [0, k-1].
+    """
+    est = estadisticas.actual()
+    if est is not None:
+        est.sumar("copias_coloracion")
+    # Tamaño de cada clase de color; se descartan las más pequeñas.
+    clases = {}
+    for c in colores.values():
+        clases[c] = clases.get(c, 0) + 1
+    usados = sorted(clases, key=lambda c: (clases[c], c))
+    descartados = set(usados[:max(0, len(usados) - k)])
+
+    # Las clases conservadas se renumeran de forma compacta manteniendo su orden.
+    renumeracion = {c: i for i, c in enumerate(sorted(c for c in usados if c not in descartados))}
+    nuevos = {}
+    pendientes = []
+    for nodo, c in colores.items():
+        if c in renumeracion:
+            nuevos[nodo] = renumeracion[c]
+        else:
+            pendientes.append(nodo)
+
+    # Se recolorean solo los nodos de las clases eliminadas, de forma voraz.
+    for nodo in pendientes:
+        cuenta = [0] * k
+        for vecino in G[nodo]:
+            if vecino != nodo and vecino in nuevos:
+                cuenta[nuevos[vecino]] += 1
+        nuevos[nodo] = min(range(k), key=cuenta.__getitem__)
+
+    # Se devuelve en el mismo orden de nodos que la coloración original.
+    return {nodo: nuevos[nodo] for nodo in colores}
+
+
+def busqueda_con_plazo(G, k, tiempo_limite, estrategia="tabu", progreso=None, max_iter=None, **opciones):
+    """
+    Punto de entrada "anytime": busca durante como mucho `tiempo_limite` segundos.
+
+    Al agotarse el plazo la estrategia termina de forma ordenada y se devuelve
+    la mejor coloración vista hasta ese momento junto con sus conflictos, así
+    que la latencia queda acotada por el plazo y no por el tamaño del grafo.
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+        k (int): Número de colores.
+        tiempo_limite (float): Plazo en segundos de reloj de pared.
+        estrategia (str, optional): Clave de `ESTRATEGIAS`. Por defecto "tabu".
+        progreso (callable, optional): `progreso(iteracion, conflictos)`, llamada
+            con cada mejora.
+        max_iter (int, optional): Límite adicional de iteraciones (por defecto, sin límite).
+        **opciones: Argumentos adicionales para la estrategia.
+
+    Returns:
+        tuple: `(colores, conflictos, pasos, num_iteraciones)`.
+    """
+    fecha_limite = time.monotonic() + tiempo_limite
+    if max_iter is None:
+        max_iter = sys.maxsize
+    colores, pasos, num_iteraciones = ESTRATEGIAS[estrategia](
+        G, k, max_iter, fecha_limite=fecha_limite, progreso=progreso, **opciones
+    )
+    return colores, contar_conflictos(G, colores), pasos, num_iteraciones
+
+
+# Estrategias de búsqueda disponibles, seleccionables por nombre desde `main`.
+# Todas comparten la firma `(G, k, max_iter, ...)` y devuelven `(colores, pasos, num_iteraciones)`.
+ESTRATEGIAS = {
+    "descenso": busqueda_local,
+    "tabu": busqueda_tabu,
+}
+
+
+# --- Reinicios múltiples en paralelo ---
+# El grafo se envía a cada proceso trabajador una sola vez, a través del
+# inicializador del pool, y queda en estas variables globales del trabajador.
+_GRAFO_TRABAJADOR = None
+_GANADOR_TRABAJADOR = None
+
+
+def _inicializar_trabajador(G, ganador):
+    global _GRAFO_TRABAJADOR, _GANADOR_TRABAJADOR
+    _GRAFO_TRABAJADOR = G
+    _GANADOR_TRABAJADOR = ganador
+
+
+def _ejecutar_reinicio(indice, semilla, estrategia, k, max_iter, colores_iniciales, opciones):
+    # Ejecuta un reinicio en el trabajador. Se cancela en cuanto algún reinicio de
+    # índice menor consigue cero conflictos, porque ese sería el resultado elegido.
+    ganador = _GANADOR_TRABAJADOR
+    if ganador.value < indice:
+        return indice, None
+    random.seed(semilla)
+    colores, pasos, iteraciones = ESTRATEGIAS[estrategia](
+        _GRAFO_TRABAJADOR, k, max_iter,
+        colores_iniciales=colores_iniciales,
+        detener=lambda: ganador.value < indice,
+        **opciones
+    )
+    conflictos = contar_conflictos(_GRAFO_TRABAJADOR, colores)
+    if conflictos == 0:
+        with ganador.get_lock():
+            if indice < ganador.value:
+                ganador.value = indice
+    return indice, (colores, pasos, iteraciones, conflictos)
+
+
+class ReiniciosParalelos:
+    """
+    Ejecuta varios reinicios independientes de una estrategia sobre el mismo
+    grafo en un pool de procesos.
+
+    El grafo se envía a cada trabajador una sola vez al crear el pool, así que
+    el mismo objeto puede resolver varios valores de `k` sin volver a copiarlo.
+    Se usa como gestor de contexto para cerrar el pool al terminar:
+
+        with ReiniciosParalelos(G, procesos=8) as multi:
+            colores, pasos, iteraciones = multi.resolver(k, 1000, reinicios=32, semilla=7)
+    """
+
+    def __init__(self, G, procesos=None):
+        contexto = multiprocessing.get_context()
+        # Menor índice de reinicio que ha llegado a cero conflictos (compartido).
+        self._ganador = contexto.Value('i', 0)
+        self._pool = ProcessPoolExecutor(
+            max_workers=procesos,
+            mp_context=contexto,
+            initializer=_inicializar_trabajador,
+            initargs=(G, self._ganador),
+        )
+
+    def resolver(self, k, max_iter, reinicios, semilla, estrategia="descenso", colores_iniciales=None, **opciones):
+        """
+        Lanza `reinicios` ejecuciones de la estrategia con semillas derivadas de `semilla`.
+
+        El resultado es reproducible: se devuelve el reinicio de menor índice que
+        llega a cero conflictos (o, si ninguno llega, el de menos conflictos), y
+        en cuanto uno lo consigue se cancelan los de índice mayor, tanto los que
+        esperan como los que están en ejecución.
+
+        Args:
+            k (int): Número de colores.
+            max_iter (int): Límite de iteraciones de cada reinicio.
+            reinicios (int): Número de reinicios independientes.
+            semilla (int): Semilla maestra de la que se derivan las de cada reinicio.
+            estrategia (str, optional): Clave de `ESTRATEGIAS`. Por defecto "descenso".
+            colores_iniciales (dict, optional): Si se da, el reinicio 0 parte de ella
+                y el resto de coloraciones aleatorias.
+            **opciones: Argumentos adicionales para la estrategia.
+
+        Returns:
+            tuple: `(colores, pasos, num_iteraciones)` del reinicio elegido.
+        """
+        generador = random.Random(semilla)
+        semillas = [generador.getrandbits(32) for _ in range(reinicios)]
+        with self._ganador.get_lock():
+            self._ganador.value = reinicios
+
+        futuros = {
+            self._pool.submit(
+                _ejecutar_reinicio, i, semillas[i], estrategia, k, max_iter,
+                colores_iniciales if i == 0 else None, opciones
+            ): i
+            for i in range(reinicios)
+        }
+        resultados = {}
+        for futuro in as_completed(futuros):
+            if futuro.cancelled():
+                continue
+            indice, resultado = futuro.result()
+            if resultado is None:
+                continue
+            resultados[indice] = resultado
+            if resultado[3] == 0:
+                # Los reinicios pendientes de índice mayor ya no pueden ganar.
+                for otro, j in futuros.items():
+                    if j > indice:
+                        otro.cancel()
+
+        # Elección determinista: menos conflictos y, a igualdad, menor índice.
+        indice = min(resultados, key=lambda i: (resultados[i][3], i))
+        colores, pasos, iteraciones, _ = resultados[indice]
+        return colores, pasos, iteraciones
+
+    def cerrar(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def busqueda_multiarranque(G, k, max_iter, reinicios, semilla, estrategia="descenso", procesos=None, **opciones):
+    """
+    Atajo para un único valor de `k`: crea un `ReiniciosParalelos`, resuelve y
+    cierra el pool. Devuelve `(colores, pasos, num_iteraciones)`.
+    """
+    with ReiniciosParalelos(G, procesos) as multi:
+        return multi.resolver(k, max_iter, reinicios, semilla, estrategia, **opciones)
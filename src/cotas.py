@@ -0,0 +1,100 @@
+# Importaciones de librerías y módulos
+import heapq  # Cola de prioridad para elegir el siguiente nodo en DSATUR.
+from estadisticas import cronometrar  # Tiempo de la etapa de cotas en las estadísticas.
+
+# --- Cotas para el número cromático ---
+# Estas funciones se ejecutan antes de la búsqueda local para acotar el rango de
+# valores de k que vale la pena probar: DSATUR da una coloración válida (cota
+# superior) y una clique da un mínimo de colores imprescindibles (cota inferior).
+
+@cronometrar("cotas")
+def coloracion_dsatur(G):
+    """
+    Colorea el grafo con la heurística DSATUR (grado de saturación).
+
+    En cada paso se colorea el nodo sin color con más colores distintos entre
+    sus vecinos (desempatando por grado) usando el menor color libre. La
+    coloración resultante no tiene conflictos y su número de colores es una
+    cota superior del número cromático.
+
+    Los lazos se ignoran al buscar el color libre: un nodo con lazo está en
+    conflicto con cualquier color, así que en un grafo con lazos la coloración
+    devuelta tiene conflictos (hay que comprobarlo con `contar_conflictos`).
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+
+    Returns:
+        dict: Un diccionario que mapea cada nodo a su color (enteros desde 0).
+    """
+    grados = dict(G.degree())
+    colores = {}
+    # Colores distintos presentes entre los vecinos ya coloreados de cada nodo.
+    saturacion = {n: set() for n in G.nodes()}
+
+    # Montículo con entradas (-saturación, -grado, nodo). Las entradas viejas se
+    # descartan al sacarlas si la saturación del nodo ya cambió.
+    monticulo = [(0, -grados[n], n) for n in G.nodes()]
+    heapq.heapify(monticulo)
+
+    while monticulo:
+        neg_sat, _, nodo = heapq.heappop(monticulo)
+        if nodo in colores or -neg_sat != len(saturacion[nodo]):
+            continue
+
+        # Menor color que no usa ningún vecino.
+        usados = saturacion[nodo]
+        color = 0
+        while color in usados:
+            color += 1
+        colores[nodo] = color
+
+        # Se actualiza la saturación de los vecinos aún sin color.
+        for vecino in G[nodo]:
+            if vecino in colores or color in saturacion[vecino]:
+                continue
+            saturacion[vecino].add(color)
+            heapq.heappush(monticulo, (-len(saturacion[vecino]), -grados[vecino], vecino))
+
+    # Se devuelve en el orden de nodos del grafo.
+    return {n: colores[n] for n in G.nodes()}
+
+
+@cronometrar("cotas")
+def clique_voraz(G, max_inicios=64):
+    """
+    Busca una clique grande de forma voraz para obtener una cota inferior.
+
+    Desde cada uno de los `max_inicios` nodos de mayor grado se hace crecer una
+    clique agregando siempre el candidato de mayor grado que sea vecino de todos
+    los nodos ya elegidos. Toda clique de tamaño c obliga a usar al menos c colores.
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+        max_inicios (int, optional): Número de nodos de partida a probar.
+
+    Returns:
+        int: El tamaño de la mayor clique encontrada (0 si el grafo no tiene nodos).
+    """
+    grados = dict(G.degree())
+    orden = sorted(grados, key=lambda n: -grados[n])
+    mejor = 1 if orden else 0
+
+    for inicio in orden[:max_inicios]:
+        # Ninguna clique que contenga a `inicio` puede superar su grado + 1.
+        if grados[inicio] + 1 <= mejor:
+            break
+        candidatos = set(G[inicio])
+        candidatos.discard(inicio)
+        tamano = 1
+        while candidatos:
+            # Cota: aunque se agregaran todos los candidatos no se superaría la mejor.
+            if tamano + len(candidatos) <= mejor:
+                break
+            elegido = max(candidatos, key=lambda n: (grados[n], -n))
+            tamano += 1
+            candidatos.intersection_update(G[elegido])
+            candidatos.discard(elegido)
+        mejor = max(mejor, tamano)
+
+    return mejor
@@ -0,0 +1,248 @@
+# Importaciones de librerías y módulos
+import io      # Búferes en memoria para codificar un frame a la vez.
+import struct  # Empaquetado binario de los bloques de PNG/APNG.
+import zlib    # CRC de los bloques de PNG/APNG.
+import numpy as np  # Comparación de frames para los GIF con paleta optimizada.
+from PIL import Image, GifImagePlugin  # Cuantización de colores y codificación de cada frame.
+
+# --- Escritores incrementales de animaciones ---
+# Cada escritor recibe los frames de uno en uno (`agregar`) y los escribe al
+# archivo en cuanto llegan, así que la memoria usada no depende del número de
+# frames: como mucho se retiene el frame anterior. Todos aceptan arreglos RGBA
+# (o RGB) de NumPy, como los que entrega `RenderizadorGrafo.frame`, y una
+# duración en segundos por frame.
+
+FORMATOS = ("gif", "apng", "mp4")
+
+
+def _caja_cambios(anterior, actual):
+    # Rectángulo (izquierda, arriba, derecha, abajo) que contiene los píxeles
+    # distintos entre dos frames, o None si son iguales.
+    filas, columnas = np.nonzero((anterior != actual).any(axis=2))
+    if len(filas) == 0:
+        return None
+    return int(columnas.min()), int(filas.min()), int(columnas.max()) + 1, int(filas.max()) + 1
+
+
+class EscritorGIF:
+    """
+    Escribe un GIF animado frame a frame.
+
+    Por defecto cada frame completo se cuantiza con su propia paleta (tabla de
+    colores local), igual que al guardar todos los frames de una vez. Con
+    `optimizar_paleta=True` solo se escribe el rectángulo que cambió respecto
+    al frame anterior, con una paleta ajustada a los colores de ese rectángulo,
+    y los frames sin cambios se funden con el anterior. Como entre dos estados
+    de la búsqueda cambian pocos nodos, el archivo es mucho más pequeño y se
+    codifica más rápido.
+    """
+
+    def __init__(self, ruta, optimizar_paleta=False, loop=0):
+        self.ruta = ruta
+        self.optimizar_paleta = optimizar_paleta
+        self.loop = loop
+        self._archivo = open(ruta, "wb")
+        self._anterior = None   # Último frame RGB recibido (modo optimizado).
+        self._pendiente = None  # Frame listo para escribir: [imagen P, desplazamiento, duración en s].
+        self.num_frames = 0
+
+    def agregar(self, imagen, duracion):
+        # Cuantiza el frame y deja pendiente el anterior escrito en el archivo.
+        rgb = np.ascontiguousarray(imagen[..., :3])
+        if self._anterior is None:
+            cuantizada = Image.fromarray(rgb).quantize(256)
+            header, _ = GifImagePlugin.getheader(cuantizada, info={"loop": self.loop, "duration": 1})
+            for bloque in header:
+                self._archivo.write(bloque)
+            self._anterior = rgb
+            self._pendiente = [cuantizada, (0, 0), duracion]
+            return
+
+        caja = (0, 0, rgb.shape[1], rgb.shape[0])
+        if self.optimizar_paleta:
+            caja = _caja_cambios(self._anterior, rgb)
+            if caja is None:
+                # Frame idéntico al anterior: solo se alarga la duración del pendiente.
+                self._pendiente[2] += duracion
+                return
+            self._anterior = rgb
+        self._escribir_pendiente()
+        recorte = Image.fromarray(np.ascontiguousarray(rgb[caja[1]:caja[3], caja[0]:caja[2]]))
+        self._pendiente = [recorte.quantize(256), caja[:2], duracion]
+
+    def _escribir_pendiente(self):
+        if self._pendiente is None:
+            return
+        imagen_p, desplazamiento, duracion = self._pendiente
+        opciones = {"duration": max(10, int(round(duracion * 1000)))}
+        if self.num_frames > 0:
+            opciones["include_color_table"] = True
+        if self.optimizar_paleta:
+            # Cada frame parcial se dibuja sobre el anterior sin borrarlo.
+            opciones["disposal"] = 1
+        for bloque in GifImagePlugin.getdata(imagen_p, desplazamiento, **opciones):
+            self._archivo.write(bloque)
+        self._pendiente = None
+        self.num_frames += 1
+
+    def cerrar(self):
+        if self._archivo.closed:
+            return
+        self._escribir_pendiente()
+        self._archivo.write(b";")  # Fin del GIF.
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _bloque_png(tipo, datos):
+    # Un bloque de PNG: longitud | tipo | datos | CRC(tipo + datos).
+    return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", zlib.crc32(tipo + datos))
+
+
+def _bloques_png(contenido):
+    # Recorre los bloques de un PNG codificado como pares (tipo, datos).
+    posicion = 8  # Se salta la firma.
+    while posicion < len(contenido):
+        longitud, tipo = struct.unpack_from(">I4s", contenido, posicion)
+        yield tipo, contenido[posicion + 8:posicion + 8 + longitud]
+        posicion += 12 + longitud
+
+
+class EscritorAPNG:
+    """
+    Escribe un PNG animado (APNG) frame a frame.
+
+    Cada frame se codifica como un PNG independiente con solo la región que
+    cambió respecto al anterior, y sus datos comprimidos se copian al archivo
+    como bloques `IDAT`/`fdAT`. El número total de frames, que va en la
+    cabecera `acTL`, se corrige al cerrar. Los colores son exactos (sin paleta).
+    """
+
+    FIRMA = b"\x89PNG\r\n\x1a\n"
+
+    def __init__(self, ruta, loop=0, nivel_compresion=6):
+        self.ruta = ruta
+        self.loop = loop
+        self.nivel_compresion = nivel_compresion
+        self._archivo = open(ruta, "wb")
+        self._anterior = None  # Último frame recibido, para escribir solo lo que cambia.
+        self._pos_actl = None  # Posición del bloque acTL, que se reescribe al cerrar.
+        self._secuencia = 0    # Número de secuencia de los bloques fcTL/fdAT.
+        self.num_frames = 0
+
+    def agregar(self, imagen, duracion):
+        # Codifica el frame (o solo la región que cambió) como PNG y copia sus
+        # datos comprimidos al archivo.
+        rgb = np.ascontiguousarray(imagen[..., :3])
+        caja = (0, 0, rgb.shape[1], rgb.shape[0])
+        if self._anterior is not None:
+            # El primer frame va completo; los siguientes solo con el rectángulo
+            # que cambió (o un píxel, si no cambió nada), que se pinta encima del anterior.
+            caja = _caja_cambios(self._anterior, rgb) or (0, 0, 1, 1)
+        self._anterior = rgb
+        buf = io.BytesIO()
+        recorte = np.ascontiguousarray(rgb[caja[1]:caja[3], caja[0]:caja[2]])
+        Image.fromarray(recorte).save(buf, "PNG", compress_level=self.nivel_compresion)
+        bloques = list(_bloques_png(buf.getvalue()))
+        cabecera = next(datos for tipo, datos in bloques if tipo == b"IHDR")
+        ancho, alto = struct.unpack_from(">II", cabecera)
+
+        if self._pos_actl is None:
+            self._archivo.write(self.FIRMA + _bloque_png(b"IHDR", cabecera))
+            self._pos_actl = self._archivo.tell()
+            self._archivo.write(_bloque_png(b"acTL", struct.pack(">II", 0, self.loop)))
+
+        # Control del frame: tamaño, desplazamiento, duración (en milisegundos) y
+        # modos de borrado/mezcla (no borrar, reemplazar la región).
+        retardo = min(int(round(duracion * 1000)), 0xFFFF)
+        self._archivo.write(_bloque_png(b"fcTL", struct.pack(
+            ">IIIIIHHBB", self._secuencia, ancho, alto, caja[0], caja[1], retardo, 1000, 0, 0)))
+        self._secuencia += 1
+        for tipo, datos in bloques:
+            if tipo != b"IDAT":
+                continue
+            if self.num_frames == 0:
+                self._archivo.write(_bloque_png(b"IDAT", datos))
+            else:
+                self._archivo.write(_bloque_png(b"fdAT", struct.pack(">I", self._secuencia) + datos))
+                self._secuencia += 1
+        self.num_frames += 1
+
+    def cerrar(self):
+        if self._archivo.closed:
+            return
+        if self._pos_actl is not None:
+            self._archivo.write(_bloque_png(b"IEND", b""))
+            self._archivo.seek(self._pos_actl)
+            self._archivo.write(_bloque_png(b"acTL", struct.pack(">II", self.num_frames, self.loop)))
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class EscritorMP4:
+    """
+    Escribe un video MP4 (H.264) frame a frame a través de ffmpeg.
+
+    El video tiene una tasa fija de `fps` cuadros por segundo; cada frame se
+    repite las veces necesarias para cubrir su duración (los cuadros repetidos
+    casi no ocupan espacio). Necesita el paquete opcional `imageio-ffmpeg`.
+    """
+
+    def __init__(self, ruta, fps=10):
+        try:
+            import imageio_ffmpeg  # noqa: F401  (solo se comprueba que esté instalado)
+        except ImportError:
+            raise ImportError("Para generar MP4 hace falta 'imageio-ffmpeg' (pip install imageio-ffmpeg).") from None
+        import imageio
+        self.ruta = ruta
+        self.fps = fps
+        self._escritor = imageio.get_writer(ruta, format="FFMPEG", mode="I", fps=fps, codec="libx264")
+        self.num_frames = 0
+
+    def agregar(self, imagen, duracion):
+        rgb = np.ascontiguousarray(imagen[..., :3])
+        for _ in range(max(1, int(round(duracion * self.fps)))):
+            self._escritor.append_data(rgb)
+        self.num_frames += 1
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def abrir_escritor(ruta_base, formato="gif", optimizar_paleta=False):
+    """
+    Crea el escritor incremental para el formato pedido.
+
+    Args:
+        ruta_base (str): Ruta del archivo sin extensión; se agrega la del formato.
+        formato (str, optional): "gif", "apng" (archivo .png) o "mp4".
+        optimizar_paleta (bool, optional): Solo para GIF; ver `EscritorGIF`.
+
+    Returns:
+        EscritorGIF | EscritorAPNG | EscritorMP4: El escritor abierto.
+    """
+    if formato == "gif":
+        return EscritorGIF(ruta_base + ".gif", optimizar_paleta=optimizar_paleta)
+    if formato == "apng":
+        return EscritorAPNG(ruta_base + ".png")
+    if formato == "mp4":
+        return EscritorMP4(ruta_base + ".mp4")
+    raise ValueError(f"Formato de animación desconocido: {formato!r} (opciones: {', '.join(FORMATOS)}).")
@@ -0,0 +1,174 @@
+# Importaciones de librerías y módulos
+import functools  # `wraps` para los decoradores de fases.
+import json       # Exportación de las estadísticas.
+import sys        # `sys._current_frames` para el perfilador por muestreo.
+import threading  # Hilo del perfilador por muestreo.
+import time       # Reloj de alta resolución para los tiempos por fase.
+from collections import Counter  # Conteo de pilas del perfilador por muestreo.
+
+# --- Estadísticas de la ejecución ---
+# Un único objeto `Estadisticas` activo por proceso acumula contadores y tiempos
+# por fase. Las funciones instrumentadas consultan `actual()` una vez por
+# llamada (no dentro de sus bucles internos) y, si no hay estadísticas activas,
+# no hacen nada más, así que el costo con la instrumentación desactivada es
+# una consulta de variable global por llamada.
+
+# Contadores disponibles, en el orden en que se muestran.
+CONTADORES = (
+    "movimientos_evaluados",  # Pares (nodo, color) evaluados por las búsquedas.
+    "mejoras",                # Movimientos aplicados que mejoraron la coloración.
+    "recuentos_completos",    # Recorridos de todas las aristas para contar conflictos.
+    "copias_coloracion",      # Copias completas de una coloración (diccionarios).
+    "casos_leidos",           # Grafos entregados por el lector.
+    "frames",                 # Frames dibujados para las animaciones.
+    "nodos_pelados",          # Nodos de grado menor que k apartados antes de buscar (suma sobre los k).
+    "componentes",            # Componentes conexas del núcleo resueltas por separado (suma sobre los k).
+)
+
+
+class Estadisticas:
+    """
+    Contadores, tiempos por fase y tamaño máximo de traza de una ejecución.
+
+    Los tiempos son de reloj de pared e inclusivos: una fase que llama a otra
+    (por ejemplo, "animacion" y "layout") incluye el tiempo de la interna.
+    """
+
+    def __init__(self):
+        self.contadores = dict.fromkeys(CONTADORES, 0)
+        self.tiempos = {}   # Fase -> segundos acumulados.
+        self.llamadas = {}  # Fase -> número de veces que se ejecutó.
+        self.pico_traza_estados = 0  # Mayor número de estados de una traza de búsqueda.
+        self.pico_traza_bytes = 0    # Mayor tamaño del registro de movimientos de una traza.
+
+    def sumar(self, contador, cantidad=1):
+        self.contadores[contador] += cantidad
+
+    def agregar_tiempo(self, fase, segundos):
+        self.tiempos[fase] = self.tiempos.get(fase, 0.0) + segundos
+        self.llamadas[fase] = self.llamadas.get(fase, 0) + 1
+
+    def registrar_traza(self, traza):
+        # Actualiza los picos con una traza recién generada.
+        self.pico_traza_estados = max(self.pico_traza_estados, len(traza))
+        self.pico_traza_bytes = max(self.pico_traza_bytes, traza.memoria_bytes())
+
+    def combinar(self, otra):
+        # Suma las estadísticas de otro proceso (como diccionario de `a_dict`).
+        for contador, valor in otra["contadores"].items():
+            self.contadores[contador] = self.contadores.get(contador, 0) + valor
+        for fase, segundos in otra["tiempos"].items():
+            self.tiempos[fase] = self.tiempos.get(fase, 0.0) + segundos
+            self.llamadas[fase] = self.llamadas.get(fase, 0) + otra["llamadas"][fase]
+        self.pico_traza_estados = max(self.pico_traza_estados, otra["pico_traza_estados"])
+        self.pico_traza_bytes = max(self.pico_traza_bytes, otra["pico_traza_bytes"])
+
+    def a_dict(self):
+        return {"contadores": dict(self.contadores), "tiempos": dict(self.tiempos),
+                "llamadas": dict(self.llamadas), "pico_traza_estados": self.pico_traza_estados,
+                "pico_traza_bytes": self.pico_traza_bytes}
+
+    def guardar(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False, indent=1)
+
+    def informe(self):
+        # Texto con los contadores y los tiempos por fase, listo para imprimir.
+        lineas = ["Contadores:"]
+        for contador, valor in self.contadores.items():
+            lineas.append(f"  {contador:<24}{valor:>14,}")
+        lineas.append(f"  {'pico_traza_estados':<24}{self.pico_traza_estados:>14,}")
+        lineas.append(f"  {'pico_traza_bytes':<24}{self.pico_traza_bytes:>14,}")
+        lineas.append("Tiempo por fase (inclusivo):")
+        for fase, segundos in sorted(self.tiempos.items(), key=lambda par: -par[1]):
+            lineas.append(f"  {fase:<24}{segundos:>12.4f} s{self.llamadas[fase]:>9} llamadas")
+        return "\n".join(lineas)
+
+
+# Estadísticas activas en este proceso, o None si la instrumentación está desactivada.
+_actual = None
+
+
+def actual():
+    # Devuelve las estadísticas activas, o None.
+    return _actual
+
+
+def activar(estadisticas=None):
+    # Activa la instrumentación en este proceso y devuelve el objeto que la acumula.
+    global _actual
+    _actual = estadisticas if estadisticas is not None else Estadisticas()
+    return _actual
+
+
+def desactivar():
+    global _actual
+    _actual = None
+
+
+def cronometrar(fase):
+    """
+    Decorador que acumula el tiempo de cada llamada en la fase indicada.
+
+    Si la instrumentación está desactivada, la función se llama directamente.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            estadisticas = _actual
+            if estadisticas is None:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                estadisticas.agregar_tiempo(fase, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+class PerfiladorMuestreo:
+    """
+    Perfilador por muestreo sin dependencias externas.
+
+    Un hilo toma cada `intervalo` segundos la pila del hilo perfilado y cuenta
+    cuántas veces aparece cada pila. El informe usa el formato de "pilas
+    plegadas" (`función;función;función cuenta`), que aceptan herramientas
+    como flamegraph.pl o speedscope. A diferencia de cProfile, no frena el
+    código perfilado más allá del costo del muestreo.
+    """
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.muestras = Counter()
+        self._objetivo = None
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        self._objetivo = threading.get_ident()
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+        self._hilo.start()
+
+    def _muestrear(self):
+        while not self._detener.wait(self.intervalo):
+            marco = sys._current_frames().get(self._objetivo)
+            pila = []
+            while marco is not None:
+                codigo = marco.f_code
+                pila.append(f"{codigo.co_name} ({codigo.co_filename.rsplit('/', 1)[-1]}:{codigo.co_firstlineno})")
+                marco = marco.f_back
+            if pila:
+                self.muestras[";".join(reversed(pila))] += 1
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def guardar(self, ruta):
+        # Escribe las pilas plegadas, de la más frecuente a la menos.
+        with open(ruta, "w", encoding="utf-8") as f:
+            for pila, cuenta in self.muestras.most_common():
+                f.write(f"{pila} {cuenta}\n")
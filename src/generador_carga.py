@@ -0,0 +1,171 @@
+# Importaciones de librerías y módulos
+import argparse    # Opciones de la línea de comandos.
+import asyncio     # Clientes concurrentes sobre una sola conexión cada uno.
+import json        # Protocolo del servicio y reporte de resultados.
+import os          # Rutas del socket y del reporte.
+import random      # Tamaños y semillas de los grafos generados.
+import subprocess  # Servicio lanzado por el propio generador (--lanzar).
+import sys         # Intérprete con el que se lanza el servicio.
+import time        # Latencias y duración de la prueba.
+from benchmark import generar_gnp  # Grafos aleatorios G(n, p).
+from graph_utils import results_dir  # Carpeta del socket por defecto y de los reportes.
+from cache_soluciones import es_coloracion_valida  # Comprobación de cada respuesta.
+
+# --- Generador de carga para el servicio de coloración ---
+# Abre `concurrencia` conexiones y en cada una envía peticiones de una en una
+# (bucle cerrado: la siguiente sale al llegar la respuesta anterior), con
+# grafos G(n, p) de tamaño aleatorio entre `n_min` y `n_max` y grado medio
+# `grado`. Mide la latencia de cada petición vista por el cliente y al final
+# informa el rendimiento (peticiones por segundo) y los percentiles 50, 95 y 99.
+# Los grafos se generan antes de empezar para no medir su construcción.
+
+SOCKET_POR_DEFECTO = os.path.join(results_dir, "servicio.sock")
+
+
+def percentil(valores, q):
+    """
+    Percentil `q` (entre 0 y 100) de una lista ya ordenada, por el método del rango más cercano.
+    """
+    if not valores:
+        return None
+    indice = max(0, min(len(valores) - 1, int(round(q / 100 * len(valores) + 0.5)) - 1))
+    return valores[indice]
+
+
+def generar_peticiones(cantidad, n_min, n_max, grado, presupuesto, semilla):
+    """
+    Genera las peticiones de la prueba.
+
+    Returns:
+        list: Pares `(peticion, G)`, con el grafo para validar la respuesta.
+    """
+    rng = random.Random(semilla)
+    peticiones = []
+    for i in range(cantidad):
+        n = rng.randint(n_min, n_max)
+        G = generar_gnp(n, min(1.0, grado / max(1, n - 1)), rng.getrandbits(32))
+        peticion = dict(id=i, n=n, aristas=[[u, v] for u, v in zip(G.origen, G.destino)],
+                        presupuesto=presupuesto, semilla=i)
+        peticiones.append((peticion, G))
+    return peticiones
+
+
+async def _conectar(socket_unix, puerto):
+    if socket_unix is not None:
+        return await asyncio.open_unix_connection(socket_unix, limit=1 << 26)
+    return await asyncio.open_connection("127.0.0.1", puerto, limit=1 << 26)
+
+
+async def _cliente(cola, socket_unix, puerto, latencias, fallos):
+    # Un cliente: toma peticiones de la cola y espera cada respuesta antes de la siguiente.
+    lector, escritor = await _conectar(socket_unix, puerto)
+    try:
+        while not cola.empty():
+            peticion, G = cola.get_nowait()
+            inicio = time.perf_counter()
+            escritor.write(json.dumps(peticion, separators=(",", ":")).encode() + b"\n")
+            await escritor.drain()
+            respuesta = json.loads(await lector.readline())
+            latencias.append(time.perf_counter() - inicio)
+            if "error" in respuesta:
+                fallos.append(f"{peticion['id']}: {respuesta['error']}")
+            elif respuesta.get("colores") is not None and not es_coloracion_valida(G, respuesta["colores"],
+                                                                                   respuesta["k"]):
+                fallos.append(f"{peticion['id']}: coloración con conflictos")
+    finally:
+        escritor.close()
+
+
+async def medir(peticiones, concurrencia, socket_unix=None, puerto=None):
+    """
+    Envía las peticiones al servicio con `concurrencia` clientes y mide las latencias.
+
+    Returns:
+        dict: Peticiones, fallos, duración, rendimiento y percentiles de latencia (en ms).
+    """
+    cola = asyncio.Queue()
+    for par in peticiones:
+        cola.put_nowait(par)
+    latencias, fallos = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(cola, socket_unix, puerto, latencias, fallos) for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    ms = lambda s: None if s is None else round(s * 1000, 3)
+    return dict(peticiones=len(latencias), fallos=len(fallos), ejemplos_fallos=fallos[:5],
+                duracion_s=round(duracion, 3), peticiones_por_s=round(len(latencias) / duracion, 2),
+                p50_ms=ms(percentil(latencias, 50)), p95_ms=ms(percentil(latencias, 95)),
+                p99_ms=ms(percentil(latencias, 99)), max_ms=ms(latencias[-1] if latencias else None))
+
+
+def lanzar_servicio(socket_unix, argumentos_servicio, espera=30.0):
+    """
+    Lanza `servicio.py` en un subproceso y espera a que acepte conexiones.
+
+    Returns:
+        subprocess.Popen: El proceso del servicio (hay que terminarlo al acabar).
+    """
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servicio.py")
+    proceso = subprocess.Popen([sys.executable, ruta, "--socket", socket_unix, *argumentos_servicio])
+    limite = time.monotonic() + espera
+    while not os.path.exists(socket_unix):
+        if proceso.poll() is not None or time.monotonic() > limite:
+            proceso.terminate()
+            raise RuntimeError("El servicio no arrancó.")
+        time.sleep(0.05)
+    return proceso
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador de carga para el servicio de coloración.")
+    parser.add_argument("--socket", default=None,
+                        help=f"Socket Unix del servicio (con --lanzar, por defecto {SOCKET_POR_DEFECTO}).")
+    parser.add_argument("--puerto", type=int, default=8765,
+                        help="Puerto TCP en 127.0.0.1 si no se usa --socket (por defecto 8765).")
+    parser.add_argument("--peticiones", type=int, default=500, help="Peticiones en total (por defecto 500).")
+    parser.add_argument("--concurrencia", type=int, default=16, help="Clientes simultáneos (por defecto 16).")
+    parser.add_argument("--n-min", type=int, default=10, help="Nodos mínimos de cada grafo (por defecto 10).")
+    parser.add_argument("--n-max", type=int, default=200, help="Nodos máximos de cada grafo (por defecto 200).")
+    parser.add_argument("--grado", type=float, default=6.0, help="Grado medio de los grafos (por defecto 6).")
+    parser.add_argument("--presupuesto", type=float, default=0.5,
+                        help="Segundos de presupuesto de cada petición (por defecto 0.5).")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de los grafos (por defecto 0).")
+    parser.add_argument("--lanzar", nargs=argparse.REMAINDER, default=None,
+                        help="Lanza el servicio en un subproceso; lo que sigue se le pasa como opciones "
+                             "(por ejemplo: --lanzar --trabajadores 4 --ventana-ms 2).")
+    parser.add_argument("--guardar", action="store_true",
+                        help="Guarda el reporte en results/benchmarks/carga_<fecha>.json.")
+    args = parser.parse_args()
+
+    socket_unix = args.socket
+    proceso = None
+    if args.lanzar is not None:
+        socket_unix = socket_unix or SOCKET_POR_DEFECTO
+        os.makedirs(os.path.dirname(socket_unix) or ".", exist_ok=True)
+        if os.path.exists(socket_unix):
+            os.remove(socket_unix)
+        proceso = lanzar_servicio(socket_unix, args.lanzar)
+
+    try:
+        peticiones = generar_peticiones(args.peticiones, args.n_min, args.n_max, args.grado,
+                                        args.presupuesto, args.semilla)
+        reporte = asyncio.run(medir(peticiones, args.concurrencia, socket_unix, args.puerto))
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+    print(f"📈 {reporte['peticiones']} peticiones en {reporte['duracion_s']} s "
+          f"({reporte['peticiones_por_s']} por segundo), {reporte['fallos']} fallos")
+    print(f"⏱️ Latencia: p50 {reporte['p50_ms']} ms, p95 {reporte['p95_ms']} ms, "
+          f"p99 {reporte['p99_ms']} ms, máx {reporte['max_ms']} ms")
+    for fallo in reporte["ejemplos_fallos"]:
+        print(f"   ❌ {fallo}")
+    if args.guardar:
+        carpeta = os.path.join(results_dir, "benchmarks")
+        os.makedirs(carpeta, exist_ok=True)
+        reporte["parametros"] = vars(args)
+        ruta = os.path.join(carpeta, f"carga_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False)
+        print(f"💾 Reporte guardado en {ruta}")
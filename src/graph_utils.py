@@ -4,6 +4,20 @@ import os
 import networkx as nx
 # Importa el módulo 'logging' para registrar eventos y errores.
 import logging
+# Importa 'contextmanager' para la escritura atómica de las entradas de las cachés.
+from contextlib import contextmanager
+# Importa 'array' para guardar los grafos compactos en memoria contigua de enteros.
+from array import array
+# Importa 'gzip' y 'mmap' para leer archivos de casos comprimidos o muy grandes sin cargarlos enteros.
+import gzip
+import mmap
+# Importa 'hashlib' para calcular huellas canónicas de los grafos.
+import hashlib
+# Importa 'time' y 'estadisticas' para la instrumentación opcional del lector.
+import time
+import estadisticas
+# Importa el nivel de verbosidad a partir del cual se informa cada caso leído.
+from resultados import NORMAL
 
 # --- Configuración Inicial y Manejo de Logs ---
 # Esta sección se ejecuta una sola vez al importar el módulo para configurar el entorno.
@@ -28,94 +42,450 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s" # Define el formato del mensaje del log.
 )
 
-# --- Funciones Principales ---
+# --- Representación compacta de grafos ---
+
+def _como_array(tipo, datos):
+    # Devuelve `datos` como `array` del tipo dado, copiando solo si hace falta.
+    if isinstance(datos, array) and datos.typecode == tipo:
+        return datos
+    resultado = array(tipo)
+    if isinstance(datos, memoryview) and datos.format == tipo:
+        resultado.frombytes(datos.cast("B"))
+    else:
+        resultado.extend(datos)
+    return resultado
 
-def leer_casos(ruta):
+
+class GrafoCSR:
     """
-    Lee uno o varios grafos desde un archivo de texto en un formato específico.
+    Grafo no dirigido compacto en formato CSR (Compressed Sparse Row).
 
-    El formato del archivo es el siguiente:
-    # Comentario opcional
-    n m
-    u1 v1
-    u2 v2
-    ...
-    um vm
-    
-    Donde:
-      - n: número de nodos del grafo.
-      - m: número de aristas del grafo.
-      - ui vi: los nodos conectados por una arista.
+    Los nodos son enteros contiguos de 0 a n-1. Los vecinos del nodo `u` ocupan
+    `vecinos_csr[offsets[u]:offsets[u + 1]]` (ordenados y sin repetir), y cada
+    arista aparece una sola vez en los arreglos paralelos `origen`/`destino`
+    con `origen[i] <= destino[i]`. Todo se guarda en `array.array` de enteros,
+    lo que ocupa unos pocos bytes por arista frente a los diccionarios anidados
+    de NetworkX.
+
+    Ofrece el subconjunto de la interfaz de `nx.Graph` que usan el solver y la
+    visualización (`nodes`, `edges`, `degree`, `G[u]`, ...). La conversión a
+    NetworkX solo se hace con `a_networkx()` cuando hay que dibujar.
+    """
+
+    def __init__(self, n, offsets, vecinos_csr, origen, destino):
+        self.n = n
+        self.offsets = offsets          # array('q') de tamaño n+1.
+        self.vecinos_csr = vecinos_csr  # array('i') con las listas de adyacencia concatenadas.
+        self.origen = origen            # array('i') con el primer extremo de cada arista.
+        self.destino = destino          # array('i') con el segundo extremo de cada arista.
+
+    def __reduce__(self):
+        # Al enviar el grafo a otro proceso, las vistas de memoria (por ejemplo, las
+        # de un almacén proyectado con mmap) se copian a arreglos normales.
+        return (GrafoCSR, (
+            self.n,
+            _como_array('q', self.offsets),
+            _como_array('i', self.vecinos_csr),
+            _como_array('i', self.origen),
+            _como_array('i', self.destino),
+        ))
+
+    @classmethod
+    def desde_aristas(cls, n, origen, destino):
+        """
+        Construye el grafo a partir de dos secuencias paralelas de extremos.
+
+        Las aristas repetidas (en cualquier sentido) se guardan una sola vez, igual
+        que en `nx.Graph`. Si alguna arista usa un nodo >= n, el número de nodos se
+        amplía para incluirlo, como haría NetworkX al agregar la arista.
+
+        Args:
+            n (int): Número de nodos declarado.
+            origen, destino: Secuencias de enteros con los extremos de cada arista.
+
+        Returns:
+            GrafoCSR: El grafo compacto.
+        """
+        origen = origen if isinstance(origen, array) else array('i', origen)
+        destino = destino if isinstance(destino, array) else array('i', destino)
+        if len(origen) != len(destino):
+            raise ValueError("Los arreglos de extremos tienen longitudes distintas.")
+        if origen and min(min(origen), min(destino)) < 0:
+            raise ValueError("Los nodos deben ser enteros no negativos.")
+        if origen:
+            n = max(n, max(origen) + 1, max(destino) + 1)
+
+        # Primera pasada: grado (con repeticiones) de cada nodo.
+        grados = array('q', bytes(8 * n))
+        for u, v in zip(origen, destino):
+            grados[u] += 1
+            if u != v:
+                grados[v] += 1
+
+        # Offsets provisionales como suma acumulada de los grados.
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u in range(n):
+            offsets[u + 1] = offsets[u] + grados[u]
+
+        # Segunda pasada: se rellenan las listas de adyacencia.
+        vecinos_csr = array('i', bytes(4 * offsets[n]))
+        cursor = array('q', offsets[:n])
+        for u, v in zip(origen, destino):
+            vecinos_csr[cursor[u]] = v
+            cursor[u] += 1
+            if u != v:
+                vecinos_csr[cursor[v]] = u
+                cursor[v] += 1
+        del cursor, grados
+
+        # Tercera pasada: se ordena cada lista, se eliminan repetidos compactando
+        # en el mismo arreglo y se extraen las aristas únicas con u <= v.
+        escritura = 0
+        nuevo_origen, nuevo_destino = array('i'), array('i')
+        inicio = offsets[0]
+        for u in range(n):
+            fin = offsets[u + 1]
+            offsets[u] = escritura
+            anterior = -1
+            for v in sorted(vecinos_csr[inicio:fin]):
+                if v == anterior:
+                    continue
+                anterior = v
+                vecinos_csr[escritura] = v
+                escritura += 1
+                if u <= v:
+                    nuevo_origen.append(u)
+                    nuevo_destino.append(v)
+            inicio = fin
+        offsets[n] = escritura
+        del vecinos_csr[escritura:]
+
+        return cls(n, offsets, vecinos_csr, nuevo_origen, nuevo_destino)
+
+    @classmethod
+    def desde_networkx(cls, G):
+        # Convierte un `nx.Graph` cuyos nodos son los enteros 0..n-1.
+        origen, destino = array('i'), array('i')
+        for u, v in G.edges():
+            origen.append(u)
+            destino.append(v)
+        return cls.desde_aristas(G.number_of_nodes(), origen, destino)
+
+    def a_networkx(self):
+        # Construye el `nx.Graph` equivalente; solo se usa para dibujar.
+        G = nx.Graph()
+        G.add_nodes_from(range(self.n))
+        G.add_edges_from(zip(self.origen, self.destino))
+        return G
+
+    # --- Interfaz compatible con NetworkX ---
+
+    def nodes(self):
+        return range(self.n)
+
+    def edges(self):
+        return zip(self.origen, self.destino)
+
+    def vecinos(self, u):
+        # Devuelve la porción del arreglo CSR con los vecinos de `u`.
+        return self.vecinos_csr[self.offsets[u]:self.offsets[u + 1]]
+
+    __getitem__ = vecinos
+
+    def neighbors(self, u):
+        return iter(self.vecinos(u))
+
+    def degree(self, u=None):
+        # Igual que NetworkX: sin argumento devuelve pares (nodo, grado).
+        # Un lazo suma 2 al grado de su nodo.
+        if u is not None:
+            return self._grado(u)
+        return ((v, self._grado(v)) for v in range(self.n))
+
+    def _grado(self, u):
+        vecinos = self.vecinos(u)
+        return len(vecinos) + (1 if u in vecinos else 0)
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return len(self.origen)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(range(self.n))
+
+    def __contains__(self, u):
+        return isinstance(u, int) and 0 <= u < self.n
+
+    def memoria_bytes(self):
+        # Tamaño aproximado de los arreglos del grafo en bytes.
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.vecinos_csr, self.origen, self.destino))
+
+
+def huella_grafo(G):
+    """
+    Calcula una huella canónica del grafo: SHA-256 del número de nodos y de la
+    lista ordenada de aristas normalizadas (u <= v).
+
+    Dos grafos con los mismos nodos y aristas tienen la misma huella aunque las
+    aristas se hayan leído en otro orden o sentido, y da igual que sean de
+    NetworkX o `GrafoCSR`. Se usa como clave de las cachés en disco.
 
     Args:
-        ruta (str): La ruta al archivo de texto con los casos de prueba.
+        G: El grafo (objeto de NetworkX con nodos enteros o `GrafoCSR`).
 
     Returns:
-        list: Una lista de objetos de NetworkX, donde cada objeto es un grafo
-              leído correctamente del archivo.
+        str: La huella en hexadecimal.
     """
-    casos = []  # Inicializa la lista para almacenar los grafos leídos.
-    
-    # Abre el archivo de forma segura con `encoding="utf-8"` para evitar errores
-    # con caracteres especiales y asegura que se cierre automáticamente.
-    with open(ruta, 'r', encoding="utf-8") as f:
-        # Lee todas las líneas, elimina los espacios en blanco y filtra las líneas vacías.
-        lineas = [line.strip() for line in f if line.strip() != ""]
+    if isinstance(G, GrafoCSR):
+        # Las aristas del grafo compacto ya están normalizadas y ordenadas.
+        aristas = zip(G.origen, G.destino)
+    else:
+        aristas = sorted((u, v) if u <= v else (v, u) for u, v in G.edges())
+
+    h = hashlib.sha256(array('q', [G.number_of_nodes()]).tobytes())
+    bloque = array('q')
+    for u, v in aristas:
+        bloque.append(u)
+        bloque.append(v)
+        # Se vuelca por bloques para no acumular todas las aristas en memoria.
+        if len(bloque) >= 1 << 16:
+            h.update(bloque.tobytes())
+            del bloque[:]
+    h.update(bloque.tobytes())
+    return h.hexdigest()
+
+
+# --- Cachés en disco ---
+# La caché de posiciones (`visualization`) y la de soluciones (`cache_soluciones`)
+# guardan un archivo por grafo, con la huella como nombre, y comparten la forma
+# de escribir las entradas y de limitar su tamaño.
+
+@contextmanager
+def escritura_atomica(ruta, modo="wb"):
+    """
+    Abre un archivo temporal que reemplaza a `ruta` solo si la escritura termina bien.
+
+    El temporal se llama `<ruta>.<pid>.tmp`, así que varios procesos pueden
+    escribir la misma entrada a la vez, y nadie lee nunca una entrada a medio
+    escribir. Si la escritura falla, el temporal se borra y `ruta` no cambia.
+
+        with escritura_atomica(ruta) as f:
+            f.write(datos)
+
+    Args:
+        ruta (str): Archivo final.
+        modo (str, optional): "wb" (binario) o "w" (texto en UTF-8).
+    """
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, modo, encoding=None if "b" in modo else "utf-8") as f:
+            yield f
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def podar_cache(carpeta, tam_max, extension):
+    """
+    Borra las entradas menos usadas hasta que la caché ocupe como mucho `tam_max` bytes.
+
+    El uso se mide por la fecha de modificación, que las cachés renuevan al leer
+    una entrada (LRU). Solo se consideran los archivos con `extension`: los
+    temporales de `escritura_atomica` pueden estar escribiéndose en otro proceso.
+
+    Args:
+        carpeta (str): Carpeta de la caché.
+        tam_max (int): Tamaño máximo en bytes.
+        extension (str): Extensión de las entradas terminadas (por ejemplo, ".json").
+    """
+    entradas = []
+    for nombre in os.listdir(carpeta):
+        if not nombre.endswith(extension):
+            continue
+        ruta = os.path.join(carpeta, nombre)
+        try:
+            info = os.stat(ruta)
+        except OSError:
+            continue  # Otro proceso la borró entretanto.
+        entradas.append((info.st_mtime, info.st_size, ruta))
+    total = sum(tam for _, tam, _ in entradas)
+    for _, tam, ruta in sorted(entradas):
+        if total <= tam_max:
+            break
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+        total -= tam
+
+
+# --- Funciones Principales ---
+
+def _lineas_archivo(ruta):
+    """
+    Genera las líneas no vacías del archivo como pares `(numero_linea, texto)`.
+
+    Los archivos comprimidos con gzip (detectados por su firma) se descomprimen
+    al vuelo; los de texto plano se recorren con `mmap`, de modo que el sistema
+    operativo pagina el archivo y la memoria usada no depende de su tamaño.
+    """
+    with open(ruta, 'rb') as f:
+        es_gzip = f.read(2) == b"\x1f\x8b"
+
+    if es_gzip:
+        with gzip.open(ruta, 'rb') as f:
+            for numero, linea in enumerate(f, 1):
+                texto = linea.decode("utf-8").strip()
+                if texto:
+                    yield numero, texto
+        return
+
+    if os.path.getsize(ruta) == 0:
+        return
+    with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for numero, linea in enumerate(iter(mm.readline, b""), 1):
+            texto = linea.decode("utf-8").strip()
+            if texto:
+                yield numero, texto
+
+
+def _construir_grafo(n, origen, destino, compacto):
+    # Construye el grafo final a partir de los arreglos de aristas.
+    if compacto:
+        # Construye el grafo compacto directamente desde los arreglos de aristas.
+        return GrafoCSR.desde_aristas(n, origen, destino)
+    # Crea un objeto de grafo no dirigido usando la librería NetworkX.
+    G = nx.Graph()
+    # Agrega 'n' nodos al grafo, numerados desde 0 hasta n-1.
+    G.add_nodes_from(range(n))
+    # Agrega todas las aristas leídas al grafo.
+    G.add_edges_from(zip(origen, destino))
+    return G
+
+
+def iterar_casos(ruta, compacto=False, verbosidad=NORMAL):
+    """
+    Lee los grafos de un archivo de casos de forma incremental, uno a la vez.
+
+    Es un generador: cada grafo se entrega en cuanto se termina de leer, así que
+    la memoria usada es la del caso actual y no la del archivo completo, y quien
+    lo consume puede empezar a resolver antes de que termine la lectura. Acepta
+    archivos de texto plano y comprimidos con gzip (ver `leer_casos` para el formato).
+
+    Si un caso está mal formado, el error se registra en el log y se salta hasta
+    el siguiente comentario (`# Caso X`), desde donde continúa la lectura. Los
+    casos se numeran por su posición en el archivo contando también los mal
+    formados, así que saltar uno no cambia el número de los siguientes.
+
+    Args:
+        ruta (str): La ruta al archivo de casos.
+        compacto (bool, optional): Si es True, los grafos se construyen como `GrafoCSR`.
+        verbosidad (int, optional): Nivel de `resultados`; desde NORMAL se informa cada caso leído.
+
+    Yields:
+        tuple: `(numero, G)` por cada caso leído correctamente, con su número de
+        caso (desde 1) y su grafo (NetworkX o `GrafoCSR`).
+    """
+    inicio = time.perf_counter()  # Para el tiempo de lectura en las estadísticas.
+    lineas = _lineas_archivo(ruta)
+    actual = next(lineas, None)  # Línea pendiente de procesar, o None al final del archivo.
+    ordinal = 0  # Número del caso actual en el archivo, incluidos los mal formados.
 
-    i = 0  # Inicializa un índice para recorrer las líneas del archivo.
-    
     # Bucle principal que procesa cada caso de grafo.
-    while i < len(lineas):
+    while actual is not None:
+        numero, texto = actual
         # Si la línea es un comentario (empieza con '#'), la ignora y avanza.
-        if lineas[i].startswith("#"):
-            i += 1
+        if texto.startswith("#"):
+            actual = next(lineas, None)
             continue
 
+        ordinal += 1
         try:
             # Lee el número de nodos (n) y aristas (m) del grafo actual.
             # `split()` divide la línea por espacios, y `map(int, ...)` convierte los resultados a enteros.
-            n, m = map(int, lineas[i].split())
-            i += 1  # Avanza a la siguiente línea, donde se esperan las aristas.
-            
-            edges = []  # Lista temporal para guardar las aristas del grafo actual.
-            
+            n, m = map(int, texto.split())
+            actual = next(lineas, None)  # Avanza a la siguiente línea, donde se esperan las aristas.
+
+            # Arreglos temporales con los extremos de las aristas del grafo actual.
+            origen, destino = array('i'), array('i')
+
             # Bucle para leer las 'm' aristas del grafo.
             for _ in range(m):
                 # Verifica si el archivo se ha quedado sin líneas antes de leer todas las aristas esperadas.
-                if i >= len(lineas):
+                if actual is None:
                     raise ValueError("El archivo termina antes de leer todas las aristas.")
-                
+                numero, texto = actual
+
                 # Lanza un error si se encuentra un comentario donde se espera una arista.
-                if lineas[i].startswith("#"):
+                if texto.startswith("#"):
                     raise ValueError("Se encontró un comentario donde se esperaba una arista.")
-                
+
                 # Lee los nodos de la arista (u, v) y los convierte a enteros.
-                u, v = map(int, lineas[i].split())
-                
-                # Agrega la arista a la lista temporal.
-                edges.append((u, v))
-                i += 1  # Avanza al siguiente par de nodos.
-            
-            # Crea un objeto de grafo no dirigido usando la librería NetworkX.
-            G = nx.Graph()
-            
-            # Agrega 'n' nodos al grafo, numerados desde 0 hasta n-1.
-            G.add_nodes_from(range(n))
-            
-            # Agrega todas las aristas leídas al grafo.
-            G.add_edges_from(edges)
-            
-            # Mensaje de depuración para confirmar que un caso ha sido leído correctamente.
-            print(f"📥 Caso leído -> Nodos: {G.number_of_nodes()}, Aristas: {G.number_of_edges()}")
-            
-            # Añade el grafo completo a la lista de casos.
-            casos.append(G)
+                u, v = map(int, texto.split())
+
+                # Agrega la arista a los arreglos temporales.
+                origen.append(u)
+                destino.append(v)
+                actual = next(lineas, None)  # Avanza al siguiente par de nodos.
+
+            G = _construir_grafo(n, origen, destino, compacto)
 
         except Exception as e:
             # Captura cualquier error (como un formato de archivo incorrecto) y lo registra en el log.
-            logging.error(f"Error al procesar el caso en la línea {i}: {e}")
-            # Rompe el bucle para no seguir procesando datos corruptos.
-            break
+            logging.error(f"Error al procesar el caso {ordinal} en la línea {numero}: {e}")
+            # Se descarta el resto del caso hasta el siguiente comentario y se sigue leyendo.
+            while actual is not None and not actual[1].startswith("#"):
+                actual = next(lineas, None)
+            continue
+
+        # Mensaje de depuración para confirmar que un caso ha sido leído correctamente.
+        if verbosidad >= NORMAL:
+            print(f"📥 Caso leído -> Nodos: {G.number_of_nodes()}, Aristas: {G.number_of_edges()}")
+        est = estadisticas.actual()
+        if est is not None:
+            # Solo cuenta el tiempo de lectura, no el que el consumidor pasa con el grafo.
+            est.agregar_tiempo("lectura", time.perf_counter() - inicio)
+            est.sumar("casos_leidos")
+        yield ordinal, G
+        inicio = time.perf_counter()
+
+
+def leer_casos(ruta, compacto=False, verbosidad=NORMAL):
+    """
+    Lee uno o varios grafos desde un archivo de texto en un formato específico.
+
+    El formato del archivo es el siguiente:
+    # Comentario opcional
+    n m
+    u1 v1
+    u2 v2
+    ...
+    um vm
     
-    # Devuelve la lista de grafos leídos.
-    return casos
\ No newline at end of file
+    Donde:
+      - n: número de nodos del grafo.
+      - m: número de aristas del grafo.
+      - ui vi: los nodos conectados por una arista.
+
+    Es una envoltura de `iterar_casos` que devuelve todos los grafos en una lista.
+    Los casos mal formados se registran en el log y se omiten.
+
+    Args:
+        ruta (str): La ruta al archivo de texto con los casos de prueba (puede estar
+              comprimido con gzip).
+        compacto (bool, optional): Si es True, cada grafo se construye directamente
+              como `GrafoCSR`, sin pasar por NetworkX. Por defecto es False.
+        verbosidad (int, optional): Nivel de `resultados`; desde NORMAL se informa
+              cada caso leído.
+
+    Returns:
+        list: Una lista de grafos (objetos de NetworkX, o `GrafoCSR` si `compacto`
+              es True) leídos correctamente del archivo.
+    """
+    return [G for _, G in iterar_casos(ruta, compacto, verbosidad)]
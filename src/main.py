@@ -2,142 +2,658 @@
 import time  # Módulo estándar para medir el tiempo de ejecución.
 import os  # Módulo para interactuar con el sistema operativo (manejo de archivos y rutas).
 import sys  # Módulo que proporciona acceso a parámetros del sistema, como `sys.stdout`.
-from graph_utils import leer_casos  # Importa la función para cargar datos de grafos.
-from coloring import busqueda_local, contar_conflictos  # Algoritmo de coloración y función para contar conflictos.
-from visualization import crear_animacion  # Función para generar animaciones (GIFs).
-
-# --- Clase Logger para capturar la salida en archivo y consola ---
-class Logger:
-    """
-    Clase que redirige la salida estándar (sys.stdout) a la consola y a un archivo de texto.
-    Esto permite registrar todo lo que se imprime sin la necesidad de llamar a una función
-    de guardado explícitamente.
-    """
-    def __init__(self, filename):
-        """
-        Inicializa el Logger, guardando la referencia a la salida original y abriendo el archivo.
-        
-        Args:
-            filename (str): La ruta del archivo donde se guardará la salida.
-        """
-        self.terminal = sys.stdout  # Guarda la referencia a la salida estándar original.
-        self.log = open(filename, "w", encoding="utf-8") # Abre el archivo en modo de escritura.
-
-    def write(self, message):
-        """
-        Método que se llama automáticamente cuando se usa `print`.
-        Redirige el mensaje a la consola y al archivo.
-        """
-        self.terminal.write(message)
-        self.log.write(message)
-
-    def flush(self):
-        """
-        Método necesario para vaciar los buffers de escritura.
-        Garantiza que el contenido se escriba en el archivo de forma inmediata.
-        """
-        self.terminal.flush()
-        self.log.flush()
+import argparse  # Módulo estándar para leer las opciones de la línea de comandos.
+import random  # Generador aleatorio; con `--semilla` la ejecución es reproducible.
+import io  # Búferes en memoria para capturar la salida de cada caso en modo lote.
+import logging  # Registro de errores en `results/errores.log` (configurado en graph_utils).
+import cProfile  # Perfilador determinista opcional (`--perfil cprofile`).
+import pstats  # Informe de texto del perfil de cProfile.
+from contextlib import redirect_stdout, contextmanager  # Captura de `print` por caso y perfilado de la ejecución.
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED  # Pools de procesos del modo lote.
+from graph_utils import iterar_casos, huella_grafo  # Lector incremental de los casos y huella canónica de un grafo.
+from almacen_casos import abrir_almacen  # Almacén binario precompilado de casos.
+from coloring import ESTRATEGIAS, VECINDARIOS, ReiniciosParalelos, contar_conflictos, reducir_coloracion  # Estrategias de coloración y utilidades.
+from reduccion import ResolutorPorComponentes  # Pelado de nodos de grado bajo y componentes conexas.
+from cache_soluciones import CacheSoluciones  # Soluciones de ejecuciones anteriores, por huella del grafo.
+from cotas import coloracion_dsatur, clique_voraz  # Cotas superior e inferior del número cromático.
+from traza import TrazaTotal  # Secuencia compacta de estados para la animación.
+from resultados import NIVELES, NORMAL, DETALLE, EscritorResultados, tabla_resumen  # Registros y verbosidad.
+import estadisticas  # Contadores y tiempos por fase opcionales.
+from estadisticas import PerfiladorMuestreo, cronometrar  # Perfilador por muestreo y tiempo por caso.
 
 # --- Función para imprimir solución ---
-def guardar_solucion(idx, colores, conflictos, tiempo, k, iteraciones):
+def guardar_solucion(idx, colores, conflictos, tiempo, k, iteraciones, cota_inferior=None, cota_superior=None,
+                     verbosidad=NORMAL):
     """
-    Imprime los detalles de la solución final. La salida se registra
-    automáticamente en el archivo de soluciones gracias al Logger.
+    Imprime los detalles de la solución final según el nivel de verbosidad. El
+    registro del caso lo escribe aparte `resultados.EscritorResultados`.
     """
+    if verbosidad < NORMAL:
+        return
     print(f"\n🟢 Caso {idx}")
     print(f"  - Colores usados: {len(set(colores.values()))} (k = {k})")
+    if cota_inferior is not None and cota_superior is not None:
+        print(f"  - Cotas: inferior (clique) = {cota_inferior}, superior (DSATUR) = {cota_superior}")
     print(f"  - Conflictos: {conflictos}")
     print(f"  - Iteraciones: {iteraciones}")
     print(f"  - Tiempo: {tiempo:.4f} segundos")
-    for nodo in sorted(colores.keys()):
-        print(f"    Nodo {nodo}: Color {colores[nodo]}")
+    if verbosidad >= DETALLE:
+        for nodo in sorted(colores.keys()):
+            print(f"    Nodo {nodo}: Color {colores[nodo]}")
 
-# --- Función principal ---
-def main():
-    """
-    Función principal que coordina la carga de datos, la ejecución del algoritmo
-    de coloración de grafos y la visualización de los resultados.
+# Límite de iteraciones por intento de `k` para cada estrategia. La búsqueda tabú
+# hace iteraciones más baratas (solo nodos en conflicto) y no se detiene en
+# óptimos locales, así que necesita un presupuesto mayor.
+MAX_ITER_POR_ESTRATEGIA = {
+    "descenso": 1000,
+    "tabu": 20000,
+}
+
+# --- Resolución de un caso ---
+@cronometrar("caso")
+def resolver_caso(idx, G, estrategia="descenso", max_iter=None, arranque_caliente=True, biseccion=False,
+                  reinicios=1, procesos=None, semilla=None, presupuesto_caso=None, presupuesto_k=None,
+                  verbosidad=NORMAL, reduccion=True, cache=None, vecindario="completo"):
     """
-    # Obtiene la ruta del directorio del script para construir rutas relativas.
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Construye las rutas a los archivos y directorios de entrada y salida.
-    ruta = os.path.join(script_dir, "..", "data", "casos_coloracion_grafos.txt")
-    results_dir = os.path.join(script_dir, "..", "results")
-    os.makedirs(results_dir, exist_ok=True)
-    soluciones_path = os.path.join(results_dir, "soluciones.txt")
+    Resuelve un caso: calcula las cotas, recorre los valores de `k` con la
+    estrategia elegida e imprime cada intento y la solución final (con el
+    detalle que indique `verbosidad`).
+
+    Los parámetros son los de `main` (ver su documentación). Si se da `semilla`,
+    el generador aleatorio se reinicia con una semilla derivada de ella y de
+    `idx`, de modo que cada caso es reproducible por sí mismo, tanto en modo
+    secuencial como en lote.
 
-    # Redirige la salida estándar a una instancia de la clase Logger.
-    sys.stdout = Logger(soluciones_path)
+    Si se da `cache` (una `CacheSoluciones`) y el grafo ya se resolvió con `k`
+    igual a su cota inferior, se reutiliza esa solución sin buscar; si se
+    resolvió con un `k` mayor, la búsqueda empieza desde esa solución en lugar
+    de la de DSATUR. Al terminar, las soluciones sin conflictos de esta
+    ejecución se agregan a la caché.
 
-    casos = leer_casos(ruta)
+    Returns:
+        tuple: `(pasos_totales, registro)`.
+            - pasos_totales (TrazaTotal | None): La secuencia de pasos `(colores, conf, k, descripcion)`
+              para `crear_animacion`, o None si no hubo solución sin conflictos.
+            - registro (dict): El resultado del caso con los campos de `resultados.CAMPOS`.
+    """
+    inicio_caso = time.perf_counter()
+    # Plazo absoluto del caso completo (incluida la etapa de cotas).
+    fin_caso = time.monotonic() + presupuesto_caso if presupuesto_caso is not None else None
+    if semilla is not None:
+        random.seed(semilla * 100003 + idx)
+    resolver = ESTRATEGIAS[estrategia]
+    # El vecindario solo es una opción de la búsqueda local (descenso).
+    opciones_busqueda = dict(vecindario=vecindario) if estrategia == "descenso" else {}
+    if max_iter is None:
+        max_iter = MAX_ITER_POR_ESTRATEGIA[estrategia]
 
-    # Bucle principal para procesar cada caso de grafo.
-    for idx, G in enumerate(casos, 1):
+    if verbosidad >= NORMAL:
         print(f"\n🟢 Resolviendo Caso {idx}...")
 
-        # Información del grafo para la estrategia de coloración.
-        grados = dict(G.degree())
+    # Soluciones de ejecuciones anteriores del mismo grafo (validadas al leerlas).
+    huella = entrada = None
+    if cache is not None:
+        huella = huella_grafo(G)
+        entrada = cache.buscar(G, huella)
+    if entrada is not None and entrada.optimo:
+        # La solución guardada ya usa el mínimo de colores: no hay nada que buscar.
+        colores = entrada.coloracion(G)
+        if verbosidad >= NORMAL:
+            print(f"♻️ Solución en caché con k = {entrada.mejor_k} (igual a la cota inferior); se omite la búsqueda.")
+        guardar_solucion(idx, colores, 0, 0.0, entrada.mejor_k, 0, verbosidad=verbosidad)
+        pasos_totales = TrazaTotal()
+        pasos_totales.agregar_estado(colores, 0, entrada.mejor_k, "Solución en caché sin conflictos")
+        registro = dict(caso=idx, estado="resuelto", n=G.number_of_nodes(), m=G.number_of_edges(),
+                        k=entrada.mejor_k, colores_usados=len(set(colores.values())), conflictos=0,
+                        cota_inferior=entrada.cota_inferior, cota_superior=None, optimo=True, iteraciones=0,
+                        tiempo_s=0.0, tiempo_total_s=round(time.perf_counter() - inicio_caso, 6),
+                        cache="omitido", colores=[colores[nodo] for nodo in sorted(colores)])
+        return pasos_totales, registro
+
+    # Información del grafo para la estrategia de coloración.
+    grados = dict(G.degree())
+    if verbosidad >= DETALLE:
         print(f"📊 Grados de los nodos: {grados}")
-        grado_max = max(grados.values())
+    grado_max = max(grados.values())
+    if verbosidad >= NORMAL:
         print(f"📈 Grado máximo: {grado_max}")
 
-        # Se establece el valor inicial de `k` (número de colores) basándose en el Teorema de Brooks.
-        k = grado_max + 1
-        print(f"🎯 k inicial calculado: {k}")
+    # Etapa de cotas: DSATUR da una coloración válida (cota superior) y una
+    # clique voraz el mínimo de colores imprescindibles (cota inferior). Así
+    # no se ejecutan búsquedas locales con valores de `k` muy por encima del
+    # número cromático (antes se partía de grado máximo + 1).
+    inicio = time.time()
+    colores_dsatur = coloracion_dsatur(G)
+    cota_superior = len(set(colores_dsatur.values()))
+    cota_inferior = min(clique_voraz(G), cota_superior)
+    tiempo_cotas = time.time() - inicio
+    if verbosidad >= NORMAL:
+        print(f"📉 Cota inferior (clique voraz): {cota_inferior}")
+        print(f"📈 Cota superior (DSATUR): {cota_superior}")
 
-        mejor_solucion = None
-        pasos_totales = []  # Lista para almacenar todos los pasos de la animación.
+    # La coloración DSATUR es la primera solución sin conflictos, salvo que el
+    # grafo tenga lazos: un lazo es un conflicto con cualquier color, así que
+    # entonces no existe ninguna coloración propia y no tiene sentido buscarla.
+    conflictos_dsatur = contar_conflictos(G, colores_dsatur)
+    mejor_solucion = (colores_dsatur, tiempo_cotas, cota_superior, 0) if conflictos_dsatur == 0 else None
+    # Trazas de todos los intentos para la animación; no guarda copias de coloraciones.
+    pasos_totales = TrazaTotal()
+    pasos_totales.agregar_estado(colores_dsatur, conflictos_dsatur, cota_superior, "Coloración inicial DSATUR")
+    # Coloraciones sin conflictos de esta ejecución por `k`, para la caché.
+    soluciones = None
+    if cache is not None:
+        soluciones = {cota_superior: colores_dsatur} if mejor_solucion else {}
 
-        # Bucle para encontrar la coloración óptima (mínimo de colores).
-        while k > 0:
-            inicio = time.time()
-            # `busqueda_local` devuelve una lista de pasos: `(colores, conflictos)`.
-            colores, pasos, iteraciones = busqueda_local(G, k, max_iter=1000)
-            tiempo = time.time() - inicio
-            conflictos = contar_conflictos(G, colores)
+    # Bucle para encontrar la coloración óptima (mínimo de colores). Se busca
+    # en [inferior, superior): `superior` siempre tiene una solución conocida.
+    inferior, superior = cota_inferior, cota_superior
+    if mejor_solucion is None:
+        if verbosidad >= NORMAL:
+            print(f"⚠️ El grafo tiene lazos: la coloración DSATUR tiene {conflictos_dsatur} conflictos "
+                  "y ninguna coloración puede evitarlos.")
+        inferior = superior
+    if entrada is not None and entrada.mejor_k < superior:
+        # Arranque desde la caché: la mejor solución de una ejecución anterior
+        # pasa a ser la cota superior y el punto de partida de la búsqueda.
+        superior = entrada.mejor_k
+        mejor_solucion = (entrada.coloracion(G), 0.0, superior, 0)
+        pasos_totales.agregar_estado(mejor_solucion[0], 0, superior, "Solución en caché sin conflictos")
+        if verbosidad >= NORMAL:
+            print(f"♻️ Solución en caché con k = {superior}: la búsqueda parte de ella.")
+    # Pool de reinicios paralelos para este grafo: se crea una vez por caso
+    # para enviar el grafo a los trabajadores una sola vez.
+    multi = ReiniciosParalelos(G, procesos) if reinicios > 1 and inferior < superior else None
+    # Sin reinicios paralelos, cada `k` se resuelve solo sobre el núcleo del grafo
+    # (sin los nodos de grado menor que `k`), componente a componente.
+    por_componentes = None
+    if reduccion and multi is None and inferior < superior:
+        por_componentes = ResolutorPorComponentes(G, procesos)
+    while inferior < superior:
+        # Si se agotó el presupuesto del caso se conserva la mejor solución hallada.
+        if fin_caso is not None and time.monotonic() >= fin_caso:
+            if verbosidad >= NORMAL:
+                print(f"\n⏱️ Se agotó el presupuesto de {presupuesto_caso} s del caso")
+            break
+        k = (inferior + superior) // 2 if biseccion else superior - 1
+        inicio = time.time()
+        # Plazo de este intento: el menor entre el del caso y el presupuesto por `k`.
+        fecha_limite = fin_caso
+        if presupuesto_k is not None:
+            fin_k = time.monotonic() + presupuesto_k
+            fecha_limite = fin_k if fecha_limite is None else min(fecha_limite, fin_k)
+        # Arranque en caliente: se parte de la última solución válida con una
+        # clase de color menos, en vez de una coloración aleatoria nueva.
+        colores_iniciales = None
+        if arranque_caliente and mejor_solucion:
+            colores_iniciales = reducir_coloracion(G, mejor_solucion[0], k)
+        # La estrategia elegida devuelve una traza de pasos: `(colores, conflictos)`.
+        if multi is not None:
+            colores, pasos, iteraciones = multi.resolver(
+                k, max_iter, reinicios, random.getrandbits(32), estrategia,
+                colores_iniciales=colores_iniciales, fecha_limite=fecha_limite, **opciones_busqueda
+            )
+        elif por_componentes is not None:
+            colores, pasos, iteraciones = por_componentes.resolver(
+                k, max_iter, estrategia, colores_iniciales=colores_iniciales, fecha_limite=fecha_limite,
+                **opciones_busqueda
+            )
+        else:
+            colores, pasos, iteraciones = resolver(G, k, max_iter=max_iter, colores_iniciales=colores_iniciales,
+                                                   fecha_limite=fecha_limite, **opciones_busqueda)
+        tiempo = time.time() - inicio
+        conflictos = contar_conflictos(G, colores)
 
+        if verbosidad >= NORMAL:
             print(f"\n🔎 Intento con k = {k}")
             print(f"  - Conflictos: {conflictos}")
             print(f"  - Colores usados: {len(set(colores.values()))}")
             print(f"  - Iteraciones: {iteraciones}")
             print(f"  - Tiempo: {tiempo:.4f} segundos")
+            if por_componentes is not None:
+                r = por_componentes.ultima_reduccion
+                print(f"  - Reducción: {r['pelados']} nodos pelados, {r['componentes']} componentes "
+                      f"(la mayor con {r['mayor']} nodos)")
+        # El color de cada nodo en cada intento solo se muestra en modo detallado:
+        # con grafos grandes, esa salida domina el tiempo de ejecución.
+        if verbosidad >= DETALLE:
             for nodo in sorted(G.nodes()):
                 print(f"    Nodo {nodo}: Color {colores[nodo]}")
 
-            # Acumula los pasos de cada ejecución de `busqueda_local` en una lista global.
-            for i, (col, conf) in enumerate(pasos):
-                descripcion = f"Iteración {i} con k={k} - Conflictos: {conf}"
-                # Almacena el estado completo para la animación.
-                # Es crucial usar `.copy()` para evitar que los cambios posteriores afecten a los pasos ya guardados.
-                pasos_totales.append((col.copy(), conf, k, descripcion))
-
-            if conflictos == 0:
-                # Si se encuentra una solución sin conflictos, se guarda como la mejor.
-                # Se usa `colores.copy()` para asegurar que se almacena una copia inmutable.
-                mejor_solucion = (colores.copy(), tiempo, k, iteraciones)
-                k -= 1  # Intenta con un número menor de colores.
-            else:
-                # Si hay conflictos, este `k` es demasiado bajo. El algoritmo termina.
-                break
+        # Acumula la traza de cada ejecución de `busqueda_local`. Los estados se
+        # reconstruyen bajo demanda al animar, así que no se copia nada aquí.
+        pasos_totales.agregar_traza(pasos, k)
+
+        if conflictos == 0:
+            # Si se encuentra una solución sin conflictos, se guarda como la mejor.
+            # `colores` ya es una coloración propia de este intento, no hace falta copiarla.
+            mejor_solucion = (colores, tiempo, k, iteraciones)
+            superior = k  # Intenta con un número menor de colores.
+            if soluciones is not None:
+                soluciones[k] = colores
+        elif biseccion:
+            # En bisección se sigue buscando entre este `k` y la mejor solución.
+            inferior = k + 1
+        else:
+            # Si hay conflictos, este `k` es demasiado bajo. El algoritmo termina.
+            break
 
-        # Procesa y guarda la mejor solución encontrada.
-        if mejor_solucion:
-            colores, tiempo, k_real, iteraciones = mejor_solucion
+    if multi is not None:
+        multi.cerrar()
+    if por_componentes is not None:
+        por_componentes.cerrar()
+    if cache is not None and soluciones:
+        cache.guardar(G, soluciones, cota_inferior, time.perf_counter() - inicio_caso, huella, entrada)
+
+    # Registro compacto del caso para `soluciones.jsonl`/`.csv`.
+    registro = dict(caso=idx, estado="sin_solucion", n=G.number_of_nodes(), m=G.number_of_edges(),
+                    k=None, colores_usados=None, conflictos=None, cota_inferior=cota_inferior,
+                    cota_superior=cota_superior, optimo=False, iteraciones=None, tiempo_s=None,
+                    tiempo_total_s=None, cache=None if entrada is None else "arranque", colores=None)
+
+    # Procesa y guarda la mejor solución encontrada.
+    if mejor_solucion:
+        colores, tiempo, k_real, iteraciones = mejor_solucion
+        registro.update(estado="resuelto", k=k_real, colores_usados=len(set(colores.values())), conflictos=0,
+                        optimo=k_real == cota_inferior, iteraciones=iteraciones, tiempo_s=round(tiempo, 6),
+                        tiempo_total_s=round(time.perf_counter() - inicio_caso, 6),
+                        colores=[colores[nodo] for nodo in sorted(colores)])
+        if verbosidad >= NORMAL:
             print(f"\n✅ Solución final sin conflictos usando k = {k_real}")
-            guardar_solucion(idx, colores, 0, tiempo, k_real, iteraciones)
+            if k_real == cota_inferior:
+                print("🏁 Se alcanzó la cota inferior: la solución usa el mínimo de colores.")
+        guardar_solucion(idx, colores, 0, tiempo, k_real, iteraciones, cota_inferior, cota_superior, verbosidad)
 
-            # Agrega un paso final explícito a la animación para mostrar el estado de la solución final.
-            pasos_totales.append((colores.copy(), 0, k_real, "Solución final sin conflictos"))
+        # Agrega un paso final explícito a la animación para mostrar el estado de la solución final.
+        pasos_totales.agregar_estado(colores, 0, k_real, "Solución final sin conflictos")
 
-            # Se llama a la función de animación con la lista completa de pasos.
-            # `crear_animacion` recibe una lista de tuplas con 4 elementos.
-            crear_animacion(G, pasos_totales, idx)
-        else:
-            print(f"\n❌ No se encontró solución sin conflictos para el Caso {idx}")
+        # Se devuelve la secuencia completa de pasos para `crear_animacion`, que
+        # al recorrerla entrega tuplas con 4 elementos.
+        return pasos_totales, registro
+
+    if verbosidad >= NORMAL:
+        print(f"\n❌ No se encontró solución sin conflictos para el Caso {idx}")
+    registro["tiempo_total_s"] = round(time.perf_counter() - inicio_caso, 6)
+    return None, registro
+
+# --- Modo lote ---
+def _estadisticas_trabajador(instrumentar):
+    # En un trabajador, activa estadísticas nuevas para la tarea si se pidieron.
+    return estadisticas.activar() if instrumentar else None
+
+def _resolver_caso_capturado(idx, G, opciones, instrumentar=False):
+    # Se ejecuta en un trabajador del pool: captura lo que imprime el caso para
+    # que el proceso principal lo muestre en orden. Con `instrumentar`, también
+    # devuelve las estadísticas del caso para sumarlas en el proceso principal.
+    est = _estadisticas_trabajador(instrumentar)
+    buffer = io.StringIO()
+    inicio = time.perf_counter()
+    with redirect_stdout(buffer):
+        pasos_totales, registro = resolver_caso(idx, G, **opciones)
+    latencia = time.perf_counter() - inicio
+    return buffer.getvalue(), pasos_totales, registro, latencia, est.a_dict() if est else None
+
+def _animar_caso(G, pasos_totales, idx, opciones_animacion, instrumentar=False):
+    # Se ejecuta en un trabajador del pool de animación y devuelve lo que tardó
+    # (y sus estadísticas, si se pidieron).
+    from visualization import crear_animacion  # Importación diferida: matplotlib es pesado.
+    est = _estadisticas_trabajador(instrumentar)
+    inicio = time.perf_counter()
+    crear_animacion(G, pasos_totales, idx, **opciones_animacion)
+    return time.perf_counter() - inicio, est.a_dict() if est else None
+
+def _resumen_latencias(valores):
+    # Texto con media, mediana, percentil 95 y máximo de una lista de tiempos.
+    if not valores:
+        return "-"
+    orden = sorted(valores)
+    p50 = orden[len(orden) // 2]
+    p95 = orden[min(len(orden) - 1, int(0.95 * len(orden)))]
+    return (f"media {sum(orden) / len(orden):.4f} s, p50 {p50:.4f} s, "
+            f"p95 {p95:.4f} s, máx {orden[-1]:.4f} s")
+
+def resolver_lote(casos, opciones, trabajadores=None, trabajadores_render=None, opciones_animacion=None,
+                  escritor=None):
+    """
+    Resuelve todos los casos en un pool de procesos y genera sus animaciones en
+    un segundo pool, de modo que el tiempo total deja de ser la suma de los casos.
+
+    Los casos se toman del iterable a medida que los trabajadores se liberan
+    (como mucho dos en vuelo por trabajador), así que un lector incremental no
+    se lee entero de golpe. La salida de cada caso se escribe en el orden de los
+    casos, aunque terminen en otro orden. Al final se imprime el rendimiento (casos por segundo) y la
+    latencia por caso de la resolución y de la animación.
+
+    Args:
+        casos (iterable): Pares `(idx, G)` con el número de caso y su grafo.
+        opciones (dict): Argumentos de `resolver_caso`.
+        trabajadores (int, optional): Procesos para resolver (por defecto, uno por núcleo).
+        trabajadores_render (int, optional): Procesos para las animaciones.
+        opciones_animacion (dict, optional): Argumentos adicionales de `crear_animacion`.
+        escritor (EscritorResultados, optional): Destino de los registros de los casos,
+            que se escriben en el orden de los casos.
+    """
+    opciones_animacion = opciones_animacion or {}
+    # Si hay estadísticas activas, cada trabajador acumula las suyas y se suman aquí.
+    est = estadisticas.actual()
+    instrumentar = est is not None
+    inicio_lote = time.perf_counter()
+    latencias_solver = []
+    latencias_render = []
+
+    # Solo se mantienen en vuelo unos pocos casos por trabajador: así el lector
+    # incremental (o el almacén) no se vuelca entero en memoria al empezar, y
+    # cada grafo se libera en cuanto se entregan su resultado y su animación.
+    max_en_vuelo = 2 * (trabajadores or os.cpu_count() or 1)
+    casos = iter(casos)
+
+    with ProcessPoolExecutor(trabajadores) as pool_solver, \
+            ProcessPoolExecutor(trabajadores_render) as pool_render:
+        en_vuelo = {}     # Futuro -> (idx, G) de los casos enviados que aún no terminaron.
+        salidas = {}      # Salida y registro de los casos terminados que aún no se pueden escribir.
+        # Números de caso en el orden en que se enviaron y posición del próximo a
+        # escribir; con `--casos` los números pueden tener huecos.
+        orden = []
+        siguiente = 0
+        animaciones = {}
+        quedan_casos = True
+
+        while quedan_casos or en_vuelo:
+            # Se completan los casos en vuelo con los siguientes del iterador.
+            while quedan_casos and len(en_vuelo) < max_en_vuelo:
+                caso = next(casos, None)
+                if caso is None:
+                    quedan_casos = False
+                    break
+                en_vuelo[pool_solver.submit(_resolver_caso_capturado, *caso, opciones, instrumentar)] = caso
+                orden.append(caso[0])
+            caso = None  # Solo `en_vuelo` conserva los grafos pendientes.
+            if not en_vuelo:
+                break
+
+            terminados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                idx, G = en_vuelo.pop(futuro)
+                try:
+                    salida, pasos_totales, registro, latencia, est_caso = futuro.result()
+                except Exception as e:
+                    logging.error(f"Error al resolver el caso {idx}: {e}")
+                    salida, pasos_totales = f"\n❌ Error al resolver el Caso {idx}: {e}\n", None
+                    registro = dict(caso=idx, estado="error", n=G.number_of_nodes(), m=G.number_of_edges())
+                else:
+                    latencias_solver.append(latencia)
+                    if est_caso is not None:
+                        est.combinar(est_caso)
+                if pasos_totales:
+                    animaciones[pool_render.submit(_animar_caso, G, pasos_totales, idx, opciones_animacion,
+                                                   instrumentar)] = idx
+                # El grafo ya se entregó al pool de animación (si hacía falta).
+                del G, pasos_totales
+
+                salidas[idx] = (salida, registro)
+                while siguiente < len(orden) and orden[siguiente] in salidas:
+                    salida, registro = salidas.pop(orden[siguiente])
+                    sys.stdout.write(salida)
+                    if escritor is not None:
+                        escritor.registrar(registro)
+                    siguiente += 1
+
+        for futuro in as_completed(animaciones):
+            try:
+                latencia, est_animacion = futuro.result()
+                latencias_render.append(latencia)
+                if est_animacion is not None:
+                    est.combinar(est_animacion)
+            except Exception as e:
+                logging.error(f"Error al animar el caso {animaciones[futuro]}: {e}")
+
+    total = time.perf_counter() - inicio_lote
+    num_casos = len(orden)
+    print(f"\n📊 Lote: {num_casos} casos en {total:.2f} s ({num_casos / total if total > 0 else 0:.2f} casos/s)")
+    print(f"  - Latencia de resolución por caso: {_resumen_latencias(latencias_solver)}")
+    print(f"  - Latencia de animación por caso: {_resumen_latencias(latencias_render)}")
+
+@contextmanager
+def _perfilar(perfil, carpeta):
+    """
+    Ejecuta el bloque bajo un perfilador y escribe su informe en `carpeta`.
+
+    Args:
+        perfil (str | None): "cprofile" (determinista; escribe `perfil.prof` y un
+            resumen en `perfil.txt`), "muestreo" (escribe las pilas plegadas en
+            `perfil_muestreo.txt`) o None para no perfilar.
+        carpeta (str): Carpeta de resultados.
+    """
+    if perfil is None:
+        yield
+        return
+    if perfil == "cprofile":
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+        try:
+            yield
+        finally:
+            perfilador.disable()
+            perfilador.dump_stats(os.path.join(carpeta, "perfil.prof"))
+            with open(os.path.join(carpeta, "perfil.txt"), "w", encoding="utf-8") as f:
+                pstats.Stats(perfilador, stream=f).sort_stats("cumulative").print_stats(40)
+        return
+    perfilador = PerfiladorMuestreo()
+    perfilador.iniciar()
+    try:
+        yield
+    finally:
+        perfilador.detener()
+        perfilador.guardar(os.path.join(carpeta, "perfil_muestreo.txt"))
+
+# --- Función principal ---
+def main(estrategia="descenso", max_iter=None, arranque_caliente=True, biseccion=False,
+         reinicios=1, procesos=None, semilla=None, lote=False, trabajadores=None, trabajadores_render=None,
+         almacen=False, seleccion=None, presupuesto_caso=None, presupuesto_k=None,
+         max_frames=None, procesos_render=None, formato="gif", gif_optimizado=False,
+         verbosidad=NORMAL, formato_resultados="jsonl", con_estadisticas=False, perfil=None, reduccion=True,
+         usar_cache=True, vecindario="completo"):
+    """
+    Función principal que coordina la carga de datos, la ejecución del algoritmo
+    de coloración de grafos y la visualización de los resultados.
+
+    Args:
+        estrategia (str, optional): Nombre de la estrategia de búsqueda a usar
+            (una clave de `coloring.ESTRATEGIAS`). Por defecto "descenso".
+        max_iter (int, optional): Límite de iteraciones por intento de `k`. Si es
+            None se usa el valor de `MAX_ITER_POR_ESTRATEGIA`.
+        arranque_caliente (bool, optional): Si es True, cada intento con `k` parte de
+            la solución sin conflictos de `k + 1` quitando su clase de color más
+            pequeña (`reducir_coloracion`) en lugar de una coloración aleatoria.
+        biseccion (bool, optional): Si es True, el valor de `k` se busca por bisección
+            dentro de [cota inferior, cota superior] en lugar de bajar de uno en uno.
+        reinicios (int, optional): Número de reinicios independientes por intento de
+            `k`. Si es mayor que 1 se ejecutan en paralelo con `ReiniciosParalelos`
+            y el primero que llega a cero conflictos cancela a los demás.
+        procesos (int, optional): Número de procesos del pool de reinicios (por
+            defecto, uno por núcleo).
+        semilla (int, optional): Semilla maestra para que la ejecución sea reproducible.
+        lote (bool, optional): Si es True, los casos se resuelven en paralelo con
+            `resolver_lote` y las animaciones se generan en un pool aparte.
+        trabajadores (int, optional): Procesos para resolver casos en modo lote.
+        trabajadores_render (int, optional): Procesos para las animaciones en modo lote.
+        almacen (bool, optional): Si es True, los casos se abren desde el almacén
+            binario compilado (`almacen_casos`), que se regenera solo si el archivo
+            de texto cambió, en lugar de volver a leer el texto.
+        seleccion (list, optional): Números de caso a resolver (desde 1). Por
+            defecto se resuelven todos.
+        presupuesto_caso (float, optional): Segundos como máximo por caso. Al
+            agotarse se conserva la mejor solución sin conflictos hallada.
+        presupuesto_k (float, optional): Segundos como máximo por intento de `k`;
+            la búsqueda se detiene y devuelve su mejor coloración hasta entonces.
+        max_frames (int, optional): Máximo de frames por animación; las trazas más
+            largas se submuestrean (ver `visualization.seleccionar_frames`).
+        procesos_render (int, optional): Procesos para dibujar los frames de cada animación.
+        formato (str, optional): Formato de las animaciones: "gif", "apng" o "mp4".
+        gif_optimizado (bool, optional): En GIF, escribe solo la región que cambia entre
+            frames, con una paleta ajustada a ella (archivos más pequeños).
+        verbosidad (int, optional): Nivel de detalle en la terminal (`resultados.NIVELES`).
+            Los grados y el color de cada nodo solo se muestran con `DETALLE`.
+        formato_resultados (str, optional): "jsonl" o "csv": formato de
+            `results/soluciones.<formato>`, con un registro por caso.
+        con_estadisticas (bool, optional): Si es True, se cuentan los movimientos
+            evaluados, recuentos completos, mejoras, copias de coloraciones, tiempo por
+            fase y tamaño máximo de traza; se imprimen al final y se guardan en
+            `results/estadisticas.json`. En modo lote se suman las de los trabajadores
+            (no las de los procesos de `ReiniciosParalelos`).
+        perfil (str, optional): "cprofile" o "muestreo" para perfilar la ejecución y
+            escribir el informe en `results/` (ver `_perfilar`). En modo lote solo se
+            perfila el proceso principal.
+        reduccion (bool, optional): Si es True (por defecto), en cada intento de `k` se
+            apartan los nodos de grado menor que `k`, el resto se resuelve por
+            componentes conexas (en paralelo las grandes) y los apartados se
+            reinsertan de forma voraz (`reduccion.ResolutorPorComponentes`). No se
+            aplica con `reinicios` > 1.
+        usar_cache (bool, optional): Si es True (por defecto), las soluciones se guardan
+            en `results/cache_soluciones/` con la huella del grafo como clave; en las
+            ejecuciones siguientes los grafos ya resueltos de forma óptima se omiten y
+            los demás parten de su mejor solución guardada (ver `resolver_caso`).
+        vecindario (str, optional): Vecindario de la búsqueda local (`coloring.VECINDARIOS`):
+            "completo" (por defecto) evalúa todos los nodos en cada iteración; "conflictos",
+            "primera" y "muestreo" solo los nodos en conflicto, así que cada iteración
+            cuesta según el número de conflictos y no el tamaño del grafo. Solo se aplica
+            a la estrategia "descenso".
+    """
+    opciones = dict(estrategia=estrategia, max_iter=max_iter, arranque_caliente=arranque_caliente,
+                    biseccion=biseccion, reinicios=reinicios, procesos=procesos, semilla=semilla,
+                    presupuesto_caso=presupuesto_caso, presupuesto_k=presupuesto_k, verbosidad=verbosidad,
+                    reduccion=reduccion, cache=CacheSoluciones() if usar_cache else None,
+                    vecindario=vecindario)
+    opciones_animacion = dict(max_frames=max_frames, procesos=procesos_render,
+                              formato=formato, optimizar_paleta=gif_optimizado)
+
+    # Obtiene la ruta del directorio del script para construir rutas relativas.
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Construye las rutas a los archivos y directorios de entrada y salida.
+    ruta = os.path.join(script_dir, "..", "data", "casos_coloracion_grafos.txt")
+    results_dir = os.path.join(script_dir, "..", "results")
+    os.makedirs(results_dir, exist_ok=True)
+    soluciones_path = os.path.join(results_dir, f"soluciones.{formato_resultados}")
+
+    # Un registro por caso, escrito en segundo plano (ver `resultados`).
+    escritor = EscritorResultados(soluciones_path, formato_resultados)
+    est = estadisticas.activar() if con_estadisticas else None
+
+    # Los casos se recorren como pares (número de caso, grafo).
+    almacen_casos = None
+    if almacen:
+        # Desde el almacén binario cada caso se abre por número en O(1), sin leer
+        # ni reconstruir el texto; así las reejecuciones parciales son inmediatas.
+        almacen_casos = abrir_almacen(ruta, verbosidad=verbosidad)
+        numeros = seleccion if seleccion else range(1, len(almacen_casos) + 1)
+        casos = ((idx, almacen_casos.caso(idx)) for idx in numeros if idx in almacen_casos)
+    else:
+        # Los grafos se leen en formato compacto y de forma perezosa: cada caso se
+        # resuelve en cuanto se termina de leer. Solo se convierten a NetworkX al animarlos.
+        casos = iterar_casos(ruta, compacto=True, verbosidad=verbosidad)
+        if seleccion:
+            casos = ((idx, G) for idx, G in casos if idx in seleccion)
+
+    try:
+        with escritor, _perfilar(perfil, results_dir):
+            if lote:
+                resolver_lote(casos, opciones, trabajadores, trabajadores_render, opciones_animacion, escritor)
+            else:
+                # La visualización (matplotlib) se importa solo al animar, para que
+                # quien use `resolver_caso` sin animaciones (como el servicio) no la cargue.
+                from visualization import crear_animacion
+                # Bucle principal para procesar cada caso de grafo.
+                for idx, G in casos:
+                    pasos_totales, registro = resolver_caso(idx, G, **opciones)
+                    escritor.registrar(registro)
+                    if pasos_totales:
+                        # Se llama a la función de animación con la lista completa de pasos.
+                        crear_animacion(G, pasos_totales, idx, **opciones_animacion)
+                    # Los grafos del almacén apuntan a su proyección en memoria, que
+                    # no se puede cerrar mientras quede alguno en uso.
+                    del G, pasos_totales
+    finally:
+        # El almacén mantiene el archivo mapeado en memoria hasta cerrarlo.
+        if almacen_casos is not None:
+            almacen_casos.cerrar()
+
+    # Tabla resumen de todos los casos.
+    print(f"\n📋 Resumen ({os.path.normpath(soluciones_path)}):")
+    print(tabla_resumen(escritor.resumen))
+
+    if est is not None:
+        estadisticas.desactivar()
+        est.guardar(os.path.join(results_dir, "estadisticas.json"))
+        print(f"\n📈 Estadísticas ({os.path.normpath(os.path.join(results_dir, 'estadisticas.json'))}):")
+        print(est.informe())
+
+def parsear_argumentos(argv=None):
+    # Lee las opciones de la línea de comandos.
+    from escritores_animacion import FORMATOS  # Formatos de animación disponibles.
+    parser = argparse.ArgumentParser(description="Coloración de grafos con búsqueda local.")
+    parser.add_argument("--estrategia", choices=sorted(ESTRATEGIAS), default="descenso",
+                        help="Estrategia de búsqueda (por defecto: descenso).")
+    parser.add_argument("--vecindario", choices=VECINDARIOS, default="completo",
+                        help="Vecindario del descenso: todos los nodos o solo los que están en conflicto.")
+    parser.add_argument("--max-iter", type=int, default=None,
+                        help="Límite de iteraciones por intento de k.")
+    parser.add_argument("--biseccion", action="store_true",
+                        help="Busca k por bisección entre la cota inferior y la superior.")
+    parser.add_argument("--reinicios", type=int, default=1,
+                        help="Reinicios paralelos por intento de k (por defecto 1, sin paralelismo).")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos del pool de reinicios (por defecto, uno por núcleo).")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="Semilla maestra para resultados reproducibles.")
+    parser.add_argument("--lote", action="store_true",
+                        help="Resuelve los casos en paralelo y genera las animaciones en un pool aparte.")
+    parser.add_argument("--trabajadores", type=int, default=None,
+                        help="Procesos para resolver casos en modo lote.")
+    parser.add_argument("--trabajadores-render", type=int, default=None,
+                        help="Procesos para generar animaciones en modo lote.")
+    parser.add_argument("--almacen", action="store_true",
+                        help="Abre los casos desde el almacén binario compilado (se regenera si el texto cambió).")
+    parser.add_argument("--casos", type=lambda t: [int(x) for x in t.split(",") if x],
+                        default=None, help="Lista de casos a resolver separados por comas (p. ej. 3,5,12).")
+    parser.add_argument("--presupuesto-caso", type=float, default=None,
+                        help="Segundos como máximo por caso.")
+    parser.add_argument("--presupuesto-k", type=float, default=None,
+                        help="Segundos como máximo por intento de k.")
+    parser.add_argument("--max-frames", type=int, default=None,
+                        help="Máximo de frames por animación (submuestrea las trazas largas).")
+    parser.add_argument("--procesos-render", type=int, default=None,
+                        help="Procesos para dibujar los frames de cada animación.")
+    parser.add_argument("--formato", choices=FORMATOS, default="gif",
+                        help="Formato de las animaciones (APNG y MP4 son más compactos para trazas largas).")
+    parser.add_argument("--gif-optimizado", action="store_true",
+                        help="En GIF, escribe solo la región que cambia entre frames con su propia paleta.")
+    parser.add_argument("--verbosidad", choices=list(NIVELES), default="normal",
+                        help="Detalle de la salida: 'detalle' muestra los grados y el color de cada nodo.")
+    parser.add_argument("--formato-resultados", choices=("jsonl", "csv"), default="jsonl",
+                        help="Formato del archivo de resultados (un registro por caso).")
+    parser.add_argument("--estadisticas", action="store_true",
+                        help="Cuenta movimientos, recuentos, copias y tiempo por fase, y los guarda en results/.")
+    parser.add_argument("--perfil", choices=("cprofile", "muestreo"), default=None,
+                        help="Perfila la ejecución y escribe el informe en results/.")
+    parser.add_argument("--sin-reduccion", action="store_true",
+                        help="Busca sobre el grafo completo, sin apartar nodos de grado bajo ni separar componentes.")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="No reutiliza ni guarda soluciones en results/cache_soluciones/.")
+    parser.add_argument("--arranque-frio", action="store_true",
+                        help="Parte de una coloración aleatoria en cada k en lugar de la solución anterior.")
+    return parser.parse_args(argv)
 
 # El bloque `if __name__ == "__main__":` asegura que el código principal
 # solo se ejecute cuando el script es el programa principal.
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parsear_argumentos()
+    main(estrategia=args.estrategia, max_iter=args.max_iter, arranque_caliente=not args.arranque_frio,
+         biseccion=args.biseccion, reinicios=args.reinicios, procesos=args.procesos, semilla=args.semilla,
+         lote=args.lote, trabajadores=args.trabajadores, trabajadores_render=args.trabajadores_render,
+         almacen=args.almacen, seleccion=args.casos,
+         presupuesto_caso=args.presupuesto_caso, presupuesto_k=args.presupuesto_k,
+         max_frames=args.max_frames, procesos_render=args.procesos_render,
+         formato=args.formato, gif_optimizado=args.gif_optimizado,
+         verbosidad=NIVELES[args.verbosidad], formato_resultados=args.formato_resultados,
+         con_estadisticas=args.estadisticas, perfil=args.perfil, reduccion=not args.sin_reduccion,
+         usar_cache=not args.sin_cache, vecindario=args.vecindario)
\ No newline at end of file
@@ -0,0 +1,194 @@
+# Importaciones de librerías y módulos
+import time  # Plazos de la reparación y latencia de cada actualización.
+from array import array  # Extremos de las aristas del subgrafo de reparación.
+from coloring import ESTRATEGIAS, contar_conflictos  # Estrategias de búsqueda para reparar la región.
+from graph_utils import GrafoCSR  # Subgrafo compacto de la región afectada.
+from estadisticas import cronometrar  # Tiempo de las actualizaciones en las estadísticas.
+
+# --- Recoloreo incremental de grafos dinámicos ---
+# Cuando el grafo cambia poco (unas aristas o nodos nuevos o quitados), no hace
+# falta resolverlo desde cero. Quitar aristas o nodos nunca crea conflictos;
+# agregarlos solo puede crearlos alrededor de los extremos nuevos. Por eso se
+# repara solo la región afectada (los nodos a distancia como mucho `radio` de
+# un conflicto) y el resto de la coloración queda fija.
+#
+# Para que la búsqueda local respete los colores fijos de fuera de la región
+# sin cambiar las estrategias, la región se resuelve junto con k nodos "ancla"
+# que forman una clique (uno por color): cada nodo de la región se une al
+# ancla de cada color que usan sus vecinos de fuera. En una coloración propia
+# las anclas tienen colores distintos, así que basta con renombrar los colores
+# según el de cada ancla para volver a la numeración original. Todo cuesta en
+# proporción al tamaño de la región, no al del grafo.
+
+
+def aplicar_cambios(G, colores, agregar_aristas=(), quitar_aristas=(), agregar_nodos=(), quitar_nodos=()):
+    """
+    Aplica un lote de cambios al grafo y devuelve los nodos que hay que revisar.
+
+    Primero se quitan nodos y aristas y luego se agregan. Los nodos quitados
+    también se quitan de `colores`; los extremos de una arista nueva que no
+    existían se agregan como nodos nuevos.
+
+    Args:
+        G (nx.Graph): El grafo; se modifica en el lugar.
+        colores (dict): Coloración actual; se modifica en el lugar.
+        agregar_aristas, quitar_aristas: Pares `(u, v)`.
+        agregar_nodos, quitar_nodos: Nodos.
+
+    Returns:
+        set: Nodos nuevos y extremos de las aristas nuevas.
+    """
+    for nodo in quitar_nodos:
+        if nodo in G:
+            G.remove_node(nodo)
+        colores.pop(nodo, None)
+    for u, v in quitar_aristas:
+        if G.has_edge(u, v):
+            G.remove_edge(u, v)
+
+    revisar = set()
+    for nodo in agregar_nodos:
+        G.add_node(nodo)
+        revisar.add(nodo)
+    for u, v in agregar_aristas:
+        G.add_edge(u, v)
+        revisar.add(u)
+        revisar.add(v)
+    return revisar
+
+
+def _en_conflicto(G, colores, nodo):
+    # True si algún vecino (sin contar un lazo) tiene el mismo color que `nodo`.
+    color = colores[nodo]
+    return any(v != nodo and colores[v] == color for v in G[nodo])
+
+
+def _region(G, semillas, radio, max_nodos):
+    # Nodos a distancia como mucho `radio` de las semillas (recorrido en anchura),
+    # sin pasar de `max_nodos` salvo por las propias semillas.
+    region = list(semillas)
+    vistos = set(region)
+    frontera = region
+    for _ in range(radio):
+        siguiente = []
+        for u in frontera:
+            for v in G[u]:
+                if v not in vistos and len(vistos) < max_nodos:
+                    vistos.add(v)
+                    siguiente.append(v)
+        region.extend(siguiente)
+        frontera = siguiente
+    return region
+
+
+def _reparar_region(G, colores, region, k, estrategia, max_iter, fecha_limite):
+    # Busca una k-coloración de la región compatible con los colores fijos de
+    # fuera. Devuelve (colores de la región o None si no lo logró, iteraciones).
+    local = {u: i for i, u in enumerate(region)}
+    anclas = len(region)  # El ancla del color c es el nodo local `anclas + c`.
+    origen, destino = array('i'), array('i')
+    for c in range(k):
+        for d in range(c + 1, k):
+            origen.append(anclas + c)
+            destino.append(anclas + d)
+    for i, u in enumerate(region):
+        colores_fuera = set()
+        for v in G[u]:
+            j = local.get(v)
+            if j is None:
+                colores_fuera.add(colores[v])
+            elif i < j:
+                origen.append(i)
+                destino.append(j)
+        for c in colores_fuera:
+            if c < k:
+                origen.append(i)
+                destino.append(anclas + c)
+    H = GrafoCSR.desde_aristas(anclas + k, origen, destino)
+
+    iniciales = {i: min(colores[u], k - 1) for i, u in enumerate(region)}
+    iniciales.update({anclas + c: c for c in range(k)})
+    colores_h, _, iteraciones = ESTRATEGIAS[estrategia](H, k, max_iter, registrar_pasos=False,
+                                                        colores_iniciales=iniciales, fecha_limite=fecha_limite)
+    if contar_conflictos(H, colores_h) > 0:
+        return None, iteraciones
+    # Las anclas tienen colores distintos: se deshace esa permutación.
+    original = {colores_h[anclas + c]: c for c in range(k)}
+    return {u: original[colores_h[i]] for i, u in enumerate(region)}, iteraciones
+
+
+@cronometrar("recoloreo")
+def recolorear(G, colores, k, agregar_aristas=(), quitar_aristas=(), agregar_nodos=(), quitar_nodos=(),
+               presupuesto=1.0, radio=2, max_nodos_region=5000, estrategia="tabu", max_iter=100000):
+    """
+    Actualiza una coloración sin conflictos tras un lote de cambios en el grafo.
+
+    Los nodos nuevos se colorean de forma voraz. Si aparecen conflictos, se
+    repara solo la región de radio `radio` alrededor de ellos con la estrategia
+    elegida, manteniendo fijos los demás colores. Si la reparación con `k`
+    colores no lo logra dentro de `presupuesto` segundos, se repite con `k + 1`
+    (el nuevo color solo lo usan nodos de la región). La latencia depende del
+    tamaño del cambio y de la región, no del grafo.
+
+    Args:
+        G (nx.Graph): El grafo con nodos enteros; se modifica en el lugar. Para un
+            `GrafoCSR`, que no admite cambios, se convierte antes con `a_networkx()`.
+        colores (dict): Coloración sin conflictos de `G` con colores en [0, k-1];
+            se actualiza en el lugar.
+        k (int): Número de colores de la coloración.
+        agregar_aristas, quitar_aristas: Pares `(u, v)` a agregar o quitar.
+        agregar_nodos, quitar_nodos: Nodos a agregar o quitar.
+        presupuesto (float, optional): Segundos por intento de reparación (con `k` y,
+            si hace falta, con `k + 1`).
+        radio (int, optional): Distancia máxima a un conflicto de los nodos que se
+            pueden recolorear.
+        max_nodos_region (int, optional): Tamaño máximo de la región.
+        estrategia (str, optional): Clave de `ESTRATEGIAS`. Por defecto "tabu", que no
+            se detiene en óptimos locales.
+        max_iter (int, optional): Límite de iteraciones de cada intento.
+
+    Returns:
+        tuple: `(colores, k, resumen)`, con el `k` final (igual o `k + 1`) y un
+        diccionario con los nodos revisados, los nodos en conflicto tras los
+        cambios, el tamaño de la región, las iteraciones, los nodos que siguen en
+        conflicto (0 si la reparación terminó) y el tiempo en segundos.
+    """
+    inicio = time.perf_counter()
+    revisar = aplicar_cambios(G, colores, agregar_aristas, quitar_aristas, agregar_nodos, quitar_nodos)
+
+    # Los nodos nuevos toman el menor color que no use ningún vecino ya coloreado
+    # (o, si no queda ninguno libre, el menos usado entre ellos).
+    for nodo in revisar:
+        if nodo not in colores:
+            cuenta = [0] * k
+            for v in G[nodo]:
+                if v != nodo and v in colores:
+                    cuenta[colores[v]] += 1
+            colores[nodo] = min(range(k), key=lambda c: (cuenta[c], c))
+
+    en_conflicto = [u for u in revisar if _en_conflicto(G, colores, u)]
+    resumen = dict(revisados=len(revisar), en_conflicto=len(en_conflicto), region=0, iteraciones=0,
+                   pendientes=0, tiempo_s=0.0)
+    if en_conflicto:
+        region = _region(G, en_conflicto, radio, max_nodos_region)
+        resumen["region"] = len(region)
+        nuevos, iteraciones = _reparar_region(G, colores, region, k, estrategia, max_iter,
+                                              time.monotonic() + presupuesto)
+        resumen["iteraciones"] += iteraciones
+        if nuevos is None:
+            # Con un color más: los nodos que siguen en conflicto pasan al color nuevo
+            # (si ningún vecino lo usa ya) y se repara desde ahí.
+            k += 1
+            for u in en_conflicto:
+                if _en_conflicto(G, colores, u) and all(colores[v] != k - 1 for v in G[u]):
+                    colores[u] = k - 1
+            nuevos, iteraciones = _reparar_region(G, colores, region, k, estrategia, max_iter,
+                                                  time.monotonic() + presupuesto)
+            resumen["iteraciones"] += iteraciones
+        if nuevos is not None:
+            colores.update(nuevos)
+        else:
+            # Sin reparación completa se deja la asignación voraz con `k + 1` colores.
+            resumen["pendientes"] = sum(_en_conflicto(G, colores, u) for u in region)
+    resumen["tiempo_s"] = time.perf_counter() - inicio
+    return colores, k, resumen
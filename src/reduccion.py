@@ -0,0 +1,287 @@
+# Importaciones de librerías y módulos
+import random  # Coloración de partida (arranque en frío) y semillas de los componentes.
+from array import array  # Extremos de las aristas de cada subgrafo.
+from concurrent.futures import ProcessPoolExecutor  # Componentes grandes en paralelo.
+from coloring import ESTRATEGIAS, contar_conflictos  # Estrategias de búsqueda.
+from graph_utils import GrafoCSR  # Subgrafos compactos de cada componente.
+from traza import Traza  # Traza global reconstruida a partir de las de los componentes.
+import estadisticas  # Conteo opcional de nodos pelados y componentes.
+from estadisticas import cronometrar  # Tiempo de la etapa de reducción.
+
+# --- Reducción del grafo antes de colorear ---
+# Con `k` colores, un nodo con menos de `k` vecinos siempre se puede colorear
+# al final: por muchos colores que usen sus vecinos, queda uno libre. Al
+# quitarlo baja el grado de sus vecinos, que pueden quedar a su vez por debajo
+# de `k`; repitiendo ("pelando") queda el núcleo del grafo, que es lo único
+# que necesita búsqueda local. El núcleo se parte además en componentes
+# conexas, que son problemas independientes. Al final los nodos pelados se
+# reinsertan en orden inverso, cada uno con un color que no use ningún vecino.
+
+# Componentes con al menos estos nodos se resuelven en un pool de procesos
+# (si hay dos o más); las más pequeñas no compensan el envío al trabajador.
+UMBRAL_COMPONENTE_PARALELO = 2000
+
+
+@cronometrar("reduccion")
+def pelar_grado_bajo(G, k):
+    """
+    Quita repetidamente los nodos con menos de `k` vecinos.
+
+    Los nodos con lazo nunca se quitan: su lazo es un conflicto con cualquier
+    color y deben quedar a la vista de la búsqueda.
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+        k (int): Número de colores.
+
+    Returns:
+        tuple: `(pelados, nucleo)`.
+            - pelados (list): Nodos quitados, en el orden en que se quitaron.
+            - nucleo (set): Nodos que quedan (todos con al menos `k` vecinos en el núcleo).
+    """
+    # Número de vecinos distintos de cada nodo, sin contar su lazo.
+    grado = {}
+    con_lazo = set()
+    for u in G.nodes():
+        vecinos = G[u]
+        if u in vecinos:
+            con_lazo.add(u)
+            grado[u] = len(vecinos) - 1
+        else:
+            grado[u] = len(vecinos)
+
+    pila = [u for u, g in grado.items() if g < k and u not in con_lazo]
+    pelados = []
+    quitados = set()
+    while pila:
+        u = pila.pop()
+        if u in quitados:
+            continue
+        quitados.add(u)
+        pelados.append(u)
+        for v in G[u]:
+            if v == u or v in quitados:
+                continue
+            grado[v] -= 1
+            # Se apila solo al cruzar el umbral, así cada nodo entra una vez.
+            if grado[v] == k - 1 and v not in con_lazo:
+                pila.append(v)
+
+    return pelados, {u for u in G.nodes() if u not in quitados}
+
+
+def componentes_conexas(G, nodos):
+    """
+    Parte un conjunto de nodos en las componentes conexas del subgrafo que inducen.
+
+    Args:
+        G: El grafo (objeto de NetworkX o `GrafoCSR`).
+        nodos (set): Nodos a considerar; las aristas hacia otros nodos se ignoran.
+
+    Returns:
+        list: Una lista de nodos por componente, de la más grande a la más pequeña.
+    """
+    vistos = set()
+    componentes = []
+    for inicio in nodos:
+        if inicio in vistos:
+            continue
+        vistos.add(inicio)
+        componente = [inicio]
+        # Recorrido en anchura: la lista hace de cola.
+        for u in componente:
+            for v in G[u]:
+                if v in nodos and v not in vistos:
+                    vistos.add(v)
+                    componente.append(v)
+        componentes.append(componente)
+    componentes.sort(key=len, reverse=True)
+    return componentes
+
+
+def subgrafo(G, nodos):
+    """
+    Construye el subgrafo inducido por `nodos` como `GrafoCSR` con nodos 0..len-1.
+
+    El nodo local `i` corresponde al nodo `nodos[i]` de `G`.
+    """
+    local = {u: i for i, u in enumerate(nodos)}
+    origen, destino = array('i'), array('i')
+    for i, u in enumerate(nodos):
+        for v in G[u]:
+            j = local.get(v)
+            # Cada arista aparece en las listas de sus dos extremos; se toma una vez.
+            if j is not None and i <= j:
+                origen.append(i)
+                destino.append(j)
+    return GrafoCSR.desde_aristas(len(nodos), origen, destino)
+
+
+def _resolver_componente(H, estrategia, k, max_iter, colores_iniciales, semilla, opciones):
+    # Resuelve un componente (en este proceso o en un trabajador del pool).
+    if semilla is not None:
+        random.seed(semilla)
+    return ESTRATEGIAS[estrategia](H, k, max_iter, colores_iniciales=colores_iniciales, **opciones)
+
+
+def _delta_conflictos(G, estado, nodo, nuevo):
+    # Variación del total de conflictos si `nodo` pasa a `nuevo`, en O(grado).
+    actual = estado[nodo]
+    delta = 0
+    for v in G[nodo]:
+        if v != nodo:
+            delta += (estado[v] == nuevo) - (estado[v] == actual)
+    return delta
+
+
+class ResolutorPorComponentes:
+    """
+    Resuelve cada intento de `k` sobre el núcleo del grafo, componente a componente.
+
+    Para cada `k` se pelan los nodos de grado menor que `k`, el núcleo se parte
+    en componentes conexas y cada una se resuelve por separado con la
+    estrategia elegida; las que ya no tienen conflictos en la coloración de
+    partida ni se buscan. Si hay al menos dos componentes grandes (ver
+    `UMBRAL_COMPONENTE_PARALELO`), se resuelven en un pool de procesos que se
+    crea la primera vez que hace falta y se reutiliza para los demás `k`.
+
+    `resolver` devuelve lo mismo que las estrategias, con una única `Traza`
+    sobre el grafo completo (los movimientos de cada componente, uno tras
+    otro, y al final la reinserción de los pelados), así que el bucle de `k`
+    y la animación no cambian. Se usa como gestor de contexto:
+
+        with ResolutorPorComponentes(G) as resolutor:
+            colores, pasos, iteraciones = resolutor.resolver(k, 1000, "descenso")
+    """
+
+    def __init__(self, G, procesos=None, umbral_paralelo=UMBRAL_COMPONENTE_PARALELO):
+        self.G = G
+        self.procesos = procesos
+        self.umbral_paralelo = umbral_paralelo
+        self._pool = None
+        # Resumen de la última reducción: nodos pelados, componentes y tamaño de la mayor.
+        self.ultima_reduccion = None
+
+    def resolver(self, k, max_iter, estrategia="descenso", colores_iniciales=None, **opciones):
+        """
+        Busca una coloración con `k` colores resolviendo solo el núcleo del grafo.
+
+        Args:
+            k (int): Número de colores.
+            max_iter (int): Límite de iteraciones de cada componente.
+            estrategia (str, optional): Clave de `ESTRATEGIAS`. Por defecto "descenso".
+            colores_iniciales (dict, optional): Coloración de partida con colores en
+                [0, k-1]. Si es None se parte de una aleatoria.
+            **opciones: Argumentos adicionales para la estrategia (por ejemplo, `fecha_limite`).
+
+        Returns:
+            tuple: `(colores, pasos, num_iteraciones)`, con `num_iteraciones` sumado
+            sobre los componentes.
+        """
+        G = self.G
+        if colores_iniciales is None:
+            colores_iniciales = {n: random.randint(0, k - 1) for n in G.nodes()}
+        pelados, nucleo = pelar_grado_bajo(G, k)
+        componentes = componentes_conexas(G, nucleo)
+        self.ultima_reduccion = dict(pelados=len(pelados), componentes=len(componentes),
+                                     mayor=len(componentes[0]) if componentes else 0)
+        est = estadisticas.actual()
+        if est is not None:
+            est.sumar("nodos_pelados", len(pelados))
+            est.sumar("componentes", len(componentes))
+
+        # Sin nada que pelar y con un solo componente, la reducción no aporta:
+        # se resuelve el grafo original tal cual, sin construir el subgrafo.
+        if not pelados and len(componentes) == 1:
+            return _resolver_componente(G, estrategia, k, max_iter, colores_iniciales, None, opciones)
+
+        # Se descartan las componentes sin conflictos en la coloración de partida.
+        pendientes = []
+        for nodos in componentes:
+            if any(colores_iniciales[u] == colores_iniciales[v] for u in nodos for v in G[u] if v in nucleo):
+                pendientes.append(nodos)
+
+        grandes = [nodos for nodos in pendientes if len(nodos) >= self.umbral_paralelo]
+        en_paralelo = len(grandes) >= 2 and self.procesos != 1
+        if en_paralelo and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+
+        # Se lanzan primero las componentes grandes al pool y, mientras tanto, se
+        # resuelven aquí las demás.
+        resultados = {}
+        for i, nodos in enumerate(pendientes):
+            if en_paralelo and len(nodos) >= self.umbral_paralelo:
+                H = subgrafo(G, nodos)
+                iniciales = {j: colores_iniciales[u] for j, u in enumerate(nodos)}
+                resultados[i] = self._pool.submit(_resolver_componente, H, estrategia, k, max_iter,
+                                                  iniciales, random.getrandbits(32), opciones)
+        for i, nodos in enumerate(pendientes):
+            if i not in resultados:
+                H = subgrafo(G, nodos)
+                iniciales = {j: colores_iniciales[u] for j, u in enumerate(nodos)}
+                resultados[i] = _resolver_componente(H, estrategia, k, max_iter, iniciales, None, opciones)
+        for i in resultados:
+            if not isinstance(resultados[i], tuple):
+                resultados[i] = resultados[i].result()
+
+        # Se reconstruye la coloración global aplicando la traza de cada componente
+        # sobre una sola coloración de trabajo, con los conflictos actualizados en
+        # O(grado) por movimiento.
+        estado = dict(colores_iniciales)
+        conflictos = contar_conflictos(G, estado)
+        traza = Traza(estado, conflictos)
+        num_iteraciones = 0
+        for i, nodos in enumerate(pendientes):
+            colores, pasos, iteraciones = resultados[i]
+            num_iteraciones += iteraciones
+            if isinstance(pasos, Traza):
+                inicio = 0
+                for fin in pasos.fines:
+                    cambios = []
+                    for m in range(inicio, fin):
+                        nodo, nuevo = nodos[pasos.nodos[m]], pasos.nuevos[m]
+                        conflictos += _delta_conflictos(G, estado, nodo, nuevo)
+                        cambios.append((nodo, estado[nodo], nuevo))
+                        estado[nodo] = nuevo
+                    inicio = fin
+                    traza.registrar_cambios(cambios, conflictos)
+            # Por si la estrategia no registró algún cambio, se asegura su coloración final.
+            cambios = []
+            for j, u in enumerate(nodos):
+                if estado[u] != colores[j]:
+                    conflictos += _delta_conflictos(G, estado, u, colores[j])
+                    cambios.append((u, estado[u], colores[j]))
+                    estado[u] = colores[j]
+            if cambios:
+                traza.registrar_cambios(cambios, conflictos)
+
+        # Reinserción de los pelados en orden inverso: al quitarlo, cada uno tenía
+        # menos de `k` vecinos entre los nodos que quedaban, que son justo los ya
+        # colocados ahora, así que siempre hay un color libre. Se conserva el
+        # color de partida si ya está libre.
+        colocados = set(nucleo)
+        cambios = []
+        for nodo in reversed(pelados):
+            usados = {estado[v] for v in G[nodo] if v in colocados}
+            nuevo = estado[nodo]
+            if nuevo in usados:
+                nuevo = next(c for c in range(k) if c not in usados)
+            if nuevo != estado[nodo]:
+                conflictos += _delta_conflictos(G, estado, nodo, nuevo)
+                cambios.append((nodo, estado[nodo], nuevo))
+                estado[nodo] = nuevo
+            colocados.add(nodo)
+        if cambios:
+            traza.registrar_cambios(cambios, conflictos)
+        return estado, traza, num_iteraciones
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
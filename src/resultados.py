@@ -0,0 +1,113 @@
+# Importaciones de librerías y módulos
+import csv        # Escritura de los registros en formato CSV.
+import json       # Escritura de los registros en formato JSON Lines.
+import queue      # Cola entre quien produce los registros y el hilo que los escribe.
+import threading  # Hilo de escritura, para que guardar un registro no bloquee la búsqueda.
+
+# --- Resultados estructurados ---
+# Cada caso produce un único registro compacto (un diccionario) con su resultado.
+# Los registros se escriben en `results/` como JSON Lines (una línea JSON por
+# caso) o CSV, a través de un hilo propio y con un búfer grande, así que el
+# solver nunca espera al disco. Lo que se muestra en la terminal se controla
+# aparte con los niveles de verbosidad.
+
+# Niveles de verbosidad de la salida en la terminal.
+SILENCIO = 0  # Solo la tabla resumen final.
+NORMAL = 1    # Además, un resumen por intento de k y por caso.
+DETALLE = 2   # Además, los grados y el color de cada nodo en cada intento.
+NIVELES = {"silencio": SILENCIO, "normal": NORMAL, "detalle": DETALLE}
+
+# Columnas de los registros, en el orden en que se escriben en CSV.
+CAMPOS = ("caso", "estado", "n", "m", "k", "colores_usados", "conflictos", "cota_inferior",
+          "cota_superior", "optimo", "iteraciones", "tiempo_s", "tiempo_total_s", "cache", "colores")
+
+
+class EscritorResultados:
+    """
+    Escribe los registros de los casos en un archivo JSONL o CSV sin bloquear.
+
+    `registrar` solo encola el registro; un hilo aparte lo serializa y lo
+    escribe con un búfer de 64 KB. `cerrar` espera a que se vacíe la cola.
+    Se guarda además una copia reducida de cada registro (sin la coloración)
+    para la tabla resumen.
+
+    Args:
+        ruta (str): Archivo de salida.
+        formato (str, optional): "jsonl" o "csv". Por defecto, según la extensión de `ruta`.
+    """
+
+    def __init__(self, ruta, formato=None):
+        self.ruta = ruta
+        self.formato = formato or ("csv" if ruta.endswith(".csv") else "jsonl")
+        if self.formato not in ("jsonl", "csv"):
+            raise ValueError(f"Formato de resultados desconocido: {self.formato!r}.")
+        self.resumen = []  # Registros sin la coloración, para `tabla_resumen`.
+        self._archivo = open(ruta, "w", encoding="utf-8", newline="", buffering=1 << 16)
+        self._csv = None
+        if self.formato == "csv":
+            self._csv = csv.DictWriter(self._archivo, fieldnames=CAMPOS, extrasaction="ignore")
+            self._csv.writeheader()
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._escribir, daemon=True)
+        self._hilo.start()
+
+    def registrar(self, registro):
+        # Encola el registro de un caso para escribirlo en segundo plano.
+        self.resumen.append({c: v for c, v in registro.items() if c != "colores"})
+        self._cola.put(registro)
+
+    def _escribir(self):
+        # Bucle del hilo de escritura; termina al recibir None.
+        while True:
+            registro = self._cola.get()
+            if registro is None:
+                break
+            if self._csv is not None:
+                fila = dict(registro)
+                if fila.get("colores") is not None:
+                    fila["colores"] = " ".join(map(str, fila["colores"]))
+                self._csv.writerow(fila)
+            else:
+                self._archivo.write(json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def cerrar(self):
+        # Espera a que se escriban los registros pendientes y cierra el archivo.
+        if self._hilo.is_alive():
+            self._cola.put(None)
+            self._hilo.join()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def tabla_resumen(registros):
+    """
+    Arma una tabla de texto con una fila por caso y una línea de totales.
+
+    Args:
+        registros (list): Registros de los casos (como los de `EscritorResultados.resumen`).
+
+    Returns:
+        str: La tabla lista para imprimir.
+    """
+    def celda(valor, formato=""):
+        return "-" if valor is None else format(valor, formato)
+
+    lineas = [f"{'caso':>6}{'n':>8}{'m':>9}{'k':>5}{'cotas':>11}{'iter':>9}{'tiempo (s)':>12}  estado"]
+    for r in registros:
+        cotas = f"[{celda(r.get('cota_inferior'))}, {celda(r.get('cota_superior'))}]"
+        lineas.append(
+            f"{r['caso']:>6}{celda(r.get('n')):>8}{celda(r.get('m')):>9}{celda(r.get('k')):>5}{cotas:>11}"
+            f"{celda(r.get('iteraciones')):>9}{celda(r.get('tiempo_total_s'), '.4f'):>12}  "
+            f"{r['estado']}{' (óptimo)' if r.get('optimo') else ''}{' (caché)' if r.get('cache') == 'omitido' else ''}"
+        )
+    resueltos = sum(r["estado"] == "resuelto" for r in registros)
+    optimos = sum(bool(r.get("optimo")) for r in registros)
+    tiempo = sum(r.get("tiempo_total_s") or 0 for r in registros)
+    lineas.append(f"Total: {len(registros)} casos, {resueltos} resueltos, "
+                  f"{optimos} con k igual a la cota inferior, {tiempo:.4f} s de resolución.")
+    return "\n".join(lineas)
@@ -0,0 +1,315 @@
+# Importaciones de librerías y módulos
+import argparse  # Opciones de la línea de comandos.
+import asyncio   # Servidor asíncrono: muchas conexiones con un solo hilo.
+import json      # Protocolo: una petición o respuesta JSON por línea.
+import os        # Ruta del socket.
+import re        # Nombre de archivo seguro a partir del "id" del cliente.
+import signal    # Cierre ordenado con SIGINT/SIGTERM.
+import time      # Llegada de cada petición, para descontar la espera del presupuesto.
+from concurrent.futures import ProcessPoolExecutor  # Trabajadores que resuelven los grafos.
+from graph_utils import GrafoCSR  # Grafo compacto construido desde la lista de aristas.
+from coloring import ESTRATEGIAS, VECINDARIOS  # Estrategias y vecindarios aceptados.
+from cache_soluciones import CacheSoluciones  # Caché opcional de soluciones por huella del grafo.
+from resultados import SILENCIO  # Los trabajadores no imprimen nada.
+from main import resolver_caso  # Cotas + descenso de k, igual que `main.main`.
+
+# --- Servicio residente de coloración ---
+# Cada ejecución de `main.py` paga el arranque del intérprete y las
+# importaciones. El servicio se queda en marcha y atiende peticiones por un
+# socket Unix (o TCP en localhost): cada línea es un JSON con un grafo y cada
+# respuesta, otra línea JSON con su coloración. Los grafos se resuelven en un
+# pool de procesos que se crea una sola vez con `resolver_caso`, el mismo
+# descenso de `k` que `main.main`. La visualización (matplotlib) solo se
+# importa en el trabajador que reciba una petición con "animar".
+#
+# Petición:  {"id": 1, "n": 4, "aristas": [[0, 1], [1, 2]], "presupuesto": 0.5,
+#             "estrategia": "descenso", "vecindario": "completo", "semilla": 7, "animar": false}
+# Respuesta: {"id": 1, "k": 2, "colores": [...], "conflictos": 0, "cota_inferior": 2,
+#             "cota_superior": 2, "optimo": true, "iteraciones": 0, "tiempo_s": ..., "lote": 3}
+# Con {"tipo": "estado"} se obtienen los contadores del servicio.
+#
+# Micro-lotes: enviar un grafo pequeño a un trabajador cuesta más que
+# resolverlo, así que los grafos con pocas aristas se juntan durante unos
+# milisegundos (o hasta llenar el lote) y viajan juntos en una sola tarea.
+
+# Valores por defecto de la línea de comandos.
+VENTANA_LOTE_MS = 5      # Espera máxima para completar un micro-lote.
+MAX_LOTE = 32            # Peticiones como máximo por micro-lote.
+UMBRAL_LOTE = 2000       # Aristas a partir de las cuales un grafo viaja solo.
+PRESUPUESTO = 1.0        # Segundos por petición si no indica otro.
+LIMITE_LINEA = 1 << 26   # Bytes como máximo por línea (64 MB de lista de aristas).
+MAX_NODOS = 1_000_000    # Nodos como máximo por grafo (se comprueba antes de reservar memoria).
+
+# Caché de soluciones y límite de nodos del trabajador (se fijan en el inicializador del pool).
+_CACHE_TRABAJADOR = None
+_MAX_NODOS_TRABAJADOR = MAX_NODOS
+
+
+def _inicializar_trabajador(usar_cache, max_nodos=MAX_NODOS):
+    global _CACHE_TRABAJADOR, _MAX_NODOS_TRABAJADOR
+    _CACHE_TRABAJADOR = CacheSoluciones() if usar_cache else None
+    _MAX_NODOS_TRABAJADOR = max_nodos
+
+
+def _es_entero(valor):
+    # `bool` es subclase de `int`, pero `true` no es un número válido aquí.
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def _validar_grafo(n, aristas):
+    # Comprueba el tamaño y los extremos antes de reservar nada: un `n` enorme o
+    # un extremo fuera de rango provocarían MemoryError u OverflowError en numpy.
+    if not _es_entero(n) or not 0 < n <= _MAX_NODOS_TRABAJADOR:
+        raise ValueError(f"n debe ser un entero entre 1 y {_MAX_NODOS_TRABAJADOR}, no {n!r}.")
+    if not isinstance(aristas, list):
+        raise ValueError("aristas debe ser una lista de pares [u, v].")
+    for arista in aristas:
+        if not isinstance(arista, list) or len(arista) != 2:
+            raise ValueError(f"Arista inválida: {arista!r}.")
+        u, v = arista
+        if not (_es_entero(u) and _es_entero(v) and 0 <= u < n and 0 <= v < n):
+            raise ValueError(f"Arista fuera de rango para n={n}: {arista!r}.")
+
+
+def _nombre_seguro(identificador):
+    # Nombre de archivo derivado del "id" del cliente: solo alfanuméricos, "-" y "_",
+    # para que un id como "../../x" no escriba fuera de la carpeta de resultados.
+    return re.sub(r"[^A-Za-z0-9_-]", "_", str(identificador))[:64]
+
+
+def _resolver_peticion(peticion):
+    # Resuelve una petición en el trabajador y arma su respuesta. Cualquier fallo
+    # se convierte en el "error" de esta petición, sin afectar a las demás del lote.
+    respuesta = {"id": peticion.get("id")}
+    try:
+        n = peticion["n"]
+        aristas = peticion.get("aristas", [])
+        _validar_grafo(n, aristas)
+        estrategia = peticion.get("estrategia", "descenso")
+        vecindario = peticion.get("vecindario", "completo")
+        presupuesto = peticion["presupuesto"]
+        semilla = peticion.get("semilla")
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estrategia desconocida: {estrategia!r}.")
+        if vecindario not in VECINDARIOS:
+            raise ValueError(f"Vecindario desconocido: {vecindario!r}.")
+        if isinstance(presupuesto, bool) or not isinstance(presupuesto, (int, float)) or presupuesto < 0:
+            raise ValueError(f"Presupuesto inválido: {presupuesto!r}.")
+        if semilla is not None and not _es_entero(semilla):
+            raise ValueError(f"Semilla inválida: {semilla!r}.")
+        G = GrafoCSR.desde_aristas(n, [u for u, _ in aristas], [v for _, v in aristas])
+    except (KeyError, TypeError, ValueError) as error:
+        respuesta["error"] = f"Petición inválida: {error}"
+        return respuesta
+
+    try:
+        # El presupuesto cuenta desde la llegada al servicio, así que se descuenta
+        # la espera en la cola (el reloj monótono es el mismo en todos los procesos).
+        restante = max(0.0, presupuesto - (time.monotonic() - peticion["llegada"]))
+        inicio = time.perf_counter()
+        # El número de caso es siempre 0: la semilla de la petición basta para reproducirla.
+        pasos_totales, registro = resolver_caso(
+            0, G, estrategia=estrategia, semilla=semilla, presupuesto_caso=restante, procesos=1,
+            verbosidad=SILENCIO, cache=_CACHE_TRABAJADOR, vecindario=vecindario,
+        )
+        for campo in ("k", "colores", "conflictos", "cota_inferior", "cota_superior", "optimo", "iteraciones"):
+            respuesta[campo] = registro[campo]
+        respuesta["tiempo_s"] = round(time.perf_counter() - inicio, 6)
+        if peticion.get("animar") and pasos_totales:
+            from visualization import crear_animacion  # Importación diferida: matplotlib es pesado.
+            respuesta["animacion"] = crear_animacion(G, pasos_totales, f"servicio_{_nombre_seguro(peticion.get('id', 0))}",
+                                                     max_frames=peticion.get("max_frames", 20))
+    except Exception as error:
+        return {"id": peticion.get("id"), "error": f"Error al resolver: {error!r}"}
+    return respuesta
+
+
+def _resolver_lote(peticiones):
+    # Tarea del pool: resuelve un micro-lote en orden. Cada petición se aísla:
+    # si una falla de forma inesperada, solo ella recibe el error.
+    respuestas = []
+    for peticion in peticiones:
+        try:
+            respuestas.append(_resolver_peticion(peticion))
+        except Exception as error:
+            respuestas.append({"id": peticion.get("id"), "error": f"Error al resolver: {error!r}"})
+    return respuestas
+
+
+class ServicioColoracion:
+    """
+    Servidor de coloración con pool de procesos y micro-lotes.
+
+    Args:
+        trabajadores (int, optional): Procesos del pool (por defecto, uno por núcleo).
+        ventana_ms (float, optional): Espera máxima para completar un micro-lote.
+        max_lote (int, optional): Peticiones como máximo por micro-lote.
+        umbral_lote (int, optional): Los grafos con menos aristas se agrupan en micro-lotes.
+        presupuesto (float, optional): Segundos por petición si no indica "presupuesto".
+        usar_cache (bool, optional): Si es True, los trabajadores usan `CacheSoluciones`.
+        max_nodos (int, optional): Nodos como máximo por grafo; los mayores se rechazan.
+    """
+
+    def __init__(self, trabajadores=None, ventana_ms=VENTANA_LOTE_MS, max_lote=MAX_LOTE,
+                 umbral_lote=UMBRAL_LOTE, presupuesto=PRESUPUESTO, usar_cache=False,
+                 max_nodos=MAX_NODOS):
+        self.ventana = ventana_ms / 1000
+        self.max_lote = max_lote
+        self.umbral_lote = umbral_lote
+        self.presupuesto = presupuesto
+        self._pool = ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializar_trabajador,
+                                         initargs=(usar_cache, max_nodos))
+        self._pendientes = []      # Pares (petición, futuro) del micro-lote en formación.
+        self._temporizador = None  # Despacho programado del micro-lote actual.
+        self.contadores = dict(atendidas=0, errores=0, lotes=0, en_curso=0)
+
+    async def resolver(self, peticion):
+        # Encola la petición y espera su respuesta.
+        peticion.setdefault("presupuesto", self.presupuesto)
+        peticion["llegada"] = time.monotonic()
+        loop = asyncio.get_running_loop()
+        aristas = peticion.get("aristas")
+        if isinstance(aristas, list) and len(aristas) >= self.umbral_lote:
+            # Los grafos grandes viajan solos: su costo ya amortiza el envío.
+            self.contadores["lotes"] += 1
+            (respuesta,) = await loop.run_in_executor(self._pool, _resolver_lote, [peticion])
+            respuesta["lote"] = 1
+            return respuesta
+        futuro = loop.create_future()
+        self._pendientes.append((peticion, futuro))
+        if len(self._pendientes) >= self.max_lote:
+            self._despachar()
+        elif self._temporizador is None:
+            self._temporizador = loop.call_later(self.ventana, self._despachar)
+        return await futuro
+
+    def _despachar(self):
+        # Envía el micro-lote pendiente al pool y reparte las respuestas al terminar.
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._pendientes = self._pendientes, []
+        if not lote:
+            return
+        self.contadores["lotes"] += 1
+        tarea = asyncio.get_running_loop().run_in_executor(self._pool, _resolver_lote, [p for p, _ in lote])
+
+        def repartir(tarea):
+            for i, (_, futuro) in enumerate(lote):
+                if futuro.cancelled():
+                    continue
+                if tarea.exception() is not None:
+                    futuro.set_exception(tarea.exception())
+                else:
+                    respuesta = tarea.result()[i]
+                    respuesta["lote"] = len(lote)
+                    futuro.set_result(respuesta)
+
+        tarea.add_done_callback(repartir)
+
+    async def _responder(self, linea, escritor):
+        # Atiende una línea de la conexión y escribe su respuesta.
+        self.contadores["en_curso"] += 1
+        try:
+            try:
+                peticion = json.loads(linea)
+                if not isinstance(peticion, dict):
+                    raise ValueError("se esperaba un objeto JSON")
+            except ValueError as error:
+                respuesta = {"error": f"JSON inválido: {error}"}
+            else:
+                if peticion.get("tipo") == "estado":
+                    respuesta = dict(self.contadores, id=peticion.get("id"), pendientes=len(self._pendientes))
+                else:
+                    respuesta = await self.resolver(peticion)
+        except Exception as error:  # Un fallo del trabajador no debe tumbar el servicio.
+            respuesta = {"error": f"Error interno: {error!r}"}
+        finally:
+            self.contadores["en_curso"] -= 1
+        self.contadores["errores" if "error" in respuesta else "atendidas"] += 1
+        escritor.write(json.dumps(respuesta, separators=(",", ":")).encode() + b"\n")
+        await escritor.drain()
+
+    async def atender(self, lector, escritor):
+        # Una conexión: cada línea es una petición; las respuestas llegan en el
+        # orden en que terminan (el campo "id" permite emparejarlas).
+        tareas = set()
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                if linea.strip():
+                    tarea = asyncio.create_task(self._responder(linea, escritor))
+                    tareas.add(tarea)
+                    tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # Conexión cortada o línea demasiado larga: se cierra.
+        finally:
+            escritor.close()
+
+    def cerrar(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+async def servir(servicio, socket_unix=None, puerto=None):
+    """
+    Atiende conexiones hasta recibir SIGINT o SIGTERM.
+
+    Args:
+        servicio (ServicioColoracion): El servicio.
+        socket_unix (str, optional): Ruta del socket Unix.
+        puerto (int, optional): Puerto TCP en 127.0.0.1 (si no se da `socket_unix`).
+    """
+    if socket_unix is not None:
+        if os.path.exists(socket_unix):
+            os.remove(socket_unix)
+        servidor = await asyncio.start_unix_server(servicio.atender, path=socket_unix, limit=LIMITE_LINEA)
+        direccion = socket_unix
+    else:
+        servidor = await asyncio.start_server(servicio.atender, host="127.0.0.1", port=puerto, limit=LIMITE_LINEA)
+        direccion = f"127.0.0.1:{puerto}"
+
+    detener = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(senal, detener.set)
+    print(f"🟢 Servicio de coloración escuchando en {direccion}", flush=True)
+    async with servidor:
+        await detener.wait()
+    if socket_unix is not None and os.path.exists(socket_unix):
+        os.remove(socket_unix)
+    print(f"🛑 Servicio detenido: {servicio.contadores['atendidas']} peticiones atendidas, "
+          f"{servicio.contadores['errores']} con error, {servicio.contadores['lotes']} lotes.", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio residente de coloración de grafos.")
+    parser.add_argument("--socket", default=None,
+                        help="Ruta del socket Unix (por defecto se usa TCP en 127.0.0.1).")
+    parser.add_argument("--puerto", type=int, default=8765,
+                        help="Puerto TCP en 127.0.0.1 si no se usa --socket (por defecto 8765).")
+    parser.add_argument("--trabajadores", type=int, default=None,
+                        help="Procesos del pool (por defecto, uno por núcleo).")
+    parser.add_argument("--ventana-ms", type=float, default=VENTANA_LOTE_MS,
+                        help="Milisegundos como máximo para completar un micro-lote.")
+    parser.add_argument("--max-lote", type=int, default=MAX_LOTE,
+                        help="Peticiones como máximo por micro-lote.")
+    parser.add_argument("--umbral-lote", type=int, default=UMBRAL_LOTE,
+                        help="Los grafos con menos aristas se agrupan en micro-lotes.")
+    parser.add_argument("--presupuesto", type=float, default=PRESUPUESTO,
+                        help="Segundos por petición si no indica otro (incluye la espera en cola).")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reutiliza y guarda soluciones en results/cache_soluciones/.")
+    parser.add_argument("--max-nodos", type=int, default=MAX_NODOS,
+                        help=f"Nodos como máximo por grafo (por defecto {MAX_NODOS}).")
+    args = parser.parse_args()
+
+    servicio = ServicioColoracion(args.trabajadores, args.ventana_ms, args.max_lote, args.umbral_lote,
+                                  args.presupuesto, args.cache, args.max_nodos)
+    try:
+        asyncio.run(servir(servicio, args.socket, args.puerto))
+    finally:
+        servicio.cerrar()
@@ -1,60 +1,138 @@
 import os  # Módulo estándar para interactuar con el sistema operativo (manejo de archivos y rutas).
-from PIL import Image, ImageSequence  # `Pillow`, una biblioteca de procesamiento de imágenes. Se usa para abrir, manipular y guardar GIFs.
+import mmap  # Proyección de los GIFs en memoria para leerlos sin copiarlos ni decodificarlos.
+import struct  # Empaquetado del campo de retardo (entero de 16 bits little-endian).
+from concurrent.futures import ProcessPoolExecutor  # Pool de procesos para procesar varios GIFs a la vez.
+
+def _bloques_gif(datos):
+    """
+    Recorre la estructura de un GIF sin decodificar sus imágenes.
+
+    Genera pares `(tipo, posicion)`: ("gce", posición del campo de retardo de
+    una Graphic Control Extension) e ("imagen", posición del descriptor de
+    imagen). Los datos comprimidos de cada imagen se saltan leyendo solo los
+    tamaños de sus sub-bloques.
+
+    Args:
+        datos (bytes | mmap.mmap): El contenido del GIF.
+    """
+    if datos[:3] != b"GIF":
+        raise ValueError("no es un archivo GIF")
+    pos = 13  # Cabecera (6 bytes) + descriptor lógico de pantalla (7 bytes).
+    if datos[10] & 0x80:
+        pos += 3 << ((datos[10] & 0x07) + 1)  # Tabla global de colores.
+
+    def saltar_subbloques(pos):
+        while datos[pos]:
+            pos += datos[pos] + 1
+        return pos + 1
+
+    while True:
+        introductor = datos[pos]
+        if introductor == 0x3B:  # Fin del archivo.
+            return
+        if introductor == 0x21:  # Extensión.
+            if datos[pos + 1] == 0xF9 and datos[pos + 2] == 4:
+                yield "gce", pos + 4
+            pos = saltar_subbloques(pos + 2)
+        elif introductor == 0x2C:  # Descriptor de imagen.
+            yield "imagen", pos
+            banderas = datos[pos + 9]
+            pos += 10
+            if banderas & 0x80:
+                pos += 3 << ((banderas & 0x07) + 1)  # Tabla local de colores.
+            pos = saltar_subbloques(pos + 1)  # Tamaño mínimo de código LZW y datos.
+        else:
+            raise ValueError(f"bloque desconocido 0x{introductor:02x} en la posición {pos}")
+
 
 def ralentizar_gif_duracion_fija(archivo_entrada, archivo_salida, duracion_fija_ms):
     """
     Ralentiza un archivo GIF estableciendo una duración fija para todos sus frames.
 
+    El GIF no se decodifica: el archivo se proyecta en memoria con `mmap` y se
+    copia tal cual, reescribiendo solo el campo de retardo (2 bytes) de cada
+    Graphic Control Extension. Los datos de imagen, las paletas y el modo de
+    borrado de cada frame quedan idénticos byte a byte. A los frames sin esa
+    extensión se les agrega una con el retardo pedido.
+
     Args:
         archivo_entrada (str): La ruta completa del archivo GIF original.
         archivo_salida (str): La ruta completa para guardar el nuevo archivo GIF ralentizado.
         duracion_fija_ms (int): La nueva duración de cada frame en milisegundos (1000 ms = 1s).
+
+    Returns:
+        str: Mensaje con el resultado, para mostrarlo en pantalla.
     """
+    # El formato GIF guarda los retardos en centésimas de segundo.
+    retardo = struct.pack("<H", min(int(duracion_fija_ms / 10), 0xFFFF))
     try:
-        # Abre el archivo GIF de entrada para su procesamiento.
-        imagen = Image.open(archivo_entrada)
-        frames = []  # Lista para almacenar los frames modificados.
-
-        # Itera sobre cada frame del GIF usando ImageSequence.Iterator.
-        for frame in ImageSequence.Iterator(imagen):
-            # Crea una copia del frame para evitar modificar el original.
-            frame = frame.copy()
-            # Establece la nueva duración para el frame actual.
-            frame.info['duration'] = duracion_fija_ms
-            # Agrega el frame modificado a la lista.
-            frames.append(frame)
-
-        # Guarda todos los frames en un nuevo archivo GIF.
-        # `save_all=True` indica que se deben guardar todos los frames.
-        # `append_images=frames[1:]` adjunta todos los frames excepto el primero.
-        # `loop=...` mantiene el número de ciclos del GIF original.
-        # `duration=...` establece la duración para todos los frames al guardar.
-        # `disposal=2` es un parámetro común en GIFs para indicar que el fondo del frame
-        # anterior debe ser restaurado antes de dibujar el siguiente.
-        frames[0].save(
-            archivo_salida,
-            save_all=True,
-            append_images=frames[1:],
-            loop=imagen.info.get('loop', 0),
-            duration=duracion_fija_ms,
-            disposal=2
-        )
-        print(f"✔️ {os.path.basename(archivo_entrada)} → procesado como → {os.path.basename(archivo_salida)}")
+        with open(archivo_entrada, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            # Se localizan los campos de retardo y los frames que no tienen extensión de control.
+            cambios = []  # Pares (posición, bytes a escribir en lugar de / antes de esa posición).
+            con_control = False
+            for tipo, pos in _bloques_gif(datos):
+                if tipo == "gce":
+                    cambios.append((pos, retardo, 2))
+                    con_control = True
+                else:
+                    if not con_control:
+                        # Extensión de control nueva: sin transparencia ni modo de borrado.
+                        cambios.append((pos, b"\x21\xf9\x04\x00" + retardo + b"\x00\x00", 0))
+                    con_control = False
+
+            # Se escribe a un archivo temporal y se renombra, para no dejar salidas a
+            # medias. El nombre lleva el pid porque `procesar_carpeta` usa varios procesos.
+            temporal = f"{archivo_salida}.{os.getpid()}.tmp"
+            try:
+                with open(temporal, "wb") as salida:
+                    anterior = 0
+                    for pos, reemplazo, longitud in cambios:
+                        salida.write(datos[anterior:pos])
+                        salida.write(reemplazo)
+                        anterior = pos + longitud
+                    salida.write(datos[anterior:])
+                    if any(longitud == 0 for _, _, longitud in cambios) and datos[3:6] == b"87a":
+                        # Las extensiones de control requieren la versión 89a del formato.
+                        salida.seek(3)
+                        salida.write(b"89a")
+                os.replace(temporal, archivo_salida)
+            finally:
+                # Si algo falló antes de renombrarlo, el temporal no se deja atrás.
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+        return f"✔️ {os.path.basename(archivo_entrada)} → procesado como → {os.path.basename(archivo_salida)}"
 
     except Exception as e:
         # Captura cualquier error que pueda ocurrir durante el proceso, como
         # si el archivo no es un GIF válido, y lo reporta.
-        print(f"❌ Error con {archivo_entrada}: {e}")
+        return f"❌ Error con {archivo_entrada}: {e}"
 
-def procesar_carpeta(carpeta_entrada, carpeta_salida, duracion_fija_ms):
+
+def _esta_actualizado(archivo_entrada, archivo_salida, duracion_fija_ms):
+    # La salida está al día si es más reciente que la entrada y ya tiene el retardo pedido.
+    try:
+        if os.path.getmtime(archivo_salida) < os.path.getmtime(archivo_entrada):
+            return False
+        retardo = struct.pack("<H", min(int(duracion_fija_ms / 10), 0xFFFF))
+        with open(archivo_salida, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return all(datos[pos:pos + 2] == retardo for tipo, pos in _bloques_gif(datos) if tipo == "gce")
+    except (OSError, ValueError, IndexError):
+        return False
+
+
+def procesar_carpeta(carpeta_entrada, carpeta_salida, duracion_fija_ms, procesos=None):
     """
     Procesa todos los archivos GIF en una carpeta de entrada y los guarda
     en una carpeta de salida con una duración de frame modificada.
 
+    Los archivos se procesan en paralelo y se omiten los que ya tienen una
+    salida al día (más reciente que el original y con la duración pedida).
+
     Args:
         carpeta_entrada (str): La ruta a la carpeta con los GIFs originales.
         carpeta_salida (str): La ruta donde se guardarán los GIFs ralentizados.
         duracion_fija_ms (int): La duración deseada por frame en milisegundos.
+        procesos (int, optional): Procesos a usar. Por defecto, uno por núcleo.
     """
     # Si la carpeta de salida no existe, la crea.
     if not os.path.exists(carpeta_salida):
@@ -69,7 +147,8 @@ def procesar_carpeta(carpeta_entrada, carpeta_salida, duracion_fija_ms):
         print(f"⚠️ No se encontraron archivos .gif en la carpeta '{carpeta_entrada}'.")
         return
 
-    # Itera sobre cada archivo GIF encontrado.
+    # Arma los pares (entrada, salida) y descarta los que ya están al día.
+    pendientes = []
     for archivo in archivos:
         # Construye la ruta completa del archivo de entrada de forma segura.
         ruta_entrada = os.path.join(carpeta_entrada, archivo)
@@ -81,8 +160,17 @@ def procesar_carpeta(carpeta_entrada, carpeta_salida, duracion_fija_ms):
         # Construye la ruta de salida completa.
         ruta_salida = os.path.join(carpeta_salida, nuevo_nombre)
 
-        # Llama a la función principal para ralentizar y guardar el GIF.
-        ralentizar_gif_duracion_fija(ruta_entrada, ruta_salida, duracion_fija_ms)
+        if _esta_actualizado(ruta_entrada, ruta_salida, duracion_fija_ms):
+            print(f"⏭️ {archivo} ya está al día.")
+            continue
+        pendientes.append((ruta_entrada, ruta_salida))
+
+    # Ralentiza los GIFs pendientes en paralelo; los mensajes se muestran en orden.
+    if pendientes:
+        with ProcessPoolExecutor(procesos) as pool:
+            for mensaje in pool.map(ralentizar_gif_duracion_fija, *zip(*pendientes),
+                                    [duracion_fija_ms] * len(pendientes)):
+                print(mensaje)
 
     print("\n✅ Todos los GIFs han sido procesados con duración fija y renombrados con '_lento'.")
 
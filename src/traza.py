@@ -0,0 +1,116 @@
+# Importaciones de librerías y módulos
+from array import array  # Arreglos compactos de enteros para el registro de movimientos.
+import estadisticas  # Conteo opcional de las copias de coloraciones.
+
+# --- Trazas compactas de la búsqueda ---
+# En lugar de guardar una copia completa de la coloración en cada mejora
+# (memoria O(pasos × n)), una traza guarda la coloración inicial y un registro
+# de movimientos (nodo, color anterior, color nuevo). Los estados completos se
+# reconstruyen bajo demanda al recorrerla, uno a la vez.
+
+class Traza:
+    """
+    Traza de una ejecución de búsqueda: coloración inicial más movimientos.
+
+    Cada estado registrado después del inicial agrupa uno o más movimientos
+    (la búsqueda local registra uno por mejora; la tabú, todos los cambios
+    desde la mejor coloración anterior) y el número de conflictos resultante.
+
+    Al recorrerla se obtienen tuplas `(colores, conflictos)`, igual que la
+    antigua lista de "snapshots", así que el código que la consume no cambia.
+    Cada `colores` entregado es una copia independiente.
+    """
+
+    def __init__(self, colores_iniciales, conflictos_iniciales):
+        self.inicial = dict(colores_iniciales)
+        self.nodos = array('q')       # Nodo de cada movimiento.
+        self.anteriores = array('i')  # Color que tenía el nodo antes del movimiento.
+        self.nuevos = array('i')      # Color asignado por el movimiento.
+        self.fines = array('q')       # Por estado: índice final (exclusivo) de sus movimientos.
+        self.conflictos = array('q', [conflictos_iniciales])  # Conflictos de cada estado.
+
+    def registrar(self, nodo, anterior, nuevo, conflictos):
+        # Registra un estado que difiere del anterior en un solo movimiento.
+        self.nodos.append(nodo)
+        self.anteriores.append(anterior)
+        self.nuevos.append(nuevo)
+        self.fines.append(len(self.nodos))
+        self.conflictos.append(conflictos)
+
+    def registrar_cambios(self, cambios, conflictos):
+        # Registra un estado formado por varios movimientos `(nodo, anterior, nuevo)`.
+        for nodo, anterior, nuevo in cambios:
+            self.nodos.append(nodo)
+            self.anteriores.append(anterior)
+            self.nuevos.append(nuevo)
+        self.fines.append(len(self.nodos))
+        self.conflictos.append(conflictos)
+
+    def __len__(self):
+        # Número de estados, incluido el inicial.
+        return len(self.conflictos)
+
+    def __iter__(self):
+        # Reconstruye los estados en orden aplicando los movimientos sobre una
+        # sola coloración de trabajo.
+        estado = dict(self.inicial)
+        copias = 1
+        try:
+            yield estado.copy(), self.conflictos[0]
+            inicio = 0
+            for j, fin in enumerate(self.fines, 1):
+                for i in range(inicio, fin):
+                    estado[self.nodos[i]] = self.nuevos[i]
+                inicio = fin
+                copias += 1
+                yield estado.copy(), self.conflictos[j]
+        finally:
+            # Copias entregadas más la coloración de trabajo.
+            est = estadisticas.actual()
+            if est is not None:
+                est.sumar("copias_coloracion", copias + 1)
+
+    def final(self):
+        # Coloración del último estado registrado.
+        estado = dict(self.inicial)
+        for nodo, nuevo in zip(self.nodos, self.nuevos):
+            estado[nodo] = nuevo
+        return estado
+
+    def memoria_bytes(self):
+        # Tamaño aproximado del registro de movimientos (sin la coloración inicial).
+        return sum(a.itemsize * len(a) for a in (self.nodos, self.anteriores, self.nuevos, self.fines, self.conflictos))
+
+
+class TrazaTotal:
+    """
+    Secuencia de estados de un caso completo para `crear_animacion`.
+
+    Junta las trazas de cada intento de `k` y estados sueltos (como la
+    coloración DSATUR o la solución final) sin copiar coloraciones: al
+    recorrerla entrega tuplas `(colores, conf, k, descripcion)` generadas
+    bajo demanda, que es el formato que espera `crear_animacion`.
+    """
+
+    def __init__(self):
+        self._segmentos = []  # Pares (traza o tupla de estado suelto, k).
+
+    def agregar_traza(self, traza, k):
+        # Agrega todos los estados de la traza de un intento con `k` colores.
+        self._segmentos.append((traza, k))
+
+    def agregar_estado(self, colores, conflictos, k, descripcion):
+        # Agrega un único estado con su descripción.
+        self._segmentos.append(((colores, conflictos, descripcion), k))
+
+    def __len__(self):
+        return sum(len(s) if isinstance(s, Traza) else 1 for s, _ in self._segmentos)
+
+    def __iter__(self):
+        for segmento, k in self._segmentos:
+            if isinstance(segmento, Traza):
+                for i, (colores, conf) in enumerate(segmento):
+                    yield colores, conf, k, f"Iteración {i} con k={k} - Conflictos: {conf}"
+            else:
+                colores, conf, descripcion = segmento
+                yield colores, conf, k, descripcion
@@ -2,7 +2,30 @@
 import matplotlib.pyplot as plt # Librería para crear gráficos y visualizaciones.
 import networkx as nx           # Librería para trabajar con grafos.
 import os                       # Módulo para interactuar con el sistema operativo (rutas y directorios).
-import imageio                  # Librería para crear archivos GIF a partir de imágenes.
+import numpy as np              # Arreglos para los colores de los nodos y los frames en memoria.
+from matplotlib.figure import Figure  # Figura independiente de pyplot, reutilizada entre frames.
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # Lienzo en memoria para rasterizar.
+from matplotlib.collections import LineCollection  # Capa de aristas en conflicto.
+from collections import deque   # Cola de bloques de frames pendientes en el renderizado paralelo.
+from itertools import islice    # Corta la secuencia de estados en bloques.
+from concurrent.futures import ProcessPoolExecutor  # Pool de procesos para dibujar frames.
+from escritores_animacion import abrir_escritor  # Escritores incrementales de GIF, APNG y MP4.
+import time                     # Marcas de tiempo para la política LRU de la caché de posiciones.
+from graph_utils import GrafoCSR, huella_grafo, results_dir, escritura_atomica, podar_cache  # Grafo compacto, huella canónica, carpeta de resultados y cachés en disco.
+import estadisticas             # Instrumentación opcional (frames dibujados y tiempos por fase).
+from estadisticas import cronometrar
+
+# --- Caché de posiciones ---
+# Calcular el layout es la parte más cara de animar un grafo grande, así que las
+# posiciones se guardan en disco con la huella del grafo como clave. La caché
+# tiene un tamaño máximo y, al superarlo, se borran primero las entradas usadas
+# hace más tiempo (LRU, según la fecha de modificación, que se renueva al leer).
+carpeta_cache_layout = os.path.join(results_dir, "cache_layout")
+TAM_MAX_CACHE_LAYOUT = 256 * 1024 * 1024  # Bytes.
+# A partir de este número de nodos se usa `layout_rapido` en lugar de
+# `spring_layout`, cuyo costo por iteración crece como O(n²) (y que, desde 500
+# nodos, además necesita SciPy).
+UMBRAL_LAYOUT_RAPIDO = 500
 
 def detectar_conflictos(G, colores):
     """
@@ -10,7 +33,7 @@ def detectar_conflictos(G, colores):
     Un conflicto ocurre cuando dos nodos conectados por una arista tienen el mismo color.
 
     Args:
-        G (nx.Graph): El grafo a analizar.
+        G (nx.Graph | GrafoCSR): El grafo a analizar.
         colores (dict): Un diccionario que mapea cada nodo a su color asignado.
 
     Returns:
@@ -19,122 +42,359 @@ def detectar_conflictos(G, colores):
     # Retorna una lista de aristas (u, v) donde los colores de los nodos son idénticos.
     return [(u, v) for u, v in G.edges() if colores[u] == colores[v]]
 
-def dibujar_grafo(G, colores, conflictos, pos, paso, descripcion, k_actual, carpeta_salida):
+class RenderizadorGrafo:
+    """
+    Dibuja frames de un mismo grafo reutilizando una única figura.
+
+    La figura, los nodos, las etiquetas, las aristas, el título y el cuadro de
+    texto se crean una sola vez al construir el objeto. Para cada frame solo se
+    actualizan los colores de los nodos, la capa de aristas en conflicto y los
+    textos, y la imagen se copia directamente del lienzo a un arreglo de NumPy,
+    sin archivos temporales.
+    """
+
+    def __init__(self, G, pos):
+        """
+        Args:
+            G (nx.Graph): El grafo a dibujar.
+            pos (dict): La posición precalculada de cada nodo.
+        """
+        self.pos = pos
+        self.nodos = list(G.nodes())
+        self.fig = Figure()
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+
+        # Elementos fijos: nodos (con colores provisionales), etiquetas y aristas en gris.
+        self.coleccion_nodos = nx.draw_networkx_nodes(
+            G, pos, node_color=[0] * len(self.nodos), cmap=plt.cm.Set3, node_size=500, ax=self.ax
+        )
+        nx.draw_networkx_labels(G, pos, font_color='black', ax=self.ax)
+        nx.draw_networkx_edges(G, pos, edgelist=G.edges(), edge_color="lightgray", width=2, ax=self.ax)
+
+        # Capa de aristas en conflicto, vacía hasta el primer frame (rojo y más gruesa).
+        self.capa_conflictos = LineCollection([], colors="red", linewidths=3, zorder=1)
+        self.ax.add_collection(self.capa_conflictos)
+
+        # Título y cuadro de texto en la esquina superior izquierda; solo cambia su contenido.
+        self.titulo = self.ax.set_title("", fontsize=12)
+        self.texto = self.ax.text(
+            0.02, 0.98, "",
+            transform=self.ax.transAxes,
+            fontsize=10,
+            verticalalignment='top',
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.7)
+        )
+        self.ax.set_axis_off()
+
+    def frame(self, colores, conflictos, paso, descripcion, k_actual):
+        """
+        Dibuja un estado y devuelve la imagen como arreglo RGBA (alto × ancho × 4).
+
+        Args:
+            colores (dict): El diccionario de colores actual de los nodos.
+            conflictos (list): Una lista de aristas en conflicto.
+            paso (int): El número de paso en la animación.
+            descripcion (str): Un texto descriptivo para el título.
+            k_actual (str): El valor actual de k (número máximo de colores permitidos).
+                            Es un string para poder usar "-" en el paso inicial.
+
+        Returns:
+            np.ndarray: La imagen del frame.
+        """
+        # Colores de los nodos; la escala se reajusta a los valores del frame,
+        # igual que al dibujar los nodos desde cero.
+        self.coleccion_nodos.set_array(np.array([colores[n] for n in self.nodos]))
+        self.coleccion_nodos.autoscale()
+
+        self.capa_conflictos.set_segments([(self.pos[u], self.pos[v]) for u, v in conflictos])
+        self.titulo.set_text(f"Paso {paso}: {descripcion}")
+        self.texto.set_text(f"k actual: {k_actual}\nConflictos: {len(conflictos)}")
+
+        # Se rasteriza la figura y se copia el búfer del lienzo.
+        self.canvas.draw()
+        return np.array(self.canvas.buffer_rgba())
+
+
+# --- Selección de frames ---
+
+def seleccionar_frames(pasos, max_frames=None):
+    """
+    Decide qué estados de `pasos` se convierten en frames y cuánto dura cada uno.
+
+    Recorre los pasos una vez comparando cada estado con el anterior: los estados
+    consecutivos con la misma coloración y el mismo `k` son visualmente iguales,
+    así que se agrupan en un solo frame que dura tantas veces como estados tenga
+    el grupo. Ese frame es el del último estado del grupo, para que muestre su
+    descripción (por ejemplo, "Solución final sin conflictos" tras el último
+    paso de la búsqueda, que deja la misma coloración). Si quedan más de `max_frames` grupos, se submuestrea de forma
+    uniforme conservando siempre el primero, el último y el primero y el último
+    de cada tramo con el mismo `k` (los cambios de `k`).
+
+    Args:
+        pasos (iterable): Secuencia re-iterable de tuplas (colores, conf, k, descripcion).
+        max_frames (int, optional): Número máximo de frames (sin contar el inicial).
+
+    Returns:
+        dict: Índice del estado elegido -> número de estados que representa.
+    """
+    # Grupos de estados consecutivos idénticos: [índice del último estado, tamaño, k].
+    grupos = []
+    anterior = None
+    for i, (colores, _, k, _) in enumerate(pasos):
+        if grupos and k == grupos[-1][2] and colores == anterior:
+            grupos[-1][0] = i
+            grupos[-1][1] += 1
+        else:
+            grupos.append([i, 1, k])
+        anterior = colores
+
+    elegidos = range(len(grupos))
+    if max_frames is not None and len(grupos) > max_frames:
+        # Frames obligatorios: extremos y fronteras entre valores de k.
+        obligatorios = {0, len(grupos) - 1}
+        for j in range(1, len(grupos)):
+            if grupos[j][2] != grupos[j - 1][2]:
+                obligatorios.update((j - 1, j))
+        resto = [j for j in range(len(grupos)) if j not in obligatorios]
+        cupo = max(0, max_frames - len(obligatorios))
+        extra = {resto[int(t * len(resto) / cupo)] for t in range(cupo)} if cupo and resto else set()
+        elegidos = sorted(obligatorios | extra)
+
+    return {grupos[j][0]: grupos[j][1] for j in elegidos}
+
+
+# --- Renderizado en paralelo ---
+# Cada proceso del pool construye su propio `RenderizadorGrafo` una sola vez
+# (en el inicializador) y dibuja bloques de frames consecutivos.
+_RENDERIZADOR_TRABAJADOR = None
+
+
+def _inicializar_renderizador(G, pos):
+    global _RENDERIZADOR_TRABAJADOR
+    _RENDERIZADOR_TRABAJADOR = RenderizadorGrafo(G, pos)
+
+
+def _renderizar_bloque(bloque):
+    # Dibuja una lista de estados `(colores, conflictos, paso, descripcion, k)` en orden.
+    return [_RENDERIZADOR_TRABAJADOR.frame(*estado) for estado in bloque]
+
+
+def _estados_a_dibujar(G, pasos, seleccion):
+    # Genera, en orden, los estados elegidos con sus conflictos, número de paso y
+    # repeticiones. El frame 0 es el grafo recién creado, sin coloración.
+    vacio = {n: 0 for n in G.nodes()} # Asigna el color 0 a todos los nodos.
+    # El valor de `k_actual` en este paso inicial se marca como "-" ya que aún no hay un intento.
+    yield (vacio, [], 0, "Creación del grafo", "-"), 1
+    paso = 1
+    for i, (colores, conf, k, descripcion) in enumerate(pasos):
+        if i in seleccion:
+            # Detecta los conflictos en el estado de coloración actual.
+            yield (colores, detectar_conflictos(G, colores), paso, descripcion, k), seleccion[i]
+            paso += 1
+
+
+def generar_frames(G, pos, pasos, max_frames=None, procesos=None, tam_bloque=16):
+    """
+    Genera en orden los frames de la animación como pares `(imagen, repeticiones)`.
+
+    Con `procesos` > 1 los frames se dibujan en un pool de procesos por bloques
+    consecutivos y se reensamblan en orden; como mucho hay dos bloques por
+    proceso en vuelo, así que la memoria no crece con la longitud de la traza.
+
+    Args:
+        G (nx.Graph): El grafo.
+        pos (dict): Posiciones de los nodos.
+        pasos (iterable): Secuencia re-iterable de tuplas (colores, conf, k, descripcion).
+        max_frames (int, optional): Máximo de frames (ver `seleccionar_frames`).
+        procesos (int, optional): Procesos para dibujar. Si es None o 1, se dibuja aquí.
+        tam_bloque (int, optional): Frames por tarea enviada al pool.
+    """
+    seleccion = seleccionar_frames(pasos, max_frames)
+    estados = _estados_a_dibujar(G, pasos, seleccion)
+
+    if not procesos or procesos <= 1:
+        renderizador = RenderizadorGrafo(G, pos)
+        for estado, repeticiones in estados:
+            yield renderizador.frame(*estado), repeticiones
+        return
+
+    with ProcessPoolExecutor(procesos, initializer=_inicializar_renderizador, initargs=(G, pos)) as pool:
+        en_vuelo = deque()  # Pares (futuro, repeticiones del bloque) en orden de envío.
+        while True:
+            bloque = list(islice(estados, tam_bloque))
+            if bloque:
+                en_vuelo.append((pool.submit(_renderizar_bloque, [e for e, _ in bloque]), [r for _, r in bloque]))
+            # Se entregan los bloques más antiguos cuando hay suficientes en vuelo o ya no quedan estados.
+            while en_vuelo and (len(en_vuelo) >= 2 * procesos or not bloque):
+                futuro, repeticiones = en_vuelo.popleft()
+                yield from zip(futuro.result(), repeticiones)
+            if not bloque:
+                break
+
+
+def layout_rapido(G, iteraciones=50, muestra=32, seed=42):
     """
-    Dibuja el grafo en un estado específico de coloración y lo guarda
-    como una imagen PNG temporal para la animación.
+    Layout de fuerzas aproximado para grafos grandes, solo con NumPy.
+
+    Sigue el esquema de Fruchterman–Reingold, pero la repulsión de cada nodo se
+    estima contra una muestra aleatoria de `muestra` nodos en lugar de contra
+    todos, así que cada iteración cuesta O(n · muestra + m) en vez de O(n²).
 
     Args:
-        G (nx.Graph): El grafo a dibujar.
-        colores (dict): El diccionario de colores actual de los nodos.
-        conflictos (list): Una lista de aristas en conflicto.
-        pos (dict): La posición precalculada de cada nodo para mantener un diseño consistente.
-        paso (int): El número de paso en la animación.
-        descripcion (str): Un texto descriptivo para el título.
-        k_actual (str): El valor actual de k (número máximo de colores permitidos).
-                        Es un string para poder usar "-" en el paso inicial.
-        carpeta_salida (str): La ruta donde se guardarán las imágenes temporales.
+        G (nx.Graph): El grafo.
+        iteraciones (int, optional): Número de iteraciones.
+        muestra (int, optional): Nodos muestreados por iteración para la repulsión.
+        seed (int, optional): Semilla, para que el dibujo sea reproducible.
 
     Returns:
-        str: La ruta completa del archivo de imagen que se ha guardado.
+        dict: Nodo -> posición, escalada a [-1, 1] como en NetworkX.
     """
-    # Crea una figura y ejes para el gráfico.
-    fig, ax = plt.subplots()
     nodos = list(G.nodes())
-    color_ids = [colores[n] for n in nodos]
+    n = len(nodos)
+    if n == 0:
+        return {}
+    rng = np.random.default_rng(seed)
+    indice = {nodo: i for i, nodo in enumerate(nodos)}
+    aristas = np.array([(indice[u], indice[v]) for u, v in G.edges() if u != v], dtype=np.int64).reshape(-1, 2)
+    pos = rng.random((n, 2))
+    k = np.sqrt(1.0 / n)           # Distancia ideal entre nodos.
+    temperatura = 0.1              # Desplazamiento máximo, que se enfría linealmente.
+    enfriamiento = temperatura / (iteraciones + 1)
+    muestra = min(muestra, n)
 
-    # Dibuja los nodos con sus respectivos colores y etiquetas.
-    nx.draw_networkx_nodes(G, pos, node_color=color_ids, cmap=plt.cm.Set3, node_size=500, ax=ax)
-    nx.draw_networkx_labels(G, pos, font_color='black', ax=ax)
-    
-    # Dibuja todas las aristas del grafo en un color gris claro.
-    nx.draw_networkx_edges(G, pos, edgelist=G.edges(), edge_color="lightgray", width=2, ax=ax)
+    for _ in range(iteraciones):
+        # Repulsión contra la muestra, reescalada como si se comparara con todos los nodos.
+        elegidos = rng.choice(n, size=muestra, replace=False)
+        delta = pos[:, None, :] - pos[elegidos][None, :, :]
+        dist2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+        desplazamiento = (delta * (k * k / dist2)[:, :, None]).sum(axis=1) * (n / muestra)
+        # Atracción a lo largo de las aristas.
+        if len(aristas):
+            d = pos[aristas[:, 0]] - pos[aristas[:, 1]]
+            fuerza = d * (np.sqrt((d ** 2).sum(axis=1)) / k)[:, None]
+            np.add.at(desplazamiento, aristas[:, 0], -fuerza)
+            np.add.at(desplazamiento, aristas[:, 1], fuerza)
+        largo = np.maximum(np.sqrt((desplazamiento ** 2).sum(axis=1)), 1e-9)
+        pos += desplazamiento * (np.minimum(largo, temperatura) / largo)[:, None]
+        temperatura -= enfriamiento
 
-    # Si hay aristas en conflicto, las dibuja encima de las demás con un color rojo más grueso
-    # para resaltarlas.
-    if conflictos:
-        nx.draw_networkx_edges(G, pos, edgelist=conflictos, edge_color="red", width=3, ax=ax)
+    # Se centra y escala como `nx.rescale_layout`.
+    pos -= pos.mean(axis=0)
+    escala = np.abs(pos).max()
+    if escala > 0:
+        pos /= escala
+    return dict(zip(nodos, pos))
 
-    # Título principal del gráfico.
-    ax.set_title(f"Paso {paso}: {descripcion}", fontsize=12)
-    
-    # Añade un cuadro de texto en la esquina superior izquierda con información del estado actual.
-    ax.text(
-        0.02, 0.98,
-        f"k actual: {k_actual}\nConflictos: {len(conflictos)}",
-        transform=ax.transAxes,
-        fontsize=10,
-        verticalalignment='top',
-        # Configuración de la caja de texto para mejorar la legibilidad.
-        bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.7)
-    )
-
-    plt.axis("off") # Oculta los ejes para una visualización limpia del grafo.
-    
-    # Construye la ruta del archivo temporal y lo guarda.
-    nombre_img = os.path.join(carpeta_salida, f"tmp_{paso}.png")
-    plt.savefig(nombre_img)
-    plt.close() # Cierra la figura para liberar memoria del sistema.
-    
-    return nombre_img
 
-def crear_animacion(G, pasos, caso_id, duration=1.2):
+def _calcular_layout(G, metodo):
+    # Calcula las posiciones con el método indicado.
+    if metodo == "rapido":
+        return layout_rapido(G)
+    return nx.spring_layout(G, seed=42)
+
+
+@cronometrar("layout")
+def calcular_posiciones(G, usar_cache=True, tam_max_cache=TAM_MAX_CACHE_LAYOUT, umbral_rapido=UMBRAL_LAYOUT_RAPIDO):
+    """
+    Devuelve las posiciones de los nodos para dibujar el grafo, usando la caché en disco.
+
+    Los grafos de hasta `umbral_rapido` nodos usan `spring_layout` (como antes);
+    los mayores, `layout_rapido`.
+
+    Args:
+        G (nx.Graph): El grafo (con nodos enteros).
+        usar_cache (bool, optional): Si es False, siempre se recalcula y no se guarda.
+        tam_max_cache (int, optional): Tamaño máximo de la caché en bytes.
+        umbral_rapido (int, optional): Nodos a partir de los cuales se usa el layout rápido.
+
+    Returns:
+        dict: Nodo -> posición (arreglo de 2 coordenadas).
+    """
+    metodo = "rapido" if G.number_of_nodes() > umbral_rapido else "spring"
+    if not usar_cache:
+        return _calcular_layout(G, metodo)
+
+    os.makedirs(carpeta_cache_layout, exist_ok=True)
+    ruta = os.path.join(carpeta_cache_layout, f"{huella_grafo(G)}_{metodo}.npz")
+    try:
+        with np.load(ruta) as datos:
+            pos = dict(zip(datos["nodos"].tolist(), datos["coords"]))
+        # Se renueva la fecha de la entrada para la política LRU.
+        os.utime(ruta, (time.time(), time.time()))
+        return pos
+    except (OSError, KeyError, ValueError):
+        pass  # No está en la caché (o la entrada está dañada): se calcula.
+
+    pos = _calcular_layout(G, metodo)
+    nodos = list(pos)
+    with escritura_atomica(ruta) as f:
+        np.savez(f, nodos=np.array(nodos), coords=np.array([pos[n] for n in nodos]))
+    podar_cache(carpeta_cache_layout, tam_max_cache, ".npz")
+    return pos
+
+
+@cronometrar("animacion")
+def crear_animacion(G, pasos, caso_id, duration=1.2, max_frames=None, procesos=None,
+                    formato="gif", optimizar_paleta=False):
     """
-    Crea una animación GIF a partir de una secuencia de estados de coloración del grafo.
+    Crea una animación (GIF, APNG o MP4) a partir de una secuencia de estados de coloración del grafo.
+
+    Los frames se escriben en el archivo a medida que se dibujan, así que la
+    memoria usada no depende de la longitud de la traza.
 
     Args:
-        G (nx.Graph): El grafo a animar.
-        pasos (list): Una lista de tuplas (colores, conf, k, descripcion) que
-                      representa la secuencia de estados del algoritmo.
+        G (nx.Graph | GrafoCSR): El grafo a animar. Si es compacto, se convierte a
+                      NetworkX aquí, que es el único punto donde hace falta.
+        pasos (iterable): Una secuencia de tuplas (colores, conf, k, descripcion) que
+                      representa la secuencia de estados del algoritmo (una lista o
+                      una `TrazaTotal`, que reconstruye los estados bajo demanda).
                       - colores (dict): Asignación de colores a los nodos.
                       - conf (int): Número de conflictos en ese paso.
                       - k (int): Número de colores usados en el intento.
                       - descripcion (str): Descripción del estado para el título del frame.
         caso_id (int): El identificador del caso de prueba.
         duration (float, optional): La duración de cada frame en segundos. Por defecto es 1.2.
+                      Los estados consecutivos idénticos se muestran en un solo frame
+                      que dura `duration` por cada estado agrupado.
+        max_frames (int, optional): Máximo de frames; las trazas más largas se
+                      submuestrean conservando el primero, el último y los cambios de k.
+        procesos (int, optional): Procesos para dibujar los frames en paralelo.
+        formato (str, optional): "gif" (por defecto), "apng" o "mp4" (ver `escritores_animacion`).
+        optimizar_paleta (bool, optional): En GIF, usa una paleta común y escribe solo
+                      la región que cambia entre frames (archivo más pequeño).
+
+    Returns:
+        str: La ruta del archivo generado.
     """
     # Obtiene la ruta del directorio del script actual.
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # Construye la ruta al directorio de salida para los GIFs y las imágenes temporales.
+    # Construye la ruta al directorio de salida para las animaciones.
     carpeta_salida = os.path.join(script_dir, "..", "results", "grafos_coloreados")
     os.makedirs(carpeta_salida, exist_ok=True)
     
-    # Define el nombre del archivo GIF final.
-    ruta_gif = os.path.join(carpeta_salida, f"caso_{caso_id}.gif")
+    # Define el nombre del archivo final (la extensión depende del formato).
+    ruta_base = os.path.join(carpeta_salida, f"caso_{caso_id}")
     
-    # Precalcula la posición de los nodos una sola vez para mantener una consistencia
-    # visual a lo largo de toda la animación.
-    pos = nx.spring_layout(G, seed=42)
+    # Los grafos compactos solo se convierten a NetworkX para dibujarlos.
+    if isinstance(G, GrafoCSR):
+        G = G.a_networkx()
 
-    frames = [] # Lista para almacenar los frames (imágenes) del GIF.
-    paso = 0    # Contador de pasos para nombrar los archivos temporales.
+    # Precalcula la posición de los nodos una sola vez para mantener una consistencia
+    # visual a lo largo de toda la animación. Si el grafo ya se animó antes, las
+    # posiciones se leen de la caché en disco.
+    pos = calcular_posiciones(G)
 
     # --- Generación de los frames de la animación ---
-
-    # Frame 0: Estado inicial del grafo sin coloración.
-    vacio = {n: 0 for n in G.nodes()} # Asigna el color 0 a todos los nodos.
-    # El valor de `k_actual` en este paso inicial se marca como "-" ya que aún no hay un intento.
-    img = dibujar_grafo(G, vacio, [], pos, paso, "Creación del grafo", "-", carpeta_salida)
-    frames.append(imageio.imread(img))
-    paso += 1
-
-    # Itera sobre la lista de todos los pasos acumulados para generar cada frame.
-    for colores, conf, k, descripcion in pasos:
-        # Detecta los conflictos en el estado de coloración actual.
-        conflictos = detectar_conflictos(G, colores)
-        
-        # Dibuja el estado actual del grafo y guarda la imagen temporal.
-        img = dibujar_grafo(G, colores, conflictos, pos, paso, descripcion, k, carpeta_salida)
-        frames.append(imageio.imread(img))
-        paso += 1
-
-    # Guarda la lista de frames como un archivo GIF animado.
-    imageio.mimsave(ruta_gif, frames, duration=duration)
-
-    # --- Limpieza de archivos temporales ---
-    # Este bucle elimina las imágenes PNG temporales que se crearon.
-    for i in range(paso):
-        tmp_path = os.path.join(carpeta_salida, f"tmp_{i}.png")
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
\ No newline at end of file
+    # Cada frame se entrega al escritor en cuanto está dibujado; su duración es
+    # más larga si agrupa estados repetidos.
+    frames = 0
+    with abrir_escritor(ruta_base, formato, optimizar_paleta) as escritor:
+        for imagen, repeticiones in generar_frames(G, pos, pasos, max_frames, procesos):
+            escritor.agregar(imagen, duration * repeticiones)
+            frames += 1
+    est = estadisticas.actual()
+    if est is not None:
+        est.sumar("frames", frames)
+    return escritor.ruta
\ No newline at end of file